@@ -1,11 +1,19 @@
 from django.contrib import admin
-from apps.doctors.models import Doctor, Patient, Appointment
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorAvailability
+
+class DoctorAvailabilityInline(admin.TabularInline):
+    """
+    Inline editor for a doctor's weekly availability windows.
+    """
+    model = DoctorAvailability
+    extra = 0
 
 @admin.register(Doctor)
 class DoctorAdmin(admin.ModelAdmin):
     """
     Admin configuration for the Doctor model.
     """
+    inlines = [DoctorAvailabilityInline]
     list_display = ('id', 'first_name', 'last_name', 'email', 'is_active')
     #list_filter = ('is_active')
     search_fields = ('first_name', 'last_name', 'email')
@@ -34,6 +42,7 @@ class PatientAdmin(admin.ModelAdmin):
     Admin configuration for the Patient model.
     """
     list_display = ('id', 'first_name', 'last_name', 'email', 'created_by')
+    list_select_related = ('created_by',)
     list_filter = ('created_by',)
     search_fields = ('first_name', 'last_name', 'email', 'created_by__email')
     ordering = ('id',)
@@ -62,6 +71,7 @@ class AppointmentAdmin(admin.ModelAdmin):
     Admin configuration for the Appointment model.
     """
     list_display = ('id', 'doctor', 'patient', 'date', 'time', 'status', 'reason')
+    list_select_related = ('doctor', 'patient')
     list_filter = ('doctor', 'date', 'status')
     search_fields = ('doctor__email', 'patient__email', 'reason')
     ordering = ('date', 'time')
@@ -10,6 +10,7 @@ class DoctorsConfig(AppConfig):
 
     def ready(self):
         """
-        Overriding the ready method to import signals.
+        Overriding the ready method to import signals and register system checks.
         This method is called when the application is ready to be used.
         """
+        from apps.doctors import checks, signals  # noqa: F401
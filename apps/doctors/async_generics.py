@@ -0,0 +1,163 @@
+import functools
+import inspect
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions, generics
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.doctors.values import ValuesListMixin, values_serializer
+
+
+@functools.lru_cache(maxsize=None)
+def _sync_view(view_class):
+    return view_class.as_view()
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, for read endpoints served under ASGI.
+
+    Authentication, permission checks, throttling and rendering run on the
+    event loop; authenticators with an ``aauthenticate`` coroutine load the
+    user with the async ORM and the others run in a worker thread. Responses
+    are rendered here and returned as plain HttpResponses, so Django does not
+    hand them to a thread for rendering either.
+
+    Methods without an async handler are passed to ``sync_view`` when it
+    handles them, so a route served asynchronously keeps its write methods.
+    Only JSON is rendered; the browsable API needs the synchronous ORM.
+    """
+    renderer_classes = [JSONRenderer]
+    sync_view = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        if self.sync_view is not None and not hasattr(self, method) and hasattr(self.sync_view, method):
+            return await sync_to_async(_sync_view(self.sync_view))(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        if isinstance(self.response, Response):
+            self.response.render()
+            rendered = HttpResponse(
+                self.response.rendered_content, status=self.response.status_code, headers=self.response.headers
+            )
+            rendered.cookies = self.response.cookies
+            # Kept for callers reading the DRF response data, such as the test client
+            rendered.data = self.response.data
+            return rendered
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Async variant of ``initial``.
+        """
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """
+        Authenticate ``request`` the way ``Request.user`` would, without blocking the event loop.
+        """
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth = await authenticator.aauthenticate(request)
+                else:
+                    user_auth = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+        request._not_authenticated()
+
+
+class AsyncGenericAPIView(AsyncAPIView, generics.GenericAPIView):
+    """
+    GenericAPIView reading its object with the async ORM.
+    """
+
+    async def aget_object(self):
+        """
+        Async variant of ``get_object``.
+
+        Object permissions may follow relations, so they are checked in a worker thread.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+
+class AsyncListAPIView(ValuesListMixin, AsyncGenericAPIView):
+    """
+    Async list view rendering pages from ``values()`` rows, or from instances when relations are expanded.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.get_serializer_context().get('expand'):
+            renderer = None
+        else:
+            renderer = values_serializer(self.get_serializer_class())
+            queryset = self.get_values_queryset(renderer, queryset)
+
+        if self.paginator is not None:
+            rows = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        else:
+            rows = None
+        paginated = rows is not None
+        if not paginated:
+            rows = [row async for row in queryset]
+
+        data = self.get_serializer(rows, many=True).data if renderer is None else renderer.to_representation(rows)
+        return self.get_paginated_response(data) if paginated else Response(data)
+
+
+class AsyncRetrieveAPIView(AsyncGenericAPIView):
+    """
+    Async retrieve view.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BasicAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.doctors.models import ROLE_DOCTOR, ROLE_PATIENT, Doctor, Patient
+
+# Doctors and patients live in separate tables, so their primary keys overlap.
+# Every token carries a role claim telling us which table the user id refers to.
+ROLE_CLAIM = 'role'
+
+ROLE_MODELS = {
+    ROLE_DOCTOR: Doctor,
+    ROLE_PATIENT: Patient,
+}
+
+
+def get_tokens_for_user(user, role):
+    """
+    Issue a refresh/access token pair for a doctor or a patient.
+
+    Args:
+        user: The Doctor or Patient instance to issue tokens for.
+        role (str): Either 'doctor' or 'patient'.
+
+    Returns:
+        dict: The encoded 'refresh' and 'access' tokens.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh[ROLE_CLAIM] = role
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """
+    Bearer token authentication for both doctors and patients.
+
+    The token is verified by signature alone, so an authenticated request costs
+    a single primary key lookup instead of a full password hash.
+    """
+
+    def get_user(self, validated_token):
+        """
+        Resolve the user from the token's role and user id claims.
+
+        Args:
+            validated_token: The validated access token.
+
+        Returns:
+            Doctor or Patient: The authenticated user.
+        """
+        model, lookup = self.get_user_lookup(validated_token)
+        try:
+            user = model.objects.get(**lookup)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return self.check_user(user)
+
+    async def aauthenticate(self, request):
+        """
+        Async variant of ``authenticate`` loading the user with the async ORM.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        model, lookup = self.get_user_lookup(validated_token)
+        try:
+            user = await model.objects.aget(**lookup)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return self.check_user(user), validated_token
+
+    def get_user_lookup(self, validated_token):
+        """
+        Return the model and the lookup selecting the user a token was issued to.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Tokens issued before the role claim existed were only given to doctors.
+        model = ROLE_MODELS.get(validated_token.get(ROLE_CLAIM, ROLE_DOCTOR))
+        if model is None:
+            raise InvalidToken(_("Token contained an unknown role"))
+        return model, {api_settings.USER_ID_FIELD: user_id}
+
+    def check_user(self, user):
+        if not getattr(user, 'is_active', True):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+class CredentialCache:
+    """
+    Bounded, TTL-evicted cache of Basic credentials that already passed a password check.
+
+    Entries are keyed by a keyed BLAKE2b digest of (email, password) using a
+    per-process random salt, so neither the plain password nor a reusable hash
+    of it is kept in memory. Each entry remembers which user it resolved to and
+    the password hash that was verified.
+    """
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._salt = os.urandom(16)
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, userid, password):
+        """
+        Return the digest used to look up a pair of credentials.
+        """
+        data = f'{userid}\x00{password}'.encode('utf-8')
+        return hashlib.blake2b(data, key=self._salt, digest_size=32).digest()
+
+    def get(self, key):
+        """
+        Return the cached (model, pk, password_hash) for ``key``, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[3] < time.monotonic():
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[:3]
+
+    def set(self, key, user):
+        """
+        Remember that ``key`` was verified for ``user``.
+        """
+        user_key = (type(user), user.pk)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (type(user), user.pk, user.password, time.monotonic() + self.ttl)
+            self._keys_by_user.setdefault(user_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user):
+        """
+        Drop every cached credential that resolved to ``user``.
+        """
+        with self._lock:
+            for key in self._keys_by_user.pop((type(user), user.pk), set()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return the hit/miss counters and current size of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get((entry[0], entry[1]))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[(entry[0], entry[1])]
+
+
+credential_cache = CredentialCache(
+    max_entries=settings.BASIC_AUTH_CACHE['MAX_ENTRIES'],
+    ttl=settings.BASIC_AUTH_CACHE['TTL'],
+)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    HTTP Basic authentication that skips the password hash for recently verified credentials.
+
+    A cache hit still loads the user by primary key, and the entry is only
+    honoured while the stored password hash and active flag are unchanged.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = credential_cache.make_key(userid, password)
+        entry = credential_cache.get(key)
+        if entry is not None:
+            model, pk, password_hash = entry
+            user = model.objects.filter(pk=pk).first()
+            if user is not None and user.password == password_hash and getattr(user, 'is_active', True):
+                return (user, None)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        credential_cache.set(key, user)
+        return (user, auth)
@@ -0,0 +1,32 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from apps.doctors.authentication import ROLE_DOCTOR, ROLE_MODELS
+
+
+class RoleModelBackend(ModelBackend):
+    """
+    Authenticates doctors and patients by email and password with one query and one password hash.
+
+    Doctors and patients are separate tables and may share an email address,
+    so callers name the role of the account; Django's own callers, such as the
+    admin login and HTTP Basic authentication, pass none and authenticate
+    doctors. The account is read with a single lookup on the unique email
+    index, and an unknown email still hashes the password once, so the
+    response time does not tell which emails have an account. The returned
+    Doctor or Patient carries its role in ``role``.
+    """
+
+    def authenticate(self, request, username=None, password=None, role=ROLE_DOCTOR, **kwargs):
+        email = kwargs.get('email', username)
+        model = ROLE_MODELS.get(role)
+        if email is None or password is None or model is None:
+            return None
+        try:
+            user = model.objects.get(email=email)
+        except model.DoesNotExist:
+            # Take as long as a wrong password would
+            make_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
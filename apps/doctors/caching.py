@@ -0,0 +1,195 @@
+import hashlib
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+from apps.doctors.authentication import ROLE_DOCTOR, ROLE_MODELS
+from apps.doctors.models import next_data_version
+
+
+class ResponseCache:
+    """
+    Per-owner versioned cache of GET response data.
+
+    Every doctor and patient row has a ``data_version`` column, the Unix time
+    of the last change to the data shown to them. Cached responses and ETags
+    are keyed by the version of their owner, which is loaded with the user on
+    every request, so bumping it on a write makes all of the owner's entries
+    unreachable at once and the cache backend evicts them in due course.
+    Because the version lives in the database, a process whose cache is not
+    shared still sees the writes made by every other process.
+
+    Each bump moves the version at least one second past the previous value,
+    so it doubles as the Last-Modified time: a client holding an earlier
+    Last-Modified always sees the change, even when it happened within the
+    same second, and a version is never handed out twice.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def enabled(self):
+        return settings.RESPONSE_CACHE['ENABLED']
+
+    @property
+    def timeout(self):
+        return settings.RESPONSE_CACHE['TIMEOUT']
+
+    def bump(self, role, pks):
+        """
+        Invalidate every cached response and ETag of the owners ``pks`` with the given role.
+        """
+        pks = {pk for pk in pks if pk is not None}
+        if pks:
+            ROLE_MODELS[role].objects.filter(pk__in=pks).update(
+                data_version=Greatest(F('data_version') + 1, Value(next_data_version()))
+            )
+
+    def make_key(self, view, user, version, path):
+        digest = hashlib.blake2b(path.encode('utf-8'), digest_size=16).hexdigest()
+        return f'response:{view}:{user._meta.label_lower}:{user.pk}:{version}:{digest}'
+
+    def get(self, key):
+        data = self.cache.get(key)
+        self._count(data is not None)
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, timeout=self.timeout)
+
+    async def aget(self, key):
+        data = await self._acall('get', key)
+        self._count(data is not None)
+        return data
+
+    async def aset(self, key, data):
+        await self._acall('set', key, data, timeout=self.timeout)
+
+    async def _acall(self, method, *args, **kwargs):
+        cache = self.cache
+        # The local-memory backend never waits on I/O, and its async methods would only add a thread hop
+        if isinstance(cache, LocMemCache):
+            return getattr(cache, method)(*args, **kwargs)
+        return await getattr(cache, f'a{method}')(*args, **kwargs)
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return the hit/miss counters of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE['ALIAS'])
+
+
+class CachedResponseMixin:
+    """
+    Serves GET requests of a generic view with validators, from the response cache if it is enabled.
+
+    Responses carry a strong ETag derived from the owner's ``data_version``,
+    the full path, query string included, and the negotiated media type, and
+    a Last-Modified time from the same version. A matching If-None-Match or a
+    current If-Modified-Since is answered with 304 before the cache, the
+    queries or the serializer are touched. Only users of ``cache_role`` get
+    validators, other requests pass straight through. The signals in
+    apps/doctors/signals.py bump the versions whenever a doctor, patient or
+    appointment is written.
+
+    With the cache enabled, response data is also stored under the same key,
+    per user and version.
+    """
+    cache_role = ROLE_DOCTOR
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_validators(request):
+            return super().get(request, *args, **kwargs)
+
+        # The version was loaded with the user, before the data, so a concurrent write leaves the entry unreachable
+        key, validators, response = self.check_validators(request)
+        if response is None:
+            data = response_cache.get(key) if response_cache.enabled else None
+            if data is not None:
+                response = Response(data)
+            else:
+                response = super().get(request, *args, **kwargs)
+                if response_cache.enabled and response.status_code == 200:
+                    response_cache.set(key, response.data)
+        return self.add_validators(response, validators)
+
+    def has_validators(self, request):
+        return getattr(request.user, 'role', None) == self.cache_role
+
+    def check_validators(self, request):
+        """
+        Work out the cache key and validators of a request from its owner's version.
+
+        Returns:
+            tuple: The cache key, the validator headers and a 304 or 412
+            response if the request's preconditions already decide it, else None.
+        """
+        version = request.user.data_version
+        key = response_cache.make_key(type(self).__name__, request.user, version, request.get_full_path())
+        etag = quote_etag(hashlib.blake2b(
+            f'{key}:{request.accepted_media_type}'.encode('utf-8'), digest_size=16
+        ).hexdigest())
+        validators = {'ETag': etag, 'Last-Modified': http_date(version)}
+        return key, validators, get_conditional_response(request, etag=etag, last_modified=version)
+
+    def add_validators(self, response, validators):
+        if response.status_code in (200, 304):
+            for header, value in validators.items():
+                response[header] = value
+        return response
+
+
+class AsyncCachedResponseMixin(CachedResponseMixin):
+    """
+    CachedResponseMixin for views whose ``get`` is a coroutine.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        if not self.has_validators(request):
+            return await super(CachedResponseMixin, self).get(request, *args, **kwargs)
+
+        key, validators, response = self.check_validators(request)
+        if response is None:
+            data = await response_cache.aget(key) if response_cache.enabled else None
+            if data is not None:
+                response = Response(data)
+            else:
+                response = await super(CachedResponseMixin, self).get(request, *args, **kwargs)
+                if response_cache.enabled and response.status_code == 200:
+                    await response_cache.aset(key, response.data)
+        return self.add_validators(response, validators)
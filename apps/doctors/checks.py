@@ -0,0 +1,43 @@
+import base64
+from django.apps import apps
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.security)
+def check_password_scrypt(app_configs, **kwargs):
+    """
+    Validate ``settings.PASSWORD_SCRYPT`` and check that its hashes fit the password columns.
+
+    An encoded hash spells out its parameters, so stronger settings make it
+    longer; a hash that does not fit would be truncated or rejected by the database.
+    """
+    from apps.doctors.hashing import ScryptPasswordHasher
+
+    config = settings.PASSWORD_SCRYPT
+    errors = []
+    for name in ('WORK_FACTOR', 'BLOCK_SIZE', 'PARALLELISM'):
+        if not isinstance(config[name], int) or config[name] < 1:
+            errors.append(Error(f"PASSWORD_SCRYPT['{name}'] must be a positive integer.", id='doctors.E001'))
+    work_factor = config['WORK_FACTOR']
+    if isinstance(work_factor, int) and (work_factor < 2 or work_factor & (work_factor - 1)):
+        errors.append(Error("PASSWORD_SCRYPT['WORK_FACTOR'] must be a power of 2 greater than 1.", id='doctors.E002'))
+    if not isinstance(config['MAXMEM'], int) or config['MAXMEM'] < 0:
+        errors.append(Error("PASSWORD_SCRYPT['MAXMEM'] must be 0 or a positive integer.", id='doctors.E001'))
+    if errors:
+        return errors
+
+    hasher = ScryptPasswordHasher()
+    # algorithm$n$salt$r$p$hash, with the 64-byte hash in base64
+    length = len(f"{hasher.algorithm}${work_factor}${hasher.salt()}${config['BLOCK_SIZE']}${config['PARALLELISM']}$")
+    length += len(base64.b64encode(bytes(64)))
+    for label in ('doctors.Doctor', 'doctors.Patient', 'patients.Patient'):
+        max_length = apps.get_model(label)._meta.get_field('password').max_length
+        if length > max_length:
+            errors.append(Error(
+                f"PASSWORD_SCRYPT produces {length}-character hashes, which do not fit {label}.password "
+                f"(max_length={max_length}).",
+                hint="Lower the scrypt parameters or widen the password column.",
+                id='doctors.E003',
+            ))
+    return errors
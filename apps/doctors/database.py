@@ -0,0 +1,17 @@
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    connection_created receiver applying ``SQLITE_PRAGMAS`` to each new SQLite connection.
+
+    journal_mode=WAL lets readers run while a write is in progress and is
+    stored in the database file; the other pragmas only last as long as the
+    connection, which is why they are set on every connection. They run on the
+    raw connection so they are not counted as queries of the current request.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for pragma, value in settings.SQLITE_PRAGMAS.items():
+        if value is not None:
+            connection.connection.execute(f'PRAGMA {pragma} = {value}')
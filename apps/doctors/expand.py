@@ -0,0 +1,59 @@
+from rest_framework import serializers
+
+
+def parse_expand_param(query_params, allowed):
+    """
+    Read the comma-separated ?expand= query parameter.
+
+    Args:
+        query_params: The request's query parameters.
+        allowed: Names of the relations that may be expanded.
+
+    Returns:
+        tuple: The requested names in order, without duplicates.
+
+    Raises:
+        ValidationError: If a name is not in ``allowed``.
+    """
+    value = query_params.get('expand')
+    if not value:
+        return ()
+    requested = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = set(requested) - set(allowed)
+    if unknown:
+        raise serializers.ValidationError(
+            {"expand": f"Cannot expand {', '.join(sorted(unknown))}; expected one of {', '.join(sorted(allowed))}."}
+        )
+    return requested
+
+
+class ExpandMixin:
+    """
+    Embeds related objects named in ?expand= in the response of a generic view.
+
+    The relations that may be expanded are the ``expandable_fields`` of the
+    serializer class. They are loaded with select_related on the same query as
+    the main rows, so expanding never adds queries per row.
+    """
+    expand = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.expand = self.get_expand(request)
+
+    async def ainitial(self, request, *args, **kwargs):
+        await super().ainitial(request, *args, **kwargs)
+        self.expand = self.get_expand(request)
+
+    def get_expand(self, request):
+        allowed = getattr(self.get_serializer_class(), 'expandable_fields', {})
+        return parse_expand_param(request.query_params, allowed)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return queryset.select_related(*self.expand) if self.expand else queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.expand
+        return context
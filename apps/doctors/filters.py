@@ -0,0 +1,72 @@
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+from apps.doctors.models import Appointment
+from apps.doctors.utils import parse_date_input
+
+
+def parse_date_param(query_params, name, default=None):
+    """
+    Read a YYYY-MM-DD query parameter.
+
+    Args:
+        query_params: The request's query parameters.
+        name (str): The parameter name.
+        default: Returned when the parameter is missing.
+
+    Returns:
+        date: The parsed date or ``default``.
+
+    Raises:
+        ValidationError: If the value is not a valid date.
+    """
+    value = query_params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        parsed = parse_date_input(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise serializers.ValidationError({name: "Enter a valid date in YYYY-MM-DD format."})
+    return parsed
+
+
+class AppointmentFilterBackend(BaseFilterBackend):
+    """
+    Filters appointment lists with ?from=, ?to=, ?status= and ?patient=.
+
+    Every filter is applied in SQL. The date bounds sit right behind the owner
+    column in the (doctor, date, time) and (patient, date, time) indexes, so a
+    window is read as one index range.
+    """
+    statuses = {value for value, _ in Appointment.APPOINTMENT_STATUS_CHOICES}
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        start = parse_date_param(params, 'from')
+        end = parse_date_param(params, 'to')
+        if start is not None and end is not None and end < start:
+            raise serializers.ValidationError({"to": "Must not be before 'from'."})
+        if start is not None:
+            queryset = queryset.filter(date__gte=start)
+        if end is not None:
+            queryset = queryset.filter(date__lte=end)
+
+        status = params.get('status')
+        if status:
+            requested = set(status.split(','))
+            unknown = requested - self.statuses
+            if unknown:
+                raise serializers.ValidationError(
+                    {"status": f"Unknown status {', '.join(sorted(unknown))}; expected one of {', '.join(sorted(self.statuses))}."}
+                )
+            queryset = queryset.filter(status__in=requested)
+
+        patient = params.get('patient')
+        if patient:
+            try:
+                patient = int(patient)
+            except ValueError:
+                raise serializers.ValidationError({"patient": "Must be a patient id."})
+            queryset = queryset.filter(patient_id=patient)
+        return queryset
@@ -0,0 +1,157 @@
+import atexit
+import base64
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, get_hasher, identify_hasher, make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+def _encode(hasher, password, salt):
+    """
+    Hash one password inside a worker process.
+
+    The hasher instance is pickled from the parent, so workers never need
+    Django settings to be configured.
+    """
+    return hasher.encode(password, salt)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    Django's scrypt hasher with its cost parameters taken from ``settings.PASSWORD_SCRYPT``.
+
+    scrypt comes with the standard library, so this needs no native
+    dependency. The parameters are read when the hasher is loaded and kept on
+    the instance, so the instance can be pickled to hashing workers that have
+    no settings. Hashes made with other parameters are upgraded the next time
+    their owner logs in.
+    """
+
+    def __init__(self):
+        config = settings.PASSWORD_SCRYPT
+        self.work_factor = config['WORK_FACTOR']
+        self.block_size = config['BLOCK_SIZE']
+        self.parallelism = config['PARALLELISM']
+        self.maxmem = config['MAXMEM']
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        # scrypt needs 128 * n * r bytes, and stored hashes are verified with their own parameters.
+        # OpenSSL's default limit of 32 MiB is too low from n=2**15.
+        hash_ = hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=self.maxmem or 2 * 128 * n * r, dklen=64
+        )
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash_)
+
+
+@receiver(setting_changed)
+def reload_password_hashers(setting, **kwargs):
+    """
+    Reload the hashers when their parameters change, as Django does when PASSWORD_HASHERS changes.
+    """
+    if setting == 'PASSWORD_SCRYPT':
+        hashers.get_hashers.cache_clear()
+        hashers.get_hashers_by_algorithm.cache_clear()
+
+
+def is_password_hashed(password):
+    """
+    Return whether ``password`` is already encoded by one of the configured hashers, or unusable.
+    """
+    if password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return True
+    try:
+        # Decoding rejects raw passwords that merely start with a hasher's name
+        identify_hasher(password).decode(password)
+    except ValueError:
+        return False
+    return True
+
+
+class PasswordHashingService:
+    """
+    Hashes passwords with the default Django hasher, fanning batches out to a process pool.
+
+    Password hashing is CPU bound and holds the GIL, so only separate processes
+    use more than one core. The pool size comes from
+    ``settings.PASSWORD_HASHING['WORKERS']``; with fewer than two workers every
+    password is hashed synchronously with ``make_password``.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._executor_workers = 0
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    @property
+    def workers(self):
+        return settings.PASSWORD_HASHING['WORKERS']
+
+    def hash_password(self, password):
+        """
+        Hash a single password. One hash gains nothing from the pool, so this is synchronous.
+        """
+        return make_password(password)
+
+    def hash_passwords(self, passwords):
+        """
+        Hash many passwords, in parallel when the pool is enabled.
+
+        Args:
+            passwords (iterable): Raw passwords. None produces an unusable password.
+
+        Returns:
+            list: Encoded passwords in the same order as the input.
+        """
+        passwords = list(passwords)
+        workers = self.workers
+        if workers < 2 or len(passwords) < 2:
+            return [make_password(password) for password in passwords]
+
+        hasher = get_hasher('default')
+        indexes = [i for i, password in enumerate(passwords) if password is not None]
+        salts = [hasher.salt() for _ in indexes]
+        chunk_size = max(1, len(indexes) // (workers * 4))
+        encoded = self._get_executor(workers).map(
+            _encode, repeat(hasher), [passwords[i] for i in indexes], salts, chunksize=chunk_size
+        )
+
+        results = [make_password(None) if password is None else None for password in passwords]
+        for index, value in zip(indexes, encoded):
+            results[index] = value
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+                self._executor_workers = 0
+
+    def _get_executor(self, workers):
+        with self._lock:
+            if self._executor is None or self._executor_workers != workers:
+                if self._executor is not None:
+                    self._executor.shutdown()
+                # Spawned workers do not inherit database connections or
+                # threads from the web server process.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+                self._executor_workers = workers
+            return self._executor
+
+
+password_hashing = PasswordHashingService()
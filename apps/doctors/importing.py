@@ -0,0 +1,311 @@
+import codecs
+import csv
+import json
+from collections import Counter
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import transaction
+from apps.doctors.authentication import ROLE_DOCTOR, ROLE_PATIENT
+from apps.doctors.caching import response_cache
+from apps.doctors.hashing import is_password_hashed, password_hashing
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorDaySlots, appointment_end_time
+
+# Models in the order they are inserted, so a batch can refer to rows earlier in the same batch
+IMPORT_MODELS = {
+    'doctor': Doctor,
+    'patient': Patient,
+    'appointment': Appointment,
+}
+
+# Foreign keys are given as an id or as the email of the referenced row
+FOREIGN_KEYS = {
+    'patient': {'created_by': 'doctor'},
+    'appointment': {'doctor': 'doctor', 'patient': 'patient'},
+}
+
+# Largest number of parameters put in one IN (...) lookup
+LOOKUP_CHUNK_SIZE = 500
+
+
+class RecordError(ValueError):
+    """
+    Raised when an input record cannot be imported.
+    """
+
+
+def model_name(value):
+    """
+    Return the import model name for 'patient', 'Patient' or 'doctors.patient'.
+    """
+    name = str(value or '').lower().rsplit('.', 1)[-1]
+    if name not in IMPORT_MODELS:
+        raise RecordError(f"Unknown model {value!r}; expected one of {', '.join(IMPORT_MODELS)}.")
+    return name
+
+
+def iter_ndjson(stream, offset=0):
+    """
+    Yield ``(record, end_offset)`` for every non-empty line of a binary NDJSON stream.
+    """
+    stream.seek(offset)
+    for line in stream:
+        offset += len(line)
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line), offset
+            except ValueError as exc:
+                raise RecordError(f"Invalid JSON: {exc}")
+
+
+def iter_json_array(stream, offset=0, chunk_size=1 << 20):
+    """
+    Yield ``(record, end_offset)`` for every object of a binary stream holding one JSON array.
+
+    The file is decoded a chunk at a time and each object is parsed as soon as it
+    is complete, so memory use does not depend on the size of the array. Resuming
+    from an offset returned earlier skips straight to the next object.
+    """
+    stream.seek(offset)
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer, index, eof = '', 0, False
+    while True:
+        while index < len(buffer) and buffer[index] in ' \t\r\n,[':
+            index += 1
+            offset += 1
+        if buffer[index:index + 1] == ']':
+            return
+        if index < len(buffer):
+            try:
+                record, end = decoder.raw_decode(buffer, index)
+            except ValueError as exc:
+                # Usually an object cut off by the end of the chunk
+                if eof:
+                    raise RecordError(f"Invalid JSON: {exc}")
+            else:
+                offset += len(buffer[index:end].encode('utf-8'))
+                index = end
+                yield record, offset
+                continue
+        elif eof:
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[index:] + text.decode(chunk, final=eof)
+        index = 0
+
+
+class _CountingLines:
+    """
+    Iterates over the decoded lines of a binary stream, counting the bytes read so far.
+    """
+
+    def __init__(self, stream, offset):
+        self.stream = stream
+        self.offset = offset
+
+    def __iter__(self):
+        for line in self.stream:
+            self.offset += len(line)
+            yield line.decode('utf-8')
+
+
+def iter_csv(stream, offset=0):
+    """
+    Yield ``(record, end_offset)`` for every row of a binary CSV stream with a header row.
+
+    Empty cells are left out of the record so model defaults apply.
+    """
+    stream.seek(0)
+    lines = _CountingLines(stream, 0)
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    if offset > lines.offset:
+        stream.seek(offset)
+        lines.offset = offset
+        reader = csv.reader(lines)
+    for row in reader:
+        if row:
+            yield {key: value for key, value in zip(header, row) if value != ''}, lines.offset
+
+
+READERS = {
+    'json': iter_json_array,
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+}
+
+
+class RecordImporter:
+    """
+    Collects records and inserts them with one ``bulk_create`` per model and batch.
+
+    Foreign keys may be ids or emails. Emails are resolved through in-memory
+    email to id maps, filled from the rows inserted so far and, for emails
+    seen for the first time, from one ``IN`` query per batch. Passwords that
+    are already encoded by a configured hasher are stored as they are; the rest
+    are hashed together through the password hashing pool.
+    """
+
+    def __init__(self, default_model=None):
+        self.default_model = model_name(default_model) if default_model else None
+        self.pending = {name: [] for name in IMPORT_MODELS}
+        self.ids = {'doctor': {}, 'patient': {}}
+        self.counts = Counter()
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.pending.values())
+
+    def add(self, record, number):
+        """
+        Validate one record and queue it for the next flush.
+
+        Records are either flat field dicts or Django fixture objects with
+        ``model``, ``pk`` and ``fields``.
+
+        Raises:
+            RecordError: If the record is not valid.
+        """
+        if not isinstance(record, dict):
+            raise RecordError(f"Record {number}: expected an object.")
+        record = dict(record)
+        if 'fields' in record:
+            fields = dict(record['fields'])
+            if record.get('pk') is not None:
+                fields['id'] = record['pk']
+            record = dict(fields, model=record.get('model'))
+        try:
+            name = model_name(record.pop('model', None) or self.default_model)
+        except RecordError as exc:
+            raise RecordError(f"Record {number}: {exc}")
+        model = IMPORT_MODELS[name]
+        foreign_keys = FOREIGN_KEYS.get(name, {})
+        instance = model()
+        references = {}
+        password = None
+        for key, value in record.items():
+            if key == 'pk':
+                key = 'id'
+            if key in foreign_keys or key.endswith('_id') and key[:-3] in foreign_keys:
+                references[key.removesuffix('_id')] = value
+                continue
+            try:
+                field = model._meta.get_field(key)
+            except FieldDoesNotExist:
+                field = None
+            if field is None or not field.concrete and not field.many_to_many:
+                raise RecordError(f"Record {number}: unknown {name} field {key!r}.")
+            if field.many_to_many:
+                if value:
+                    raise RecordError(f"Record {number}: {name} field {key!r} cannot be imported.")
+                continue
+            if key == 'password':
+                password = value
+                continue
+            if key == 'end_time':
+                continue
+            setattr(instance, field.attname, value)
+
+        missing = set(foreign_keys) - set(references)
+        if missing:
+            raise RecordError(f"Record {number}: missing {', '.join(sorted(missing))}.")
+        try:
+            instance.clean_fields(exclude=[*foreign_keys, 'password', 'end_time'])
+        except ValidationError as exc:
+            errors = '; '.join(f"{field}: {' '.join(messages)}" for field, messages in exc.message_dict.items())
+            raise RecordError(f"Record {number}: {errors}")
+        if name == 'doctor':
+            instance.email = Doctor.objects.normalize_email(instance.email)
+        if name == 'appointment':
+            try:
+                instance.end_time = appointment_end_time(instance.time, instance.duration_minutes)
+            except ValueError as exc:
+                raise RecordError(f"Record {number}: {exc}")
+        self.pending[name].append((number, instance, references, password))
+
+    def flush(self):
+        """
+        Insert every queued record in one transaction.
+
+        Returns:
+            int: The number of records inserted.
+
+        Raises:
+            RecordError: If a foreign key does not resolve.
+            IntegrityError: If the database rejects the batch.
+        """
+        inserted = 0
+        with transaction.atomic():
+            for name, model in IMPORT_MODELS.items():
+                rows = self.pending[name]
+                if not rows:
+                    continue
+                self._resolve(name, rows)
+                if name in self.ids:
+                    self._set_passwords(rows)
+                instances = [instance for _, instance, _, _ in rows]
+                model.objects.bulk_create(instances)
+                if name in self.ids:
+                    self._remember(name, instances)
+                if name == 'patient':
+                    # bulk_create skips the signals that invalidate cached responses
+                    response_cache.bump(ROLE_DOCTOR, {instance.created_by_id for instance in instances})
+                if name == 'appointment':
+                    # bulk_create skips the signals that keep the slot bitmaps and cached responses current
+                    doctor_ids = {instance.doctor_id for instance in instances}
+                    DoctorDaySlots.objects.filter(doctor_id__in=doctor_ids).delete()
+                    response_cache.bump(ROLE_DOCTOR, doctor_ids)
+                    response_cache.bump(ROLE_PATIENT, {instance.patient_id for instance in instances})
+                self.counts[name] += len(rows)
+                inserted += len(rows)
+        for rows in self.pending.values():
+            rows.clear()
+        return inserted
+
+    def _resolve(self, name, rows):
+        foreign_keys = FOREIGN_KEYS.get(name, {})
+        for field, target in foreign_keys.items():
+            emails = {
+                references[field] for _, _, references, _ in rows
+                if isinstance(references[field], str) and not references[field].isdigit()
+            }
+            self._load_ids(target, emails - self.ids[target].keys())
+            for number, instance, references, _ in rows:
+                value = references[field]
+                if isinstance(value, int) or isinstance(value, str) and value.isdigit():
+                    setattr(instance, f'{field}_id', int(value))
+                elif value in self.ids[target]:
+                    setattr(instance, f'{field}_id', self.ids[target][value])
+                else:
+                    raise RecordError(f"Record {number}: unknown {target} {value!r} for {field}.")
+
+    def _load_ids(self, target, emails):
+        emails = list(emails)
+        for start in range(0, len(emails), LOOKUP_CHUNK_SIZE):
+            self.ids[target].update(
+                IMPORT_MODELS[target].objects.filter(email__in=emails[start:start + LOOKUP_CHUNK_SIZE])
+                .values_list('email', 'id')
+            )
+
+    def _set_passwords(self, rows):
+        raw = []
+        for _, instance, _, password in rows:
+            if not password:
+                instance.password = make_password(None)
+                continue
+            if is_password_hashed(password):
+                instance.password = password
+            else:
+                raw.append((instance, password))
+        for (instance, _), encoded in zip(raw, password_hashing.hash_passwords(password for _, password in raw)):
+            instance.password = encoded
+
+    def _remember(self, name, instances):
+        if any(instance.pk is None for instance in instances):
+            # Backends that cannot return ids from bulk inserts
+            self._load_ids(name, [instance.email for instance in instances])
+        else:
+            self.ids[name].update((instance.email, instance.pk) for instance in instances)
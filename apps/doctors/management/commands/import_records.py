@@ -0,0 +1,97 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from apps.doctors.importing import IMPORT_MODELS, READERS, RecordError, RecordImporter
+from apps.doctors.models import ImportCheckpoint
+
+EXTENSIONS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream doctors, patients and appointments from a JSON array, NDJSON or CSV file into the database "
+        "in batches. Foreign keys may be ids or emails. Progress is checkpointed in the database with every "
+        "batch, and running the command again resumes after the last committed batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import.")
+        parser.add_argument('--format', choices=sorted(READERS), help="Input format; defaults to the file extension.")
+        parser.add_argument(
+            '--model', choices=list(IMPORT_MODELS),
+            help="Model of records that do not name one, e.g. every row of a CSV file.",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help="Records inserted per transaction.")
+        parser.add_argument('--checkpoint', help="Checkpoint name; defaults to the absolute path of the file.")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        checkpoint_name = options['checkpoint'] or os.path.abspath(path)
+
+        offset, records = 0, 0
+        checkpoint = None if options['restart'] else ImportCheckpoint.objects.filter(name=checkpoint_name).first()
+        if checkpoint is not None:
+            if checkpoint.source != os.path.abspath(path):
+                raise CommandError(
+                    f"Checkpoint {checkpoint_name} belongs to {checkpoint.source}; pass --restart to ignore it."
+                )
+            offset, records = checkpoint.offset, checkpoint.records
+            self.stdout.write(f"Resuming after record {records}.")
+
+        importer = RecordImporter(options['model'])
+        self.committed = records
+        started = time.perf_counter()
+        number = records
+        try:
+            with open(path, 'rb') as stream:
+                for number, (record, end_offset) in enumerate(READERS[file_format](stream, offset), start=records + 1):
+                    importer.add(record, number)
+                    if len(importer) >= options['batch_size']:
+                        self.flush(importer, checkpoint_name, path, end_offset, number, started)
+                if len(importer):
+                    self.flush(importer, checkpoint_name, path, end_offset, number, started)
+        except RecordError as exc:
+            raise CommandError(
+                f"{exc} Records up to {self.committed} are imported; fix the file and run again to resume."
+            )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        elapsed = time.perf_counter() - started
+        total = sum(importer.counts.values())
+        summary = ', '.join(f"{importer.counts[name]} {name}s" for name in IMPORT_MODELS)
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {summary} in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    def flush(self, importer, checkpoint_name, path, offset, number, started):
+        first = number - len(importer) + 1
+        try:
+            # The checkpoint commits with the batch, so a crash can neither skip nor repeat records
+            with transaction.atomic():
+                importer.flush()
+                ImportCheckpoint.objects.update_or_create(
+                    name=checkpoint_name,
+                    defaults={'source': os.path.abspath(path), 'offset': offset, 'records': number},
+                )
+        except IntegrityError as exc:
+            raise CommandError(
+                f"Records {first}-{number} were rejected by the database: {exc}. "
+                f"Records up to {self.committed} are imported; fix the file and run again to resume."
+            )
+        self.committed = number
+        total = sum(importer.counts.values())
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{number} records read, {total} imported ({total / elapsed:.0f} rows/s).")
@@ -0,0 +1,232 @@
+import datetime
+import random
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.doctors.hashing import password_hashing
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorAvailability, next_data_version
+from apps.patients.models import Patient as PatientAccount
+
+FIRST_NAMES = (
+    'Ada', 'Amir', 'Bola', 'Chen', 'Chloe', 'David', 'Emeka', 'Fatima', 'Grace', 'Hiro',
+    'Ines', 'James', 'Kemi', 'Lars', 'Maria', 'Noah', 'Olga', 'Priya', 'Sofia', 'Tunde',
+)
+LAST_NAMES = (
+    'Adeyemi', 'Brown', 'Costa', 'Dubois', 'Eze', 'Fischer', 'Garcia', 'Haddad', 'Ito', 'Johnson',
+    'Kowalski', 'Lee', 'Mensah', 'Novak', 'Okafor', 'Patel', 'Rossi', 'Silva', 'Smith', 'Wang',
+)
+# Weighted towards the usual half-hour consultation
+DURATIONS = (15, 30, 30, 30, 45, 60)
+REASONS = ('Checkup', 'Follow-up', 'Consultation', 'Vaccination', 'Lab results', 'Prescription renewal', None)
+
+# Appointments start on the quarter hour between 08:00 and 17:00, Monday to Friday
+SLOT_MINUTES = 15
+DAY_START = 8 * 60
+DAY_END = 17 * 60
+WORKDAYS = range(5)
+
+# Share of past appointments that were completed and of future ones still scheduled; the rest were canceled
+PAST_COMPLETED = 0.85
+FUTURE_SCHEDULED = 0.9
+# Attempts at finding a free slot before an appointment is recorded as canceled
+PLACEMENT_ATTEMPTS = 5
+
+
+class Command(BaseCommand):
+    account_columns = (
+        'email', 'first_name', 'last_name', 'password', 'created_by', 'date_joined', 'is_active', 'is_staff',
+        'is_superuser',
+    )
+    appointment_columns = ('doctor', 'patient', 'date', 'time', 'duration_minutes', 'end_time', 'status', 'reason')
+    help = (
+        "Generate a deterministic synthetic dataset of doctors, patients (both patient models) and "
+        "appointments with bulk inserts. The same options and --anchor-date always produce the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--doctors', type=int, default=10)
+        parser.add_argument('--patients-per-doctor', type=int, default=100)
+        parser.add_argument('--appointments-per-patient', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0, help="Random seed.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Appointments written per transaction.")
+        parser.add_argument(
+            '--domain', default='seed.example.com',
+            help="Email domain of the generated accounts; use another one to seed more data next to existing rows.",
+        )
+        parser.add_argument(
+            '--anchor-date', type=datetime.date.fromisoformat,
+            help="Date treated as today, YYYY-MM-DD. Defaults to the current date.",
+        )
+        parser.add_argument('--past-days', type=int, default=365, help="How far back appointments go.")
+        parser.add_argument('--future-days', type=int, default=90, help="How far ahead appointments go.")
+        parser.add_argument(
+            '--password', default='password123',
+            help="Password of every generated account. It is hashed once and the hash is shared.",
+        )
+
+    def handle(self, *args, **options):
+        for name in ('doctors', 'patients_per_doctor', 'appointments_per_patient', 'past_days', 'future_days'):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} must not be negative.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        domain = options['domain']
+        if Doctor.objects.filter(email__endswith=f'@{domain}').exists():
+            raise CommandError(f"Accounts under @{domain} already exist; pass another --domain.")
+
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.anchor = options['anchor_date'] or timezone.localdate()
+        self.password = password_hashing.hash_password(options['password'])
+        self.counts = dict.fromkeys(('doctors', 'patients', 'patient accounts', 'appointments'), 0)
+        self.appointments = []
+
+        # Appointment days as offsets from the anchor date, and their values adapted for the database
+        self.days = [
+            day for day in range(-options['past_days'], options['future_days'] + 1)
+            if (self.anchor + datetime.timedelta(days=day)).weekday() in WORKDAYS
+        ]
+        if not self.days and options['appointments_per_patient']:
+            raise CommandError("The appointment window contains no working days.")
+        self.dates = {
+            day: connection.ops.adapt_datefield_value(self.anchor + datetime.timedelta(days=day)) for day in self.days
+        }
+        self.times = {
+            minute: connection.ops.adapt_timefield_value(datetime.time(minute // 60, minute % 60))
+            for minute in range(DAY_START, DAY_END + 1, SLOT_MINUTES)
+        }
+        joined = datetime.datetime.combine(self.anchor, datetime.time())
+        self.joined = connection.ops.adapt_datetimefield_value(
+            timezone.make_aware(joined) if settings.USE_TZ else joined
+        )
+        started = time.perf_counter()
+
+        doctor_ids = self.create_doctors()
+        for number, doctor_id in enumerate(doctor_ids):
+            self.create_patients(number, doctor_id)
+        self.flush_appointments()
+
+        elapsed = time.perf_counter() - started
+        total = sum(self.counts.values())
+        summary = ', '.join(f"{count} {name}" for name, count in self.counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {summary} in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    def create_doctors(self):
+        domain, batch_size = self.options['domain'], self.options['batch_size']
+        doctors = [
+            Doctor(
+                email=f'doctor{number}@{domain}',
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                password=self.password,
+                availability_days='Mon-Fri',
+                availability_time_range='08:00-17:00',
+            )
+            for number in range(self.options['doctors'])
+        ]
+        with transaction.atomic():
+            Doctor.objects.bulk_create(doctors, batch_size=batch_size)
+            DoctorAvailability.objects.bulk_create(
+                (
+                    DoctorAvailability(
+                        doctor_id=doctor.id,
+                        weekday=weekday,
+                        start_time=datetime.time(DAY_START // 60),
+                        end_time=datetime.time(DAY_END // 60),
+                    )
+                    for doctor in doctors
+                    for weekday in WORKDAYS
+                ),
+                batch_size=batch_size,
+            )
+        self.counts['doctors'] += len(doctors)
+        return [doctor.id for doctor in doctors]
+
+    def create_patients(self, doctor_number, doctor_id):
+        domain, per_doctor = self.options['domain'], self.options['patients_per_doctor']
+        people = [
+            (
+                f'patient{doctor_number * per_doctor + number}@{domain}',
+                self.rng.choice(FIRST_NAMES),
+                self.rng.choice(LAST_NAMES),
+            )
+            for number in range(per_doctor)
+        ]
+        data_version = next_data_version()
+        self.insert(Patient, ('email', 'first_name', 'last_name', 'password', 'created_by', 'data_version'), [
+            (email, first, last, self.password, doctor_id, data_version) for email, first, last in people
+        ])
+        self.insert(PatientAccount, self.account_columns, [
+            (email, first, last, self.password, doctor_id, self.joined, True, False, False)
+            for email, first, last in people
+        ])
+        # The doctor is new, so its patients are exactly the rows just inserted, in id order
+        patient_ids = list(Patient.objects.filter(created_by_id=doctor_id).order_by('id').values_list('id', flat=True))
+        self.counts['patients'] += len(people)
+        self.counts['patient accounts'] += len(people)
+
+        # Slots taken by the doctor's completed and scheduled appointments, as (day, quarter)
+        taken = set()
+        for patient_id in patient_ids:
+            for _ in range(self.options['appointments_per_patient']):
+                self.appointments.append(self.make_appointment(doctor_id, patient_id, taken))
+                if len(self.appointments) >= self.options['batch_size']:
+                    self.flush_appointments()
+
+    def make_appointment(self, doctor_id, patient_id, taken):
+        rng = self.rng
+        for _ in range(PLACEMENT_ATTEMPTS):
+            day = rng.choice(self.days)
+            duration = rng.choice(DURATIONS)
+            start = rng.randrange(DAY_START, DAY_END - duration + 1, SLOT_MINUTES)
+            slots = {(day, quarter) for quarter in range(start // SLOT_MINUTES, (start + duration) // SLOT_MINUTES)}
+            if not slots & taken:
+                if day < 0:
+                    status = 'completed' if rng.random() < PAST_COMPLETED else 'canceled'
+                else:
+                    status = 'scheduled' if rng.random() < FUTURE_SCHEDULED else 'canceled'
+                if status != 'canceled':
+                    taken |= slots
+                break
+        else:
+            status = 'canceled'
+        return (
+            doctor_id,
+            patient_id,
+            self.dates[day],
+            self.times[start],
+            duration,
+            self.times[start + duration],
+            status,
+            rng.choice(REASONS),
+        )
+
+    def flush_appointments(self):
+        if not self.appointments:
+            return
+        self.insert(Appointment, self.appointment_columns, self.appointments)
+        self.counts['appointments'] += len(self.appointments)
+        self.appointments = []
+        if self.options['verbosity'] > 1:
+            self.stdout.write(f"{self.counts['appointments']} appointments written.")
+
+    def insert(self, model, columns, rows):
+        """
+        Insert ``rows`` of database-ready values for ``columns`` with one executemany.
+
+        Compiling millions of model instances into SQL costs several times more
+        than the database takes to store the rows, so everything except the
+        doctors skips bulk_create.
+        """
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(model._meta.get_field(column).column) for column in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
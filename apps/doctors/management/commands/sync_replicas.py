@@ -0,0 +1,32 @@
+import sqlite3
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the default SQLite database into every SQLite replica in DB_REPLICA_NAMES, to try the read "
+        "replica routing locally. Replicas only see writes made up to the last copy."
+    )
+
+    def handle(self, *args, **options):
+        aliases = settings.DATABASE_REPLICAS['ALIASES']
+        if not aliases:
+            raise CommandError("No replicas are configured; set DB_REPLICA_NAMES.")
+        for alias in (DEFAULT_DB_ALIAS, *aliases):
+            if connections[alias].vendor != 'sqlite' or connections[alias].is_in_memory_db():
+                raise CommandError(f"Database '{alias}' is not an SQLite file.")
+
+        source = sqlite3.connect(connections[DEFAULT_DB_ALIAS].settings_dict['NAME'])
+        try:
+            for alias in aliases:
+                target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+                try:
+                    # The backup API copies a consistent snapshot, even while the primary is written to
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"Copied the default database to '{alias}'.")
+        finally:
+            source.close()
@@ -0,0 +1,177 @@
+import bisect
+import threading
+from apps.doctors.authentication import credential_cache
+from apps.doctors.caching import response_cache
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Requests that match no URL pattern are grouped together to keep the label set bounded
+UNRESOLVED_VIEW = '<unresolved>'
+KNOWN_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+
+class ViewMetrics:
+    """
+    Totals for one (view, route, method) combination.
+    """
+    __slots__ = ('buckets', 'count', 'seconds', 'queries', 'db_seconds', 'response_bytes', 'statuses', 'aliases')
+
+    def __init__(self, bucket_count):
+        # One counter per bucket plus +Inf, not yet cumulative
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.response_bytes = 0
+        self.statuses = {}
+        self.aliases = {}
+
+
+class MetricsRegistry:
+    """
+    In-process request metrics rendered in the Prometheus text exposition format.
+
+    Each worker process keeps its own totals, so scrape every process (or run
+    one metrics-serving process per host). Recording a request takes one lock
+    and a few additions.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def observe(self, view, route, method, status, seconds, queries, db_seconds, response_bytes, aliases=None):
+        """
+        Record one finished request.
+
+        Args:
+            view (str): The resolved view name.
+            route (str): The matched URL pattern.
+            method (str): The HTTP method.
+            status (int): The response status code.
+            seconds (float): Time taken to produce the response.
+            queries (int): Number of SQL queries run.
+            db_seconds (float): Time spent in those queries.
+            response_bytes (int): Size of the response body.
+            aliases (dict): Number of SQL queries run per database alias.
+        """
+        if method not in KNOWN_METHODS:
+            method = 'OTHER'
+        key = (view, route, method)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            metrics = self._views.get(key)
+            if metrics is None:
+                metrics = self._views[key] = ViewMetrics(len(self.buckets))
+            metrics.buckets[index] += 1
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.queries += queries
+            metrics.db_seconds += db_seconds
+            metrics.response_bytes += response_bytes
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            for alias, count in (aliases or {}).items():
+                metrics.aliases[alias] = metrics.aliases.get(alias, 0) + count
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def render(self):
+        """
+        Return every metric in the Prometheus text format.
+        """
+        with self._lock:
+            views = [
+                (key, list(metrics.buckets), metrics.count, metrics.seconds, metrics.queries,
+                 metrics.db_seconds, metrics.response_bytes, dict(metrics.statuses), dict(metrics.aliases))
+                for key, metrics in sorted(self._views.items())
+            ]
+
+        lines = [
+            '# HELP http_request_duration_seconds Time taken to produce a response.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for key, buckets, count, seconds, *_ in views:
+            labels = _labels(key)
+            cumulative = 0
+            for bound, observed in zip(self.buckets + (float('inf'),), buckets):
+                cumulative += observed
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{_number(bound)}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {_number(seconds)}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {count}')
+
+        lines += [
+            '# HELP http_responses_total Responses sent, by status code.',
+            '# TYPE http_responses_total counter',
+        ]
+        for key, *_, statuses, _aliases in views:
+            labels = _labels(key)
+            for status, count in sorted(statuses.items()):
+                lines.append(f'http_responses_total{{{labels},status="{status}"}} {count}')
+
+        for name, index, help_text in (
+            ('http_request_db_queries_total', 4, 'SQL queries run while handling requests.'),
+            ('http_request_db_seconds_total', 5, 'Time spent in SQL queries while handling requests.'),
+            ('http_response_size_bytes_total', 6, 'Bytes of response bodies, streaming responses excluded.'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            lines += [f'{name}{{{_labels(view[0])}}} {_number(view[index])}' for view in views]
+
+        lines += [
+            '# HELP http_request_db_alias_queries_total SQL queries run while handling requests, by database alias.',
+            '# TYPE http_request_db_alias_queries_total counter',
+        ]
+        for key, *_, aliases in views:
+            labels = _labels(key)
+            for alias, count in sorted(aliases.items()):
+                lines.append(f'http_request_db_alias_queries_total{{{labels},alias="{_escape(alias)}"}} {count}')
+
+        cache = credential_cache.stats()
+        lines += [
+            '# HELP basic_auth_cache_hits_total Basic auth credential cache hits.',
+            '# TYPE basic_auth_cache_hits_total counter',
+            f"basic_auth_cache_hits_total {cache['hits']}",
+            '# HELP basic_auth_cache_misses_total Basic auth credential cache misses.',
+            '# TYPE basic_auth_cache_misses_total counter',
+            f"basic_auth_cache_misses_total {cache['misses']}",
+            '# HELP basic_auth_cache_entries Entries in the basic auth credential cache.',
+            '# TYPE basic_auth_cache_entries gauge',
+            f"basic_auth_cache_entries {cache['size']}",
+        ]
+        responses = response_cache.stats()
+        lines += [
+            '# HELP response_cache_hits_total Responses served from the response cache.',
+            '# TYPE response_cache_hits_total counter',
+            f"response_cache_hits_total {responses['hits']}",
+            '# HELP response_cache_misses_total Cacheable requests that missed the response cache.',
+            '# TYPE response_cache_misses_total counter',
+            f"response_cache_misses_total {responses['misses']}",
+            '# HELP response_cache_hit_ratio Share of cacheable requests served from the response cache.',
+            '# TYPE response_cache_hit_ratio gauge',
+            f"response_cache_hit_ratio {_number(responses['hit_ratio'])}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(key):
+    view, route, method = key
+    return f'view="{_escape(view)}",route="{_escape(route)}",method="{method}"'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
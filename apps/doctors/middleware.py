@@ -0,0 +1,143 @@
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import SAFE_METHODS
+from apps.doctors.metrics import UNRESOLVED_VIEW, registry
+from apps.doctors.routers import replica_reads
+
+# Counter of the request being handled. Context variables follow the request into the
+# threads sync_to_async runs ORM calls in, which per-connection wrappers set up in the
+# request's own thread would miss under ASGI.
+current_counter = ContextVar('current_counter', default=None)
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting queries and the time spent running them.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.aliases = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.queries += 1
+            alias = context['connection'].alias
+            self.aliases[alias] = self.aliases.get(alias, 0) + 1
+
+
+def count_queries(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every connection, forwarding to the counter of the current request.
+    """
+    counter = current_counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """
+    connection_created receiver adding ``count_queries`` to each new database connection.
+    """
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, query count, database time and response size per resolved view.
+
+    Works under WSGI and ASGI without forcing async views onto a thread.
+    Streaming responses are timed up to the point the view returns them, and
+    their size is not recorded. Disable with METRICS_ENABLED=False.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        token = current_counter.set(counter)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_counter.reset(token)
+        self.observe(request, response, counter, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        token = current_counter.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_counter.reset(token)
+        self.observe(request, response, counter, time.perf_counter() - start)
+        return response
+
+    def observe(self, request, response, counter, seconds):
+        match = request.resolver_match
+        if match is None:
+            view, route = UNRESOLVED_VIEW, ''
+        else:
+            view, route = match.view_name, match.route
+        registry.observe(
+            view,
+            route,
+            request.method,
+            response.status_code,
+            seconds,
+            counter.queries,
+            counter.seconds,
+            0 if response.streaming else len(response.content),
+            counter.aliases,
+        )
+
+
+class ReplicaReadMiddleware:
+    """
+    Sends the reads of GET, HEAD and OPTIONS requests to a replica, see apps/doctors/routers.py.
+
+    Streaming responses are consumed after the middleware returns, so views
+    streaming a queryset bind it to its database while the request is routed.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.method not in SAFE_METHODS:
+            return self.get_response(request)
+        with replica_reads():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.method not in SAFE_METHODS:
+            return await self.get_response(request)
+        with replica_reads():
+            return await self.get_response(request)
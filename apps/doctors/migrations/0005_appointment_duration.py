@@ -0,0 +1,46 @@
+import datetime
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def fill_end_time(apps, schema_editor):
+    # Existing appointments get the default duration.
+    Appointment = apps.get_model('doctors', 'Appointment')
+    batch = []
+    for appointment in Appointment.objects.only('id', 'time', 'duration_minutes').iterator(chunk_size=2000):
+        start = datetime.datetime.combine(datetime.date.min, appointment.time)
+        end = start + datetime.timedelta(minutes=appointment.duration_minutes)
+        appointment.end_time = end.time() if end.date() == start.date() else datetime.time.max
+        batch.append(appointment)
+        if len(batch) >= 2000:
+            Appointment.objects.bulk_update(batch, ['end_time'])
+            batch = []
+    if batch:
+        Appointment.objects.bulk_update(batch, ['end_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0004_doctor_availability_day_slots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='duration_minutes',
+            field=models.PositiveSmallIntegerField(default=30, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(480)]),
+        ),
+        migrations.AddField(
+            model_name='appointment',
+            name='end_time',
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_end_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='appointment',
+            name='end_time',
+            field=models.TimeField(editable=False),
+        ),
+    ]
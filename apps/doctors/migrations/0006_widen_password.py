@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0005_appointment_duration'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='doctor',
+            name='password',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='patient',
+            name='password',
+            field=models.CharField(max_length=255),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:40
+
+import apps.doctors.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0007_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doctor',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=apps.doctors.models.next_data_version, editable=False),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=apps.doctors.models.next_data_version, editable=False),
+        ),
+    ]
@@ -1,7 +1,46 @@
+import datetime
+import time
 from django.db import models
+from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Permission
-from django.core.validators import RegexValidator
-from django.contrib.auth.hashers import make_password
+from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
+from apps.doctors.hashing import is_password_hashed, password_hashing
+
+# Roles of the two kinds of principal. Every Doctor and Patient instance carries its
+# role, so permission classes and views can tell them apart without probing.
+ROLE_DOCTOR = 'doctor'
+ROLE_PATIENT = 'patient'
+
+
+def next_data_version():
+    """
+    Return the data version of an owner changed now: the next whole second, as a Unix time.
+    """
+    return int(time.time()) + 1
+
+
+class DataVersionModel(models.Model):
+    """
+    Abstract base of the accounts whose responses carry validators.
+
+    ``data_version`` is the Unix time, in whole seconds, of the last change to
+    the data shown to the account, and only ever moves forward through
+    ``ResponseCache.bump``. A full ``save()`` of a loaded instance leaves it
+    out, so a stale instance never writes an older version back.
+    """
+    data_version = models.PositiveBigIntegerField(default=next_data_version, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'data_version' and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
 
 
 class DoctorManager(BaseUserManager):
@@ -14,7 +53,7 @@ class DoctorManager(BaseUserManager):
         email = self.normalize_email(email)
         extra_fields.setdefault('is_active', True)
         doctor = Doctor(email=email, **extra_fields)
-        doctor.set_password(password)
+        doctor.password = password_hashing.hash_password(password)
         doctor.save(using=self._db)
         return doctor
 
@@ -28,7 +67,7 @@ class DoctorManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
-class Doctor(AbstractUser):
+class Doctor(AbstractUser, DataVersionModel):
     """
     Custom user model for doctors.
     """
@@ -42,7 +81,7 @@ class Doctor(AbstractUser):
         blank=True,
         null=True
     )
-    password = models.CharField(max_length=128)
+    password = models.CharField(max_length=255)
     address = models.CharField(max_length=255, blank=True, null=True)
     availability_days = models.CharField(max_length=100, blank=True, null=True)
     availability_time_range = models.CharField(max_length=50, blank=True, null=True)
@@ -57,34 +96,92 @@ class Doctor(AbstractUser):
     USERNAME_FIELD = 'email'  # Use email to log in
     REQUIRED_FIELDS = ['first_name', 'last_name']
     objects = DoctorManager()  # Use the custom manager
+    role = ROLE_DOCTOR
 
     def __str__(self):
         return f'{self.first_name} {self.last_name} ({self.email})'
 
 
-class Patient(models.Model):
+class Patient(DataVersionModel):
     """
     Model representing a patient.
     """
     first_name = models.CharField(max_length=30)
     last_name = models.CharField(max_length=30)
     email = models.EmailField(unique=True)
-    password = models.CharField(max_length=128)
-    created_by = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='patients')
+    password = models.CharField(max_length=255)
+    # Covered by the (created_by, id) index below
+    created_by = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='patients', db_index=False)
+    role = ROLE_PATIENT
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_by', 'id'], name='patient_created_by_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
 
     def save(self, *args, **kwargs):
-        # Hash the password before saving
-        if not self.password.startswith('pbkdf2_'):
-            self.password = make_password(self.password)
+        # Hash the password before saving, unless a configured hasher already encoded it
+        if not is_password_hashed(self.password):
+            self.password = password_hashing.hash_password(self.password)
         super().save(*args, **kwargs)
 
     @property
     def is_authenticated(self):
         return True
 
+    def check_password(self, raw_password):
+        """
+        Return whether ``raw_password`` matches the stored hash, like ``Doctor.check_password``.
+
+        A hash made by another hasher or with other parameters than the
+        current default is replaced on success.
+        """
+        def setter(raw_password):
+            self.password = make_password(raw_password)
+            self.save(update_fields=['password'])
+
+        return check_password(raw_password, self.password, setter)
+
+
+def appointment_end_time(start_time, duration_minutes):
+    """
+    Return the time at which an appointment starting at ``start_time`` ends.
+
+    Raises:
+        ValueError: If the appointment would run past midnight.
+    """
+    start = datetime.datetime.combine(datetime.date.min, start_time)
+    end = start + datetime.timedelta(minutes=duration_minutes)
+    if end.date() != start.date():
+        raise ValueError("Appointments must end before midnight.")
+    return end.time()
+
+
+class AppointmentQuerySet(models.QuerySet):
+    def overlapping(self, doctor_id, date, start_time, end_time):
+        """
+        Scheduled appointments of a doctor that intersect [start_time, end_time) on a date.
+
+        Appointments that merely touch the interval are not overlapping. No
+        appointment is longer than MAX_DURATION_MINUTES, so the start time is
+        bounded on both sides and the lookup is a narrow range scan of the
+        (doctor, date, time) index rather than a walk over the whole day.
+        """
+        queryset = self.filter(
+            doctor_id=doctor_id,
+            date=date,
+            status='scheduled',
+            time__lt=end_time,
+            end_time__gt=start_time,
+        )
+        earliest = start_time.hour * 60 + start_time.minute - Appointment.MAX_DURATION_MINUTES
+        if earliest >= 0:
+            queryset = queryset.filter(time__gt=datetime.time(earliest // 60, earliest % 60))
+        return queryset
+
 
 class Appointment(models.Model):
     """
@@ -95,12 +192,123 @@ class Appointment(models.Model):
         ('completed', 'Completed'),
         ('canceled', 'Canceled'),
     ]
-    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='appointments')
-    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='appointments')
+    DEFAULT_DURATION_MINUTES = 30
+    MAX_DURATION_MINUTES = 8 * 60
+    # Both foreign keys are covered by the composite indexes below
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='appointments', db_index=False)
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='appointments', db_index=False)
     date = models.DateField()
     time = models.TimeField()
+    duration_minutes = models.PositiveSmallIntegerField(
+        default=DEFAULT_DURATION_MINUTES,
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_DURATION_MINUTES)],
+    )
+    # Derived from time and duration_minutes on save
+    end_time = models.TimeField(editable=False)
     status = models.CharField(max_length=20, choices=APPOINTMENT_STATUS_CHOICES, default='scheduled')
     reason = models.TextField(blank=True, null=True)
 
+    objects = AppointmentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Appointment lists filter on the owner and are ordered by (date, time)
+            models.Index(fields=['doctor', 'date', 'time'], name='appointment_doctor_date_idx'),
+            models.Index(fields=['patient', 'date', 'time'], name='appointment_patient_date_idx'),
+            # Upcoming work only ever looks at scheduled appointments
+            models.Index(
+                fields=['date', 'time'],
+                condition=models.Q(status='scheduled'),
+                name='appointment_scheduled_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"Appointment with {self.patient.first_name} {self.patient.last_name} on {self.date} at {self.time}"
+
+    def save(self, *args, **kwargs):
+        # Keep the stored end time in step with the start time and duration
+        self.time = self._meta.get_field('time').to_python(self.time)
+        self.end_time = appointment_end_time(self.time, self.duration_minutes)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'time', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'end_time'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the stored values so saves can tell which slot an appointment left.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class DoctorAvailability(models.Model):
+    """
+    Model representing a weekly recurring window in which a doctor sees patients.
+    """
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='weekly_availability')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        ordering = ['weekday', 'start_time']
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(start_time__lt=models.F('end_time')),
+                name='availability_start_before_end',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_weekday_display()} {self.start_time:%H:%M} - {self.end_time:%H:%M}"
+
+
+class DoctorDaySlots(models.Model):
+    """
+    Model holding the precomputed slot bitmaps of one doctor on one day.
+
+    Bit ``i`` stands for the slot starting ``i * slot_minutes`` after midnight.
+    ``available`` comes from the weekly schedule and ``free`` is ``available``
+    minus the slots taken by scheduled appointments.
+    """
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='day_slots', db_index=False)
+    date = models.DateField()
+    slot_minutes = models.PositiveSmallIntegerField()
+    available = models.BinaryField()
+    free = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['doctor', 'date'], name='day_slots_doctor_date_unique'),
+        ]
+
+    def __str__(self):
+        return f"Slots for doctor {self.doctor_id} on {self.date}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Model recording how far the import_records command got through a file.
+
+    Each batch updates its checkpoint in the transaction that inserts it, so
+    after a crash the checkpoint names exactly the records that were committed.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    source = models.CharField(max_length=1024)
+    offset = models.PositiveBigIntegerField()
+    records = models.PositiveBigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Import of {self.source} after record {self.records}"
@@ -0,0 +1,148 @@
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a unique, composite ordering such as (date, time, id).
+
+    DRF's CursorPagination only filters on the first ordering field and skips
+    over ties with an offset. Here the opaque cursor holds the full key of the
+    last row seen and the next page is selected with a lexicographic comparison
+    on every ordering field. Each page is therefore one range scan of an index
+    and no COUNT(*) is ever run, so deep pages cost the same as the first one.
+    The ordering must end with a unique field.
+    """
+    page_size = settings.API_PAGINATION['PAGE_SIZE']
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_PAGINATION['MAX_PAGE_SIZE']
+    ordering = ('id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of ``paginate_queryset`` reading the page with async iteration.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the query selecting the requested page plus one row, or None when pagination is off.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.current_position = self.cursor.position if self.cursor is not None else None
+
+        ordering = _reverse_ordering(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.current_position is not None:
+            queryset = queryset.filter(self.get_position_filter(queryset.model, ordering, self.current_position))
+
+        # Fetch one extra row to find out whether another page follows.
+        return queryset[:self.page_size + 1]
+
+    @property
+    def reverse(self):
+        return self.cursor is not None and self.cursor.reverse
+
+    def set_page(self, results):
+        """
+        Keep the page out of the rows fetched by ``get_page_queryset`` and return it.
+        """
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = self.current_position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.current_position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_position_filter(self, model, ordering, position):
+        """
+        Build the filter selecting rows strictly after ``position`` in ``ordering``.
+
+        For ordering (a, b, c) this is ``a >= x AND (a > x OR (a = x AND b > y) OR
+        (a = x AND b = y AND c > z))``. The leading ``a >= x`` lets the database
+        use it as an index range bound.
+        """
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            values = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(ordering, values)
+            ]
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        after = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            after |= equal & Q(**{name + lookup: value})
+            equal &= Q(**{name: value})
+
+        first = ordering[0]
+        bound_lookup = '__lte' if first.startswith('-') else '__gte'
+        return Q(**{first.lstrip('-') + bound_lookup: values[0]}) & after
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering) if self.page else self.current_position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering) if self.page else self.current_position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            values.append(str(instance[name] if isinstance(instance, dict) else getattr(instance, name)))
+        return json.dumps(values, separators=(',', ':'))
+
+
+class AppointmentCursorPagination(KeysetCursorPagination):
+    """
+    Pages appointments in chronological order.
+    """
+    ordering = ('date', 'time', 'id')
+
+
+class PatientCursorPagination(KeysetCursorPagination):
+    """
+    Pages patients in creation order.
+    """
+    ordering = ('id',)
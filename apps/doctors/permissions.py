@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from apps.doctors.models import Doctor
+from apps.doctors.models import ROLE_DOCTOR
 
 class IsDoctor(permissions.BasePermission):
     """
@@ -17,7 +17,7 @@ class IsDoctor(permissions.BasePermission):
         Returns:
             bool: True if the user is authenticated and is a Doctor, False otherwise.
         """
-        return request.user and request.user.is_authenticated and isinstance(request.user, Doctor)
+        return bool(request.user and request.user.is_authenticated and getattr(request.user, 'role', None) == ROLE_DOCTOR)
 
 class CanManagePatient(permissions.BasePermission):
     """
@@ -36,7 +36,7 @@ class CanManagePatient(permissions.BasePermission):
             bool: True if the user is authenticated and is a Doctor, False otherwise.
         """
         # The user must be a doctor to manage patients.
-        return request.user and request.user.is_authenticated and hasattr(request.user, 'doctor')
+        return bool(request.user and request.user.is_authenticated and getattr(request.user, 'role', None) == ROLE_DOCTOR)
 
     def has_object_permission(self, request, view, obj):
         """
@@ -50,5 +50,25 @@ class CanManagePatient(permissions.BasePermission):
         Returns:
             bool: True if the logged-in doctor is the creator of the patient, False otherwise.
         """
-        # THis give object-level permission to allow doctors to manage only their own patients.
-        return request.user == obj.created_by
+        # This gives object-level permission to allow doctors to manage only their own patients.
+        # Comparing ids leaves the created_by relation unloaded.
+        return obj.created_by_id == request.user.pk
+
+class IsStaff(permissions.BasePermission):
+    """
+    Permission allowing only staff accounts, such as monitoring scrapers.
+    """
+
+    def has_permission(self, request, view):
+        """
+        Check if the user is authenticated and has the staff flag.
+
+        Args:
+            request: The HTTP request instance.
+            view: The view instance.
+
+        Returns:
+            bool: True if the user is an authenticated staff member, False otherwise.
+        """
+        # Patients have no is_staff attribute at all.
+        return bool(request.user and request.user.is_authenticated and getattr(request.user, 'is_staff', False))
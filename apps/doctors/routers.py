@@ -0,0 +1,74 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Replica routing state of the current request, None where reads must go to the primary.
+# Context variables follow the request into the threads sync_to_async runs ORM calls in.
+_current_reads = ContextVar('replica_reads', default=None)
+
+
+class ReplicaReads:
+    """
+    The replica one request reads from, and whether a write has pinned it to the primary.
+    """
+    __slots__ = ('alias', 'pinned')
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.pinned = False
+
+
+def replica_aliases():
+    return settings.DATABASE_REPLICAS['ALIASES']
+
+
+@contextmanager
+def replica_reads():
+    """
+    Send the reads made inside the block to a replica, until the first write.
+
+    One replica is picked for the whole block, so its reads see a consistent
+    state. Without configured replicas every read stays on the primary.
+    """
+    aliases = replica_aliases()
+    token = _current_reads.set(ReplicaReads(random.choice(aliases)) if aliases else None)
+    try:
+        yield
+    finally:
+        _current_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Routes reads inside ``replica_reads`` to a replica and everything else to the primary.
+
+    Once a block writes, its later reads go to the primary as well, so they
+    see the write instead of a replica that may not have received it yet.
+    Instances read from a replica are saved to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        reads = _current_reads.get()
+        if reads is None:
+            return None
+        return DEFAULT_DB_ALIAS if reads.pinned else reads.alias
+
+    def db_for_write(self, model, **hints):
+        reads = _current_reads.get()
+        if reads is not None:
+            reads.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary
+        if db in replica_aliases():
+            return False
+        return None
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from apps.doctors.models import Doctor, Patient, Appointment
-from django.contrib.auth.hashers import make_password
+from django.db import router, transaction
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorAvailability, appointment_end_time
+from apps.doctors import slots
+from apps.doctors.hashing import password_hashing
 
 User = get_user_model()
 
@@ -44,17 +46,124 @@ class PatientCreationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         # Hash the password
-        validated_data['password'] = make_password(validated_data['password'])
+        validated_data['password'] = password_hashing.hash_password(validated_data['password'])
         return Patient.objects.create(**validated_data)
 
 
+class PatientBulkRowSerializer(PatientCreationSerializer):
+    """
+    Validates a single row of a bulk patient upload.
+
+    Email uniqueness is checked once for the whole upload by the view rather
+    than with one query per row.
+    """
+    class Meta(PatientCreationSerializer.Meta):
+        extra_kwargs = {'email': {'validators': []}}
+
+
 class PatientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Patient
         fields = ['id', 'first_name', 'last_name', 'email', 'created_by']
 
 
+class PatientSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact patient embedded in appointments with ?expand=patient.
+    """
+    class Meta:
+        model = Patient
+        fields = ['id', 'first_name', 'last_name', 'email']
+
+
+class DoctorSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact doctor embedded in appointments with ?expand=doctor.
+    """
+    class Meta:
+        model = Doctor
+        fields = ['id', 'first_name', 'last_name', 'email']
+
+
 class AppointmentSerializer(serializers.ModelSerializer):
+    # Relations a view may replace with nested objects when the serializer context lists them in 'expand'
+    expandable_fields = {'patient': PatientSummarySerializer, 'doctor': DoctorSummarySerializer}
+
     class Meta:
         model = Appointment
-        fields = ['id', 'patient', 'doctor', 'date', 'time', 'status', 'reason']
+        fields = ['id', 'patient', 'doctor', 'date', 'time', 'duration_minutes', 'end_time', 'status', 'reason']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for name in self.context.get('expand', ()):
+            data[name] = self.expandable_fields[name](getattr(instance, name)).data
+        return data
+
+    def validate(self, data):
+        slot = self.get_booked_slot(data)
+        if slot is not None:
+            self.check_overlap(*slot)
+        return data
+
+    def save(self, **kwargs):
+        """
+        Save the appointment while holding a lock on its doctor, checking again for overlaps under the lock.
+
+        Concurrent bookings of one slot can both pass ``validate``. Taking the
+        doctor's row lock before the check and the write serialises them, so
+        the second one sees the first. SQLite has no row locks, but its
+        IMMEDIATE transactions already take the database write lock on BEGIN.
+        """
+        slot = self.get_booked_slot({**self.validated_data, **kwargs})
+        if slot is None:
+            return super().save(**kwargs)
+        using = router.db_for_write(Appointment)
+        with transaction.atomic(using=using):
+            slots.lock_doctor(slot[0], using)
+            self.check_overlap(*slot, using=using)
+            return super().save(**kwargs)
+
+    def get_booked_slot(self, data):
+        """
+        Return the (doctor_id, date, time, end_time) the appointment would hold, or None if it holds no slot.
+        """
+        instance = self.instance
+
+        def current(field):
+            return data[field] if field in data else getattr(instance, field, None)
+
+        status = current('status') or 'scheduled'
+        doctor = data['doctor'].pk if 'doctor' in data else getattr(instance, 'doctor_id', None)
+        date = current('date')
+        time = current('time')
+        duration = current('duration_minutes') or Appointment.DEFAULT_DURATION_MINUTES
+        if time is None:
+            return None
+
+        try:
+            end_time = appointment_end_time(time, duration)
+        except ValueError as exc:
+            raise serializers.ValidationError({"duration_minutes": str(exc)})
+
+        # Only scheduled appointments hold on to their time slot.
+        if status != 'scheduled' or doctor is None or date is None:
+            return None
+        return doctor, date, time, end_time
+
+    def check_overlap(self, doctor_id, date, time, end_time, using=None):
+        overlapping = Appointment.objects.using(using).overlapping(doctor_id, date, time, end_time)
+        if self.instance is not None:
+            overlapping = overlapping.exclude(pk=self.instance.pk)
+        if overlapping.exists():
+            raise serializers.ValidationError({"time": "The doctor already has an appointment at this time."})
+
+
+class DoctorAvailabilitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DoctorAvailability
+        fields = ['weekday', 'start_time', 'end_time']
+
+    def validate(self, data):
+        if data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError({"end_time": "End time must be after start time."})
+        return data
@@ -0,0 +1,136 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.doctors import slots
+from apps.doctors.authentication import ROLE_DOCTOR, ROLE_PATIENT, credential_cache
+from apps.doctors.caching import response_cache
+from apps.doctors.database import apply_sqlite_pragmas
+from apps.doctors.middleware import install_query_counter
+from apps.doctors.models import Appointment, Doctor, DoctorAvailability, Patient
+
+
+@receiver(post_save, sender=Doctor)
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Doctor)
+@receiver(post_delete, sender=Patient)
+def invalidate_cached_credentials(sender, instance, **kwargs):
+    """
+    Forget verified Basic credentials whenever an account is saved or deleted.
+
+    Any save may change the password or the active flag, and saves of user
+    accounts are rare compared to authenticated requests.
+    """
+    credential_cache.invalidate_user(instance)
+
+
+@receiver(post_save, sender=Doctor)
+@receiver(post_delete, sender=Doctor)
+def bump_doctor_versions(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Invalidate the cached responses and validators showing a doctor.
+
+    That is the doctor's own profile and lists, and the appointment lists of
+    their patients, which embed the doctor with ?expand=doctor. Logins only
+    touch last_login and the password hash, which no response shows, and a
+    new doctor starts with a fresh version and no appointments.
+    """
+    if created or (update_fields is not None and set(update_fields) <= {'last_login', 'password'}):
+        return
+    response_cache.bump(ROLE_DOCTOR, {instance.pk})
+    response_cache.bump(
+        ROLE_PATIENT, Appointment.objects.filter(doctor_id=instance.pk).values_list('patient_id', flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Patient)
+def bump_patient_versions(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Invalidate the cached responses and validators showing a patient.
+
+    That is the patient's own lists, their doctor's patient list and the
+    appointment lists of every doctor they see, which embed the patient with
+    ?expand=patient. Password rehashes on login change nothing they show, and
+    a new patient only appears in their doctor's list.
+    """
+    if update_fields is not None and set(update_fields) <= {'password'}:
+        return
+    if created:
+        response_cache.bump(ROLE_DOCTOR, {instance.created_by_id})
+        return
+    doctors = set(Appointment.objects.filter(patient_id=instance.pk).values_list('doctor_id', flat=True).distinct())
+    response_cache.bump(ROLE_DOCTOR, doctors | {instance.created_by_id})
+    response_cache.bump(ROLE_PATIENT, {instance.pk})
+
+
+# Connected before update_slots_on_save, which replaces the loaded values this reads
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def bump_appointment_versions(sender, instance, **kwargs):
+    """
+    Invalidate the cached lists of an appointment's doctor and patient, before and after the change.
+    """
+    before = getattr(instance, '_loaded_values', None) or {}
+    response_cache.bump(ROLE_DOCTOR, {instance.doctor_id, before.get('doctor_id')})
+    response_cache.bump(ROLE_PATIENT, {instance.patient_id, before.get('patient_id')})
+
+
+def _booked_slot(values):
+    """
+    Return the (doctor_id, date, time, duration_minutes) an appointment occupies, or None if it occupies nothing.
+    """
+    if values is None or values.get('status') != 'scheduled':
+        return None
+    if not {'doctor_id', 'date', 'time', 'duration_minutes'} <= values.keys():
+        return None
+    return (values['doctor_id'], *slots.normalize(values['date'], values['time']), values['duration_minutes'])
+
+
+@receiver(post_save, sender=Appointment)
+def update_slots_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Move an appointment's slots between the free bitmaps when it is booked, moved or canceled.
+    """
+    if raw:
+        return
+    current = {
+        'doctor_id': instance.doctor_id,
+        'patient_id': instance.patient_id,
+        'date': instance.date,
+        'time': instance.time,
+        'duration_minutes': instance.duration_minutes,
+        'status': instance.status,
+    }
+    before = _booked_slot(getattr(instance, '_loaded_values', None))
+    after = _booked_slot(current)
+    if before != after:
+        if before is not None:
+            slots.release(*before)
+        if after is not None:
+            slots.book(*after)
+    instance._loaded_values = current
+
+
+@receiver(post_delete, sender=Appointment)
+def update_slots_on_delete(sender, instance, **kwargs):
+    """
+    Free the slots of a deleted appointment.
+    """
+    booked = _booked_slot(getattr(instance, '_loaded_values', None))
+    if booked is not None:
+        slots.release(*booked)
+
+
+@receiver(post_save, sender=DoctorAvailability)
+@receiver(post_delete, sender=DoctorAvailability)
+def rebuild_slots_on_schedule_change(sender, instance, **kwargs):
+    """
+    Drop the stored bitmaps of a doctor whose weekly schedule changed.
+    """
+    slots.clear_day_slots(instance.doctor_id)
+
+
+# Lets RequestMetricsMiddleware count the queries of each request, whichever thread runs them
+connection_created.connect(install_query_counter, dispatch_uid='install_query_counter')
+# Applies SQLITE_PRAGMAS to every new SQLite connection
+connection_created.connect(apply_sqlite_pragmas, dispatch_uid='apply_sqlite_pragmas')
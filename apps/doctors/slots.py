@@ -0,0 +1,259 @@
+import contextvars
+import datetime
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import router, transaction
+from apps.doctors.models import Appointment, Doctor, DoctorAvailability, DoctorDaySlots
+
+MINUTES_PER_DAY = 24 * 60
+
+# The doctors whose bitmaps are cleared on leaving the innermost defer_clears() block, if inside one
+deferred_clears = contextvars.ContextVar('deferred_clears', default=None)
+
+
+def get_slot_minutes():
+    """
+    Return the slot granularity in minutes from settings.
+    """
+    return settings.APPOINTMENT_SLOTS['MINUTES']
+
+
+def to_minutes(value):
+    """
+    Return the number of minutes between midnight and a time.
+    """
+    return value.hour * 60 + value.minute
+
+
+def window_mask(start_minute, end_minute, slot_minutes):
+    """
+    Return the bits of every slot lying entirely inside [start_minute, end_minute).
+    """
+    first = -(-start_minute // slot_minutes)
+    last = min(end_minute, MINUTES_PER_DAY) // slot_minutes
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def booking_mask(start_minute, end_minute, slot_minutes):
+    """
+    Return the bits of every slot touched by [start_minute, end_minute), even partially.
+    """
+    first = start_minute // slot_minutes
+    last = -(-min(end_minute, MINUTES_PER_DAY) // slot_minutes)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def appointment_mask(time, duration_minutes, slot_minutes):
+    """
+    Return the bits taken by an appointment starting at ``time`` and lasting ``duration_minutes``.
+    """
+    start = to_minutes(time)
+    return booking_mask(start, start + duration_minutes, slot_minutes)
+
+
+def mask_to_times(mask, slot_minutes):
+    """
+    Return the start times of the set bits of ``mask`` as 'HH:MM' strings.
+    """
+    times = []
+    index = 0
+    while mask:
+        if mask & 1:
+            minute = index * slot_minutes
+            times.append(f"{minute // 60:02d}:{minute % 60:02d}")
+        mask >>= 1
+        index += 1
+    return times
+
+
+def encode_mask(mask, slot_minutes):
+    """
+    Pack a bitmap into the little-endian bytes stored on DoctorDaySlots.
+    """
+    size = -(-(MINUTES_PER_DAY // slot_minutes) // 8)
+    return mask.to_bytes(size, 'little')
+
+
+def decode_mask(value):
+    """
+    Unpack a stored bitmap into an integer.
+    """
+    return int.from_bytes(bytes(value), 'little')
+
+
+def weekly_masks(doctor_id, slot_minutes, using=None):
+    """
+    Return the available-slot bitmap for each weekday of a doctor's schedule.
+    """
+    masks = [0] * 7
+    windows = DoctorAvailability.objects.using(using).filter(doctor_id=doctor_id).values_list(
+        'weekday', 'start_time', 'end_time'
+    )
+    for weekday, start_time, end_time in windows:
+        masks[weekday] |= window_mask(to_minutes(start_time), to_minutes(end_time), slot_minutes)
+    return masks
+
+
+def taken_masks(doctor_id, dates, slot_minutes, using=None):
+    """
+    Return the bitmap of the slots taken by scheduled appointments on each of ``dates``.
+
+    Uses one indexed range query, whatever the number of days.
+    """
+    taken = dict.fromkeys(dates, 0)
+    appointments = Appointment.objects.using(using).filter(
+        doctor_id=doctor_id,
+        date__range=(min(dates), max(dates)),
+        status='scheduled',
+    ).values_list('date', 'time', 'duration_minutes')
+    for date, time, duration in appointments:
+        if date in taken:
+            taken[date] |= appointment_mask(time, duration, slot_minutes)
+    return taken
+
+
+def build_day_slots(doctor_id, dates, slot_minutes, using=None):
+    """
+    Compute slot bitmaps for ``dates`` from the weekly schedule and scheduled appointments.
+
+    Uses one query for the schedule and one for the appointments, whatever the number of days.
+    """
+    masks = weekly_masks(doctor_id, slot_minutes, using)
+    available = {date: masks[date.weekday()] for date in dates}
+    taken = taken_masks(doctor_id, dates, slot_minutes, using)
+    return [
+        DoctorDaySlots(
+            doctor_id=doctor_id,
+            date=date,
+            slot_minutes=slot_minutes,
+            available=encode_mask(available[date], slot_minutes),
+            free=encode_mask(available[date] & ~taken[date], slot_minutes),
+        )
+        for date in dates
+    ]
+
+
+def get_free_slots(doctor_id, start_date, end_date):
+    """
+    Return ``(date, free_mask)`` for every day from ``start_date`` to ``end_date`` inclusive.
+
+    Days that were already computed are read straight from their bitmap row.
+    Missing days are built once and stored, so later reads cost the same no
+    matter how many appointments the doctor has. Bitmaps that are stored are
+    built from the primary, as a lagging replica would leave them wrong until
+    the day's next booking, and under the doctor's lock, so no booking can
+    land between reading the appointments and storing the bitmaps.
+    """
+    slot_minutes = get_slot_minutes()
+    rows = {
+        row.date: row
+        for row in DoctorDaySlots.objects.filter(doctor_id=doctor_id, date__range=(start_date, end_date))
+    }
+    dates = [start_date + datetime.timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    missing = [date for date in dates if date not in rows or rows[date].slot_minutes != slot_minutes]
+    if missing:
+        using = router.db_for_write(DoctorDaySlots)
+        with transaction.atomic(using=using):
+            lock_doctor(doctor_id, using)
+            built = build_day_slots(doctor_id, missing, slot_minutes, using)
+            DoctorDaySlots.objects.using(using).filter(doctor_id=doctor_id, date__in=missing).delete()
+            DoctorDaySlots.objects.using(using).bulk_create(built, ignore_conflicts=True)
+        rows.update((row.date, row) for row in built)
+    return [(date, decode_mask(rows[date].free)) for date in dates]
+
+
+def lock_doctor(doctor_id, using):
+    """
+    Lock a doctor's row until the end of the current transaction.
+
+    Bookings and builds of missing bitmaps take this lock, so for any one
+    doctor they happen one at a time.
+    """
+    list(Doctor.objects.using(using).select_for_update().filter(pk=doctor_id).values_list('pk', flat=True))
+
+
+def _update_day(doctor_id, date, update):
+    # Days without a bitmap are built lazily with the change already applied.
+    slot_minutes = get_slot_minutes()
+    using = router.db_for_write(DoctorDaySlots)
+    with transaction.atomic(using=using):
+        rows = DoctorDaySlots.objects.using(using).select_for_update().filter(doctor_id=doctor_id, date=date)
+        row = rows.first()
+        if row is None or row.slot_minutes != slot_minutes:
+            # A build of the day may hold the lock after reading the appointments without this one, so wait for it
+            lock_doctor(doctor_id, using)
+            row = rows.first()
+            if row is None or row.slot_minutes != slot_minutes:
+                return
+        free = update(decode_mask(row.free), decode_mask(row.available), slot_minutes, using)
+        row.free = encode_mask(free, slot_minutes)
+        row.save(update_fields=['free'])
+
+
+def book(doctor_id, date, time, duration_minutes):
+    """
+    Take the slots of a scheduled appointment out of the doctor's free bitmap.
+    """
+    date, time = normalize(date, time)
+    _update_day(
+        doctor_id, date,
+        lambda free, available, minutes, using: free & ~appointment_mask(time, duration_minutes, minutes),
+    )
+
+
+def release(doctor_id, date, time, duration_minutes):
+    """
+    Give the slots of a canceled, moved or deleted appointment back to the doctor's free bitmap.
+
+    An appointment starting or ending mid-slot shares that slot with its
+    neighbours, so the day's free bitmap is recomputed from the appointments
+    still scheduled on it rather than by setting the appointment's bits.
+    """
+    date, time = normalize(date, time)
+    _update_day(
+        doctor_id, date,
+        lambda free, available, minutes, using: available & ~taken_masks(doctor_id, [date], minutes, using)[date],
+    )
+
+
+def clear_day_slots(doctor_id):
+    """
+    Drop every stored bitmap of a doctor so they are rebuilt from the current schedule.
+    """
+    pending = deferred_clears.get()
+    if pending is not None:
+        pending.add(doctor_id)
+        return
+    DoctorDaySlots.objects.filter(doctor_id=doctor_id).delete()
+
+
+@contextmanager
+def defer_clears():
+    """
+    Clear each doctor's bitmaps once when the block completes, however often ``clear_day_slots`` is called in it.
+
+    Deleting a schedule window by window sends a post_delete per window, and
+    each would otherwise clear the same bitmaps again.
+    """
+    pending = set()
+    token = deferred_clears.set(pending)
+    try:
+        yield
+    finally:
+        deferred_clears.reset(token)
+    for doctor_id in pending:
+        clear_day_slots(doctor_id)
+
+
+def normalize(date, time):
+    """
+    Convert an appointment date and time, which may be strings, to date and time objects.
+    """
+    return (
+        Appointment._meta.get_field('date').to_python(date),
+        Appointment._meta.get_field('time').to_python(time),
+    )
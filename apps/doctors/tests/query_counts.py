@@ -0,0 +1,116 @@
+import datetime
+import re
+from collections import Counter
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.doctors.models import Doctor, Patient, Appointment
+
+HASHED_PASSWORD = 'pbkdf2_sha256$1$salt$hash'
+FIRST_DAY = datetime.date(2024, 1, 1)
+
+
+def normalize_sql(sql):
+    """
+    Replace the literals of a query with '?' so repeated queries group together.
+    """
+    return re.sub(r"'[^']*'|\b\d+\b", '?', sql)
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Base class for tests asserting that an endpoint's query count does not grow with its data.
+
+    ``assertConstantQueries`` grows the related rows to each of ``sizes`` in
+    turn, calls the endpoint and compares the number of queries. On failure
+    the message lists the queries of the largest run, repeated ones first.
+    """
+    sizes = (1, 10, 100)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+
+    def add_patients(self, total):
+        """
+        Give the doctor ``total`` patients, the setUp patient included.
+        """
+        existing = Patient.objects.filter(created_by=self.doctor).count()
+        Patient.objects.bulk_create(
+            Patient(
+                first_name=f"Patient{i}",
+                last_name="Doe",
+                email=f"patient{i}@example.com",
+                password=HASHED_PASSWORD,
+                created_by=self.doctor,
+            )
+            for i in range(existing, total)
+        )
+
+    def add_appointments(self, total):
+        """
+        Give the patient ``total`` back-to-back 15 minute appointments with the doctor.
+        """
+        existing = Appointment.objects.filter(patient=self.patient).count()
+        appointments = []
+        for i in range(existing, total):
+            day, slot = divmod(i, 96)
+            start = datetime.datetime.combine(FIRST_DAY, datetime.time()) + datetime.timedelta(minutes=15 * slot)
+            appointments.append(Appointment(
+                patient=self.patient,
+                doctor=self.doctor,
+                date=FIRST_DAY + datetime.timedelta(days=day),
+                time=start.time(),
+                duration_minutes=15,
+                end_time=(start + datetime.timedelta(minutes=15)).time(),
+            ))
+        Appointment.objects.bulk_create(appointments)
+
+    def assertConstantQueries(self, request, grow, expected=None):
+        """
+        Assert that ``request(size)`` runs as many queries after ``grow(size)`` for every size.
+
+        Args:
+            request: Callable taking the size and returning a test client response.
+            grow: Callable taking the size and creating the related rows.
+            expected (int): The exact number of queries each request must run, if given.
+        """
+        captured = {}
+        for size in self.sizes:
+            grow(size)
+            with CaptureQueriesContext(connection) as queries:
+                response = request(size)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertLess(response.status_code, 400, getattr(response, 'data', response))
+            # Copy now, the next request clears the query log
+            captured[size] = [query['sql'] for query in queries.captured_queries]
+
+        counts = {size: len(queries) for size, queries in captured.items()}
+        if len(set(counts.values())) > 1:
+            largest = captured[self.sizes[-1]]
+            repeated = Counter(normalize_sql(sql) for sql in largest)
+            lines = [f"{count}x {sql}" for sql, count in repeated.most_common()]
+            self.fail(
+                "Query count grows with the data: "
+                + ", ".join(f"{size} rows -> {count} queries" for size, count in counts.items())
+                + f"\nQueries with {self.sizes[-1]} rows:\n" + "\n".join(lines)
+            )
+        if expected is not None:
+            self.assertEqual(
+                counts[self.sizes[-1]], expected,
+                "Unexpected number of queries:\n" + "\n".join(captured[self.sizes[-1]]),
+            )
@@ -0,0 +1,142 @@
+import datetime
+from unittest import mock
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from rest_framework import serializers
+from apps.doctors.models import Doctor, Patient, Appointment
+from apps.doctors.serializers import AppointmentSerializer
+
+DAY = datetime.date(2024, 1, 1)
+
+
+class AppointmentOverlapTest(TestCase):
+    def setUp(self):
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.other_doctor = Doctor.objects.create_user(
+            email="other@example.com",
+            first_name="Other",
+            last_name="Doctor",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        # 10:00 - 10:30
+        self.existing = Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, date=DAY, time=datetime.time(10, 0), duration_minutes=30
+        )
+
+    def serializer(self, time, duration=30, instance=None, **extra):
+        data = {
+            "doctor": self.doctor.id,
+            "patient": self.patient.id,
+            "date": DAY,
+            "time": time,
+            "duration_minutes": duration,
+            **extra,
+        }
+        return AppointmentSerializer(instance=instance, data=data, partial=instance is not None)
+
+    def test_end_time_is_stored(self):
+        self.assertEqual(self.existing.end_time, datetime.time(10, 30))
+        self.existing.duration_minutes = 45
+        self.existing.save(update_fields=['duration_minutes'])
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.end_time, datetime.time(10, 45))
+
+    def test_adjacent_appointments_are_allowed(self):
+        self.assertTrue(self.serializer("10:30").is_valid())
+        self.assertTrue(self.serializer("09:30").is_valid())
+
+    def test_overlapping_appointments_are_rejected(self):
+        for time, duration in (("10:00", 30), ("10:15", 30), ("09:45", 30), ("10:29", 1), ("09:59", 2), ("09:00", 180)):
+            serializer = self.serializer(time, duration)
+            self.assertFalse(serializer.is_valid(), (time, duration))
+            self.assertIn("time", serializer.errors)
+
+    def test_long_appointment_earlier_in_the_day_is_found(self):
+        Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, date=DAY, time=datetime.time(6, 0), duration_minutes=200
+        )
+        # 06:00 - 09:20
+        self.assertFalse(self.serializer("09:15", 10).is_valid())
+        self.assertTrue(self.serializer("09:20", 10).is_valid())
+
+    def test_early_morning_bookings_are_checked(self):
+        # Starts less than MAX_DURATION_MINUTES after midnight have no lower bound
+        Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, date=DAY, time=datetime.time(0, 0), duration_minutes=60
+        )
+        self.assertFalse(self.serializer("00:30").is_valid())
+        self.assertTrue(self.serializer("01:00").is_valid())
+
+    def test_only_scheduled_appointments_block(self):
+        self.existing.status = 'canceled'
+        self.existing.save()
+        self.assertTrue(self.serializer("10:00").is_valid())
+
+    def test_unscheduled_bookings_are_not_checked(self):
+        self.assertTrue(self.serializer("10:00", status='completed').is_valid())
+
+    def test_other_doctors_do_not_block(self):
+        self.assertTrue(self.serializer("10:00", doctor=self.other_doctor.id).is_valid())
+
+    def test_update_does_not_conflict_with_itself(self):
+        serializer = self.serializer("10:10", instance=self.existing)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_update_into_another_appointment_is_rejected(self):
+        later = Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, date=DAY, time=datetime.time(11, 0)
+        )
+        serializer = AppointmentSerializer(instance=later, data={"time": "10:20"}, partial=True)
+        self.assertFalse(serializer.is_valid())
+
+    def test_concurrent_bookings_are_checked_again_on_save(self):
+        # Both were validated before either was saved, as two requests racing for a slot would be
+        first, second = self.serializer("11:00"), self.serializer("11:15")
+        self.assertTrue(first.is_valid())
+        self.assertTrue(second.is_valid())
+        first.save()
+        with self.assertRaises(serializers.ValidationError) as raised:
+            second.save()
+        self.assertIn("time", raised.exception.detail)
+        self.assertEqual(Appointment.objects.filter(doctor=self.doctor).count(), 2)
+
+    def test_save_locks_the_doctor(self):
+        serializer = self.serializer("11:00")
+        self.assertTrue(serializer.is_valid())
+        select_for_update = QuerySet.select_for_update
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=select_for_update) as lock:
+            serializer.save()
+        self.assertIn(Doctor, [call.args[0].model for call in lock.call_args_list])
+
+    def test_rejects_appointments_past_midnight(self):
+        serializer = self.serializer("23:45", 30)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("duration_minutes", serializer.errors)
+
+    def test_overlap_check_is_one_indexed_range_query(self):
+        for hour in range(0, 24):
+            Appointment.objects.create(
+                patient=self.patient, doctor=self.other_doctor, date=DAY, time=datetime.time(hour, 0)
+            )
+        queryset = Appointment.objects.overlapping(self.doctor.id, DAY, datetime.time(10, 15), datetime.time(10, 45))
+        with self.assertNumQueries(1):
+            self.assertTrue(queryset.exists())
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("appointment_doctor_date_idx", plan)
+        self.assertIn("time>? AND time<?", plan)
@@ -0,0 +1,203 @@
+import datetime
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from apps.doctors.authentication import ROLE_DOCTOR, ROLE_PATIENT, get_tokens_for_user
+from apps.doctors.caching import response_cache
+from apps.doctors.metrics import registry
+from apps.doctors.models import Doctor, Patient, Appointment
+from apps.doctors.views import (
+    AsyncDoctorAppointmentsListView,
+    AsyncDoctorProfileView,
+    AsyncPatientListView,
+    DoctorAppointmentsListView,
+    DoctorProfileView,
+    PatientListView,
+)
+from apps.patients.views import (
+    AsyncPatientAppointmentDetailView,
+    AsyncPatientAppointmentsView,
+    PatientAppointmentDetailView,
+    PatientAppointmentsView,
+)
+
+
+class AsyncViewTest(TestCase):
+    """
+    The async read views answer exactly like their sync counterparts.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.async_factory = AsyncRequestFactory()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        self.other_patient = Patient.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        for day, hour, patient, status in (
+            (2, 9, self.patient, 'scheduled'),
+            (1, 10, self.other_patient, 'completed'),
+            (1, 9, self.patient, 'canceled'),
+        ):
+            Appointment.objects.create(
+                patient=patient,
+                doctor=self.doctor,
+                date=datetime.date(2024, 1, day),
+                time=datetime.time(hour, 0),
+                status=status,
+                reason="Checkup",
+            )
+        self.appointment = Appointment.objects.filter(patient=self.patient).order_by('id').first()
+
+    def headers(self, user, role):
+        return {'Authorization': f"Bearer {get_tokens_for_user(user, role)['access']}"}
+
+    async def compare(self, sync_view, async_view, path, headers, method='get', **kwargs):
+        """
+        Call both views with the same request and assert that they answer the same.
+        """
+        sync_response = await self.call_sync(sync_view, path, headers, method, **kwargs)
+        request = getattr(self.async_factory, method)(path, headers=headers)
+        async_response = await async_view.as_view()(request, **kwargs)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        return async_response
+
+    async def call_sync(self, view, path, headers, method='get', **kwargs):
+        def call():
+            response = view.as_view()(getattr(self.factory, method)(path, headers=headers), **kwargs)
+            return response.render()
+
+        return await sync_to_async(call)()
+
+    async def test_doctor_appointment_list(self):
+        headers = self.headers(self.doctor, ROLE_DOCTOR)
+        for query in ('', '?status=scheduled,canceled', '?expand=patient,doctor', '?page_size=1', '?from=2024-02-01'):
+            with self.subTest(query=query):
+                response = await self.compare(
+                    DoctorAppointmentsListView, AsyncDoctorAppointmentsListView,
+                    f'/api/doctors/appointments{query}', headers,
+                )
+                self.assertEqual(response.status_code, 200)
+
+    async def test_following_page(self):
+        headers = self.headers(self.doctor, ROLE_DOCTOR)
+        request = self.async_factory.get('/api/doctors/appointments?page_size=2', headers=headers)
+        first = json.loads((await AsyncDoctorAppointmentsListView.as_view()(request)).content)
+        await self.compare(DoctorAppointmentsListView, AsyncDoctorAppointmentsListView, first['next'], headers)
+
+    async def test_invalid_filter(self):
+        response = await self.compare(
+            DoctorAppointmentsListView, AsyncDoctorAppointmentsListView,
+            '/api/doctors/appointments?status=lost', self.headers(self.doctor, ROLE_DOCTOR),
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_patient_list(self):
+        await self.compare(
+            PatientListView, AsyncPatientListView, '/api/doctors/patients', self.headers(self.doctor, ROLE_DOCTOR)
+        )
+
+    async def test_patient_list_is_for_doctors(self):
+        response = await self.compare(
+            PatientListView, AsyncPatientListView, '/api/doctors/patients', self.headers(self.patient, ROLE_PATIENT)
+        )
+        self.assertEqual(response.status_code, 403)
+
+    async def test_unauthenticated(self):
+        response = await self.compare(
+            DoctorAppointmentsListView, AsyncDoctorAppointmentsListView, '/api/doctors/appointments', {}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+
+    async def test_profile(self):
+        await self.compare(
+            DoctorProfileView, AsyncDoctorProfileView, '/api/doctors/profile', self.headers(self.doctor, ROLE_DOCTOR)
+        )
+
+    async def test_profile_is_for_doctors(self):
+        response = await self.compare(
+            DoctorProfileView, AsyncDoctorProfileView, '/api/doctors/profile', self.headers(self.patient, ROLE_PATIENT)
+        )
+        self.assertEqual(response.status_code, 403)
+
+    async def test_profile_update_is_passed_to_sync_view(self):
+        request = self.async_factory.patch(
+            '/api/doctors/profile', {"first_name": "Gregory"}, content_type='application/json',
+            headers=self.headers(self.doctor, ROLE_DOCTOR),
+        )
+        response = await AsyncDoctorProfileView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((await Doctor.objects.aget(pk=self.doctor.pk)).first_name, "Gregory")
+
+    async def test_patient_appointments(self):
+        headers = self.headers(self.patient, ROLE_PATIENT)
+        for query in ('', '?expand=doctor'):
+            with self.subTest(query=query):
+                await self.compare(
+                    PatientAppointmentsView, AsyncPatientAppointmentsView, f'/api/patients/appointments/{query}', headers
+                )
+
+    async def test_appointment_detail(self):
+        headers = self.headers(self.patient, ROLE_PATIENT)
+        for query in ('', '?expand=doctor,patient'):
+            with self.subTest(query=query):
+                response = await self.compare(
+                    PatientAppointmentDetailView, AsyncPatientAppointmentDetailView,
+                    f'/api/patients/appointments/{self.appointment.id}/{query}', headers,
+                    appointment_id=self.appointment.id,
+                )
+                self.assertEqual(response.status_code, 200)
+
+    async def test_appointment_detail_of_another_patient(self):
+        other = await Appointment.objects.filter(patient=self.other_patient).afirst()
+        response = await self.compare(
+            PatientAppointmentDetailView, AsyncPatientAppointmentDetailView,
+            f'/api/patients/appointments/{other.id}/', self.headers(self.patient, ROLE_PATIENT),
+            appointment_id=other.id,
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': True})
+    async def test_conditional_get(self):
+        response_cache.clear()
+        try:
+            headers = self.headers(self.doctor, ROLE_DOCTOR)
+            view = AsyncDoctorAppointmentsListView.as_view()
+            first = await view(self.async_factory.get('/api/doctors/appointments', headers=headers))
+            self.assertIn('ETag', first)
+            second = await view(self.async_factory.get(
+                '/api/doctors/appointments', headers={**headers, 'If-None-Match': first['ETag']}
+            ))
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(response_cache.stats()['misses'], 1)
+        finally:
+            response_cache.clear()
+
+    async def test_metrics_count_queries_under_asgi(self):
+        registry.reset()
+        response = await self.async_client.get(
+            '/api/doctors/appointments', headers=self.headers(self.doctor, ROLE_DOCTOR)
+        )
+        self.assertEqual(response.status_code, 200)
+        labels = 'view="list-appointments",route="api/doctors/appointments",method="GET"'
+        # The user lookup and the page, both run in a worker thread
+        self.assertIn(f'http_request_db_queries_total{{{labels}}} 2\n', registry.render())
@@ -0,0 +1,243 @@
+import base64
+from unittest import mock
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.doctors.models import Doctor, Patient
+from apps.doctors.authentication import (
+    ROLE_DOCTOR,
+    ROLE_PATIENT,
+    CredentialCache,
+    credential_cache,
+    get_tokens_for_user,
+)
+
+
+class JWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+
+    def test_doctor_login_returns_tokens_with_role(self):
+        response = self.client.post(
+            reverse('doctor-login'),
+            {"email": "doctor@example.com", "password": "password123"},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['role'], ROLE_DOCTOR)
+        self.assertEqual(token['user_id'], self.doctor.id)
+
+    def test_patient_login_returns_tokens_with_role(self):
+        response = self.client.post(
+            reverse('patient-login'),
+            {"email": "jane.doe@example.com", "password": "password123"},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['patient']['email'], self.patient.email)
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['role'], ROLE_PATIENT)
+        self.assertEqual(token['user_id'], self.patient.id)
+
+    def test_patient_login_rejects_wrong_password(self):
+        response = self.client.post(
+            reverse('patient-login'),
+            {"email": "jane.doe@example.com", "password": "wrongpassword"},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('access', response.data)
+
+    def test_bearer_token_authenticates_doctor(self):
+        tokens = get_tokens_for_user(self.doctor, ROLE_DOCTOR)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get(reverse('doctor-profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], self.doctor.email)
+
+    def test_bearer_token_authenticates_patient(self):
+        tokens = get_tokens_for_user(self.patient, ROLE_PATIENT)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get('/api/patients/appointments/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_patient_token_does_not_resolve_to_doctor_with_same_id(self):
+        # Doctor and patient ids overlap, the role claim must keep them apart.
+        self.assertEqual(self.doctor.id, self.patient.id)
+        tokens = get_tokens_for_user(self.patient, ROLE_PATIENT)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get(reverse('list-patients'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_patient_token_cannot_use_doctor_profile(self):
+        tokens = get_tokens_for_user(self.patient, ROLE_PATIENT)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get(reverse('doctor-profile')).status_code, 403)
+        response = self.client.patch(reverse('doctor-profile-update'), {"email": "doctor@example.com"}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Patient.objects.get(pk=self.patient.pk).email, "jane.doe@example.com")
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        response = self.client.get(reverse('doctor-profile'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_keeps_role(self):
+        tokens = get_tokens_for_user(self.patient, ROLE_PATIENT)
+        response = self.client.post(reverse('token-refresh'), {"refresh": tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['role'], ROLE_PATIENT)
+        self.assertEqual(token['user_id'], self.patient.id)
+
+
+class CachedBasicAuthenticationTest(TestCase):
+    def setUp(self):
+        credential_cache.clear()
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+
+    def get_profile(self, password="password123"):
+        credentials = base64.b64encode(f"doctor@example.com:{password}".encode()).decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        return self.client.get(reverse('doctor-profile'))
+
+    def test_repeated_requests_hash_once(self):
+        with mock.patch.object(Doctor, 'check_password', autospec=True, side_effect=Doctor.check_password) as check:
+            for _ in range(3):
+                self.assertEqual(self.get_profile().status_code, 200)
+        self.assertEqual(check.call_count, 1)
+        stats = credential_cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_wrong_password_is_not_cached(self):
+        self.assertEqual(self.get_profile("wrongpassword").status_code, 401)
+        self.assertEqual(self.get_profile("wrongpassword").status_code, 401)
+        self.assertEqual(credential_cache.stats()['size'], 0)
+
+    def test_password_change_invalidates_entry(self):
+        self.assertEqual(self.get_profile().status_code, 200)
+        self.doctor.set_password("newpassword456")
+        self.doctor.save()
+        self.assertEqual(credential_cache.stats()['size'], 0)
+        self.assertEqual(self.get_profile().status_code, 401)
+        self.assertEqual(self.get_profile("newpassword456").status_code, 200)
+
+    def test_deactivation_invalidates_entry(self):
+        self.assertEqual(self.get_profile().status_code, 200)
+        self.doctor.is_active = False
+        self.doctor.save()
+        self.assertEqual(self.get_profile().status_code, 401)
+
+    def test_bulk_update_of_password_is_detected(self):
+        # Queryset updates skip signals, the stored hash comparison catches them.
+        self.assertEqual(self.get_profile().status_code, 200)
+        Doctor.objects.filter(pk=self.doctor.pk).update(password="pbkdf2_sha256$1$salt$hash")
+        self.assertEqual(self.get_profile().status_code, 401)
+
+
+class CredentialCacheTest(TestCase):
+    def setUp(self):
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+
+    def test_evicts_least_recently_used(self):
+        cache = CredentialCache(max_entries=2, ttl=60)
+        keys = [cache.make_key("doctor@example.com", f"password{i}") for i in range(3)]
+        cache.set(keys[0], self.doctor)
+        cache.set(keys[1], self.doctor)
+        cache.get(keys[0])
+        cache.set(keys[2], self.doctor)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_expired_entries_miss(self):
+        cache = CredentialCache(max_entries=10, ttl=60)
+        key = cache.make_key("doctor@example.com", "password123")
+        cache.set(key, self.doctor)
+        with mock.patch('apps.doctors.authentication.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats()['size'], 0)
+
+
+class RoleModelBackendTest(TestCase):
+    def setUp(self):
+        self.doctor = Doctor.objects.create_user(
+            email="shared@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="doctorpassword",
+        )
+        # The same address may belong to a doctor and a patient
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="shared@example.com",
+            password="patientpassword",
+            created_by=self.doctor,
+        )
+
+    def test_role_selects_the_account(self):
+        with self.assertNumQueries(1):
+            user = authenticate(None, email="shared@example.com", password="patientpassword", role=ROLE_PATIENT)
+        self.assertEqual(user, self.patient)
+        self.assertEqual(user.role, ROLE_PATIENT)
+        user = authenticate(None, email="shared@example.com", password="doctorpassword", role=ROLE_DOCTOR)
+        self.assertEqual(user, self.doctor)
+        self.assertEqual(user.role, ROLE_DOCTOR)
+        self.assertIsNone(authenticate(None, email="shared@example.com", password="doctorpassword", role=ROLE_PATIENT))
+
+    def test_django_callers_authenticate_doctors(self):
+        # The admin login passes the email as username and no role
+        self.assertEqual(authenticate(None, username="shared@example.com", password="doctorpassword"), self.doctor)
+        self.assertIsNone(authenticate(None, username="shared@example.com", password="patientpassword"))
+
+    def test_unknown_email_hashes_once(self):
+        with mock.patch('apps.doctors.backends.make_password', side_effect=make_password) as dummy, \
+                mock.patch.object(Patient, 'check_password', autospec=True) as check:
+            self.assertIsNone(authenticate(None, email="nobody@example.com", password="x", role=ROLE_PATIENT))
+        self.assertEqual(dummy.call_count, 1)
+        check.assert_not_called()
+
+    def test_wrong_password_hashes_once(self):
+        with mock.patch('apps.doctors.backends.make_password') as dummy, \
+                mock.patch.object(Patient, 'check_password', autospec=True, side_effect=Patient.check_password) as check:
+            self.assertIsNone(authenticate(None, email="shared@example.com", password="wrong", role=ROLE_PATIENT))
+        dummy.assert_not_called()
+        self.assertEqual(check.call_count, 1)
+
+    def test_inactive_doctor_is_rejected(self):
+        self.doctor.is_active = False
+        self.doctor.save()
+        self.assertIsNone(authenticate(None, email="shared@example.com", password="doctorpassword"))
+
+    def test_unknown_role(self):
+        self.assertIsNone(authenticate(None, email="shared@example.com", password="doctorpassword", role="nurse"))
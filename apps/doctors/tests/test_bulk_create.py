@@ -0,0 +1,99 @@
+import json
+from django.contrib.auth.hashers import check_password
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.models import Doctor, Patient
+
+
+class PatientBulkCreateViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.client.force_authenticate(self.doctor)
+        self.url = reverse('bulk-create-patients')
+
+    def make_rows(self, count, start=0):
+        return [
+            {
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "email": f"patient{i}@example.com",
+                "password": "password123",
+            }
+            for i in range(start, start + count)
+        ]
+
+    def test_creates_json_array(self):
+        response = self.client.post(self.url, self.make_rows(5), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(response.data['failed'], 0)
+        self.assertEqual(Patient.objects.filter(created_by=self.doctor).count(), 5)
+        patient = Patient.objects.get(email="patient0@example.com")
+        self.assertEqual(response.data['results'][0], {"row": 0, "id": patient.id})
+        self.assertTrue(check_password("password123", patient.password))
+
+    def test_creates_ndjson(self):
+        body = "\n".join(json.dumps(row) for row in self.make_rows(3)) + "\n"
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Patient.objects.count(), 3)
+
+    def test_reports_errors_per_row(self):
+        Patient.objects.create(
+            first_name="Existing",
+            last_name="Patient",
+            email="patient1@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        rows = self.make_rows(4)
+        rows[2]["email"] = "not-an-email"
+        rows[3]["email"] = rows[0]["email"]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['failed'], 3)
+        results = response.data['results']
+        self.assertIn('id', results[0])
+        self.assertIn('email', results[1]['errors'])
+        self.assertIn('email', results[2]['errors'])
+        self.assertIn('email', results[3]['errors'])
+
+    def test_all_rows_invalid(self):
+        response = self.client.post(self.url, [{"first_name": "Only"}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Patient.objects.count(), 0)
+
+    def test_rejects_non_list_body(self):
+        response = self.client.post(self.url, self.make_rows(1)[0], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_malformed_ndjson(self):
+        response = self.client.post(self.url, '{"first_name": "A"}\n{oops\n', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+
+    def test_batches_inserts(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f"{self.url}?batch_size=5", self.make_rows(10), format='json')
+        self.assertEqual(response.status_code, 201)
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(Patient.objects.count(), 10)
+
+    def test_invalid_batch_size(self):
+        response = self.client.post(f"{self.url}?batch_size=zero", self.make_rows(1), format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_doctor(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(self.url, self.make_rows(1), format='json')
+        self.assertEqual(response.status_code, 401)
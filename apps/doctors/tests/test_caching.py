@@ -0,0 +1,213 @@
+import datetime
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.authentication import ROLE_DOCTOR, get_tokens_for_user
+from apps.doctors.caching import response_cache
+from apps.doctors.metrics import registry
+from apps.doctors.models import Doctor, Patient, Appointment
+
+
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': True})
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.other_doctor = Doctor.objects.create_user(
+            email="other@example.com",
+            first_name="Other",
+            last_name="Doctor",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        self.appointment = self.book(self.doctor, 9)
+        self.authenticate(self.doctor)
+
+    def tearDown(self):
+        response_cache.clear()
+
+    def authenticate(self, user):
+        # A bearer token loads the user, and with it the current data version, on every request
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(user, user.role)['access']}")
+
+    def book(self, doctor, hour):
+        return Appointment.objects.create(
+            patient=self.patient,
+            doctor=doctor,
+            date=datetime.date(2024, 1, 1),
+            time=datetime.time(hour, 0),
+            reason="Checkup",
+        )
+
+    def assertCached(self, url, params=None):
+        self.client.get(url, params)
+        # Only the user is loaded
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertRefreshed(self, url, params=None):
+        with self.assertNumQueries(2):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_hit_serves_same_body(self):
+        first = self.client.get('/api/doctors/appointments')
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/doctors/appointments')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(response_cache.stats(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_query_string_is_part_of_the_key(self):
+        self.assertCached('/api/doctors/appointments')
+        response = self.assertRefreshed('/api/doctors/appointments', {'status': 'completed'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_appointment_write_invalidates_both_owners(self):
+        self.assertCached('/api/doctors/appointments')
+        self.authenticate(self.patient)
+        self.assertCached('/api/patients/appointments/')
+
+        self.book(self.doctor, 11)
+        self.assertEqual(len(self.assertRefreshed('/api/patients/appointments/').data['results']), 2)
+        self.authenticate(self.doctor)
+        self.assertEqual(len(self.assertRefreshed('/api/doctors/appointments').data['results']), 2)
+
+    def test_moved_appointment_invalidates_previous_doctor(self):
+        self.assertCached('/api/doctors/appointments')
+        self.appointment.doctor = self.other_doctor
+        self.appointment.save()
+        self.assertEqual(self.assertRefreshed('/api/doctors/appointments').data['results'], [])
+
+    def test_patient_change_invalidates_every_doctor_they_see(self):
+        self.book(self.other_doctor, 10)
+        self.authenticate(self.other_doctor)
+        self.assertCached('/api/doctors/appointments', {'expand': 'patient'})
+
+        self.patient.last_name = "Smith"
+        self.patient.save()
+        response = self.assertRefreshed('/api/doctors/appointments', {'expand': 'patient'})
+        self.assertEqual(response.data['results'][0]['patient']['last_name'], "Smith")
+
+    def test_patient_list_and_bulk_create(self):
+        self.assertCached(reverse('list-patients'))
+        response = self.client.post(reverse('bulk-create-patients'), [
+            {"first_name": "John", "last_name": "Doe", "email": "john@example.com", "password": "password123"},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(self.client.get(reverse('list-patients')).data['results']), 2)
+
+    def test_profile_update(self):
+        self.assertCached(reverse('doctor-profile'))
+        self.client.patch(reverse('doctor-profile-update'), {"first_name": "Gregory"}, format='json')
+        self.assertEqual(self.client.get(reverse('doctor-profile')).data['first_name'], "Gregory")
+
+    def test_login_does_not_invalidate(self):
+        self.assertCached(reverse('doctor-profile'))
+        self.doctor.save(update_fields=['last_login'])
+        self.assertCached(reverse('doctor-profile'))
+
+    def test_users_do_not_share_entries(self):
+        self.assertCached('/api/doctors/appointments')
+        self.authenticate(self.other_doctor)
+        self.assertEqual(self.assertRefreshed('/api/doctors/appointments').data['results'], [])
+
+    def test_version_is_persisted(self):
+        self.assertCached('/api/doctors/appointments')
+        version = Doctor.objects.get(pk=self.doctor.pk).data_version
+        self.book(self.doctor, 11)
+        self.assertGreater(Doctor.objects.get(pk=self.doctor.pk).data_version, version)
+
+    def test_stale_instance_does_not_write_its_version_back(self):
+        self.book(self.doctor, 11)
+        version = Doctor.objects.get(pk=self.doctor.pk).data_version
+        self.doctor.last_name = "Sample"
+        self.doctor.save()
+        self.assertGreater(Doctor.objects.get(pk=self.doctor.pk).data_version, version)
+
+    @override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+    def test_disabled(self):
+        self.client.get('/api/doctors/appointments')
+        self.assertRefreshed('/api/doctors/appointments')
+        self.assertEqual(response_cache.stats()['hits'], 0)
+
+    def test_hit_ratio_in_metrics(self):
+        self.assertCached('/api/doctors/appointments')
+        self.assertIn('response_cache_hit_ratio 0.5\n', registry.render())
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.client.get('/api/doctors/appointments')
+        self.assertIn('ETag', response)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/doctors/appointments', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertIn('ETag', response)
+
+    def test_etag_changes_with_the_data(self):
+        etag = self.client.get('/api/doctors/appointments')['ETag']
+        self.book(self.doctor, 11)
+        response = self.client.get('/api/doctors/appointments', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_the_url(self):
+        etag = self.client.get('/api/doctors/appointments')['ETag']
+        response = self.client.get('/api/doctors/appointments', {'status': 'completed'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(reverse('doctor-profile'))['Last-Modified']
+        response = self.client.get(reverse('doctor-profile'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        # A change within the same second still moves Last-Modified forward
+        self.client.patch(reverse('doctor-profile-update'), {"first_name": "Gregory"}, format='json')
+        response = self.client.get(reverse('doctor-profile'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['first_name'], "Gregory")
+
+    def test_validators_follow_writes_of_other_processes(self):
+        etag = self.client.get(reverse('list-patients'))['ETag']
+        # Another process writes and bumps the version in the database, and never touches this process's cache
+        Patient.objects.filter(pk=self.patient.pk).update(last_name="Smith")
+        response_cache.bump(ROLE_DOCTOR, {self.doctor.pk})
+        response = self.client.get(reverse('list-patients'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['last_name'], "Smith")
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_patient_appointments_not_modified(self):
+        self.authenticate(self.patient)
+        etag = self.client.get('/api/patients/appointments/')['ETag']
+        response = self.client.get('/api/patients/appointments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+    def test_validators_when_disabled(self):
+        response = self.client.get('/api/doctors/appointments')
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/doctors/appointments', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        self.book(self.doctor, 11)
+        response = self.client.get('/api/doctors/appointments', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response_cache.stats()['hits'], 0)
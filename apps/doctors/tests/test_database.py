@@ -0,0 +1,75 @@
+import os
+import tempfile
+import threading
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, override_settings
+
+
+class SQLitePragmaTest(TestCase):
+    """
+    New SQLite connections get the pragmas of SQLITE_PRAGMAS.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'pragmas.sqlite3')
+
+    def connect(self, cleanup=True):
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': self.path}, alias='pragmas')
+        wrapper.ensure_connection()
+        if cleanup:
+            self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_pragmas_are_applied(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), settings.SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), settings.SQLITE_PRAGMAS['cache_size'])
+
+    @override_settings(SQLITE_PRAGMAS={**settings.SQLITE_PRAGMAS, 'journal_mode': None, 'busy_timeout': 250})
+    def test_none_keeps_the_default(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 250)
+
+    def test_pragmas_are_not_counted_as_queries(self):
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': self.path}, alias='pragmas')
+        wrapper.force_debug_cursor = True
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        self.assertEqual(len(wrapper.queries), 0)
+
+    def test_concurrent_writers_wait_for_the_lock(self):
+        wrapper = self.connect()
+        with wrapper.cursor() as cursor:
+            cursor.execute('CREATE TABLE counter (value INTEGER)')
+        errors = []
+
+        def write():
+            writer = self.connect(cleanup=False)
+            try:
+                for _ in range(20):
+                    with writer.cursor() as cursor:
+                        cursor.execute('BEGIN IMMEDIATE')
+                        cursor.execute('INSERT INTO counter VALUES (1)')
+                        cursor.execute('COMMIT')
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                writer.close()
+
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(wrapper.connection.execute('SELECT COUNT(*) FROM counter').fetchone()[0], 80)
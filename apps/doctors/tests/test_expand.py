@@ -0,0 +1,59 @@
+import datetime
+from django.urls import reverse
+from apps.doctors.tests.query_counts import QueryCountTestCase
+
+
+class ExpandTest(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.doctor)
+        self.add_appointments(3)
+        self.appointment = self.patient.appointments.order_by('id').first()
+
+    def test_list_embeds_related_objects(self):
+        response = self.client.get('/api/doctors/appointments', {'expand': 'patient,doctor'})
+        self.assertEqual(response.status_code, 200)
+        first = response.data['results'][0]
+        self.assertEqual(first['patient'], {
+            'id': self.patient.id, 'first_name': 'Jane', 'last_name': 'Doe', 'email': 'jane.doe@example.com',
+        })
+        self.assertEqual(first['doctor'], {
+            'id': self.doctor.id, 'first_name': 'Doctor', 'last_name': 'Example', 'email': 'doctor@example.com',
+        })
+        self.assertEqual(list(first), [
+            'id', 'patient', 'doctor', 'date', 'time', 'duration_minutes', 'end_time', 'status', 'reason',
+        ])
+
+    def test_single_query(self):
+        # The doctor is force-authenticated, so the page itself is the only query
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/doctors/appointments', {'expand': 'patient,doctor'})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_without_expand_keys_stay_ids(self):
+        response = self.client.get('/api/doctors/appointments', {'expand': ''})
+        self.assertEqual(response.data['results'][0]['patient'], self.patient.id)
+        self.assertEqual(response.data['results'][0]['doctor'], self.doctor.id)
+
+    def test_unknown_relation(self):
+        response = self.client.get('/api/doctors/appointments', {'expand': 'patient,created_by'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('expand', response.data)
+
+    def test_update_response_expanded(self):
+        response = self.client.patch(
+            reverse('update-appointment', args=[self.appointment.id]) + '?expand=patient',
+            {'reason': 'Follow-up', 'date': datetime.date(2024, 2, 1)},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['patient']['email'], 'jane.doe@example.com')
+        self.assertEqual(response.data['doctor'], self.doctor.id)
+
+    def test_patient_detail_expanded(self):
+        self.client.force_authenticate(self.patient)
+        response = self.client.get(
+            reverse('appointment-detail', args=[self.appointment.id]), {'expand': 'doctor'}
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['doctor']['last_name'], 'Example')
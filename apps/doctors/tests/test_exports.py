@@ -0,0 +1,87 @@
+import csv
+import datetime
+import io
+import json
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.models import Doctor, Patient, Appointment
+
+
+class ExportViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe, Jr.",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        for day, status in ((3, 'scheduled'), (1, 'completed'), (2, 'scheduled')):
+            Appointment.objects.create(
+                patient=self.patient,
+                doctor=self.doctor,
+                date=datetime.date(2024, 1, day),
+                time=datetime.time(9, 0),
+                status=status,
+                reason="Checkup",
+            )
+        self.client.force_authenticate(self.doctor)
+
+    def content(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_appointments_csv(self):
+        response = self.client.get(reverse('export-appointments'))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('appointments.csv', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(self.content(response))))
+        self.assertEqual(rows[0], ['id', 'patient', 'doctor', 'date', 'time', 'duration_minutes', 'end_time', 'status', 'reason'])
+        self.assertEqual([row[3] for row in rows[1:]], ['2024-01-01', '2024-01-02', '2024-01-03'])
+        self.assertEqual(rows[1][4:8], ['09:00:00', '30', '09:30:00', 'completed'])
+
+    def test_appointments_ndjson_with_filters(self):
+        response = self.client.get(
+            reverse('export-appointments'), {'type': 'ndjson', 'from': '2024-01-02', 'status': 'scheduled'}
+        )
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([row['date'] for row in rows], ['2024-01-02', '2024-01-03'])
+        self.assertEqual(rows[0]['patient'], self.patient.id)
+        self.assertEqual(rows[0]['duration_minutes'], 30)
+
+    def test_patients_csv_quotes_values(self):
+        rows = list(csv.reader(io.StringIO(self.content(self.client.get(reverse('export-patients'))))))
+        self.assertEqual(rows, [
+            ['id', 'first_name', 'last_name', 'email', 'created_by'],
+            [str(self.patient.id), 'Jane', 'Doe, Jr.', 'jane.doe@example.com', str(self.doctor.id)],
+        ])
+
+    @override_settings(EXPORTS={'CHUNK_SIZE': 2})
+    def test_rows_are_read_lazily_in_chunks(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('export-appointments'))
+        self.assertFalse(any('appointment' in q['sql'] for q in queries.captured_queries))
+
+        chunks = list(response.streaming_content)
+        # Header plus one row, then the remaining two rows.
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [2, 2])
+
+    def test_rejects_invalid_parameters(self):
+        self.assertEqual(self.client.get(reverse('export-appointments'), {'type': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export-appointments'), {'status': 'unknown'}).status_code, 400)
+
+    def test_only_doctors_can_export(self):
+        self.client.force_authenticate(self.patient)
+        self.assertEqual(self.client.get(reverse('export-patients')).status_code, 403)
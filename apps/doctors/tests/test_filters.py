@@ -0,0 +1,83 @@
+import datetime
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.doctors.models import Doctor, Patient, Appointment
+
+
+class AppointmentFilterTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patients = [
+            Patient.objects.create(
+                first_name=f"Patient{i}",
+                last_name="Doe",
+                email=f"patient{i}@example.com",
+                password="password123",
+                created_by=self.doctor,
+            )
+            for i in range(2)
+        ]
+        for day, status, patient in (
+            (1, 'completed', 0),
+            (2, 'scheduled', 0),
+            (3, 'canceled', 1),
+            (4, 'scheduled', 1),
+            (5, 'scheduled', 0),
+        ):
+            Appointment.objects.create(
+                patient=self.patients[patient],
+                doctor=self.doctor,
+                date=datetime.date(2024, 1, day),
+                time=datetime.time(9, 0),
+                status=status,
+            )
+
+    def doctor_dates(self, **params):
+        self.client.force_authenticate(self.doctor)
+        response = self.client.get('/api/doctors/appointments', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['date'] for row in response.data['results']]
+
+    def test_date_window(self):
+        self.assertEqual(self.doctor_dates(**{'from': '2024-01-02', 'to': '2024-01-04'}),
+                         ['2024-01-02', '2024-01-03', '2024-01-04'])
+        self.assertEqual(self.doctor_dates(**{'from': '2024-01-04'}), ['2024-01-04', '2024-01-05'])
+        self.assertEqual(self.doctor_dates(to='2024-01-01'), ['2024-01-01'])
+
+    def test_status(self):
+        self.assertEqual(self.doctor_dates(status='scheduled'), ['2024-01-02', '2024-01-04', '2024-01-05'])
+        self.assertEqual(self.doctor_dates(status='completed,canceled'), ['2024-01-01', '2024-01-03'])
+
+    def test_patient(self):
+        self.assertEqual(self.doctor_dates(patient=self.patients[1].id), ['2024-01-03', '2024-01-04'])
+
+    def test_combined(self):
+        self.assertEqual(
+            self.doctor_dates(**{'from': '2024-01-02', 'status': 'scheduled', 'patient': self.patients[0].id}),
+            ['2024-01-02', '2024-01-05'],
+        )
+
+    def test_patient_list_filters(self):
+        self.client.force_authenticate(self.patients[0])
+        response = self.client.get('/api/patients/appointments/', {'from': '2024-01-02', 'status': 'scheduled'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['date'] for row in response.data['results']], ['2024-01-02', '2024-01-05'])
+
+    def test_invalid_parameters(self):
+        self.client.force_authenticate(self.doctor)
+        for field, params in (
+            ('from', {'from': '01/02/2024'}),
+            ('to', {'to': '2024-02-30'}),
+            ('to', {'from': '2024-01-05', 'to': '2024-01-01'}),
+            ('status', {'status': 'scheduled,unknown'}),
+            ('patient', {'patient': 'abc'}),
+        ):
+            response = self.client.get('/api/doctors/appointments', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn(field, response.data)
@@ -0,0 +1,166 @@
+import pickle
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, is_password_usable, make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.checks import check_password_scrypt
+from apps.doctors.hashing import PasswordHashingService, ScryptPasswordHasher
+from apps.doctors.models import Doctor, Patient
+
+PBKDF2 = 'django.contrib.auth.hashers.PBKDF2PasswordHasher'
+CHEAP_SCRYPT = {'WORK_FACTOR': 2 ** 4, 'BLOCK_SIZE': 8, 'PARALLELISM': 1, 'MAXMEM': 0}
+
+
+class PasswordHashingServiceTest(TestCase):
+    def setUp(self):
+        self.service = PasswordHashingService()
+        self.addCleanup(self.service.shutdown)
+
+    def test_hash_password(self):
+        encoded = self.service.hash_password("password123")
+        self.assertTrue(check_password("password123", encoded))
+
+    @override_settings(PASSWORD_HASHING={'WORKERS': 0})
+    def test_synchronous_fallback(self):
+        encoded = self.service.hash_passwords(["first", "second"])
+        self.assertIsNone(self.service._executor)
+        self.assertTrue(check_password("first", encoded[0]))
+        self.assertTrue(check_password("second", encoded[1]))
+
+    @override_settings(PASSWORD_HASHING={'WORKERS': 2})
+    def test_process_pool_keeps_order(self):
+        passwords = [f"password{i}" for i in range(6)] + [None]
+        encoded = self.service.hash_passwords(passwords)
+        self.assertIsNotNone(self.service._executor)
+        self.assertEqual(len(encoded), len(passwords))
+        for password, value in zip(passwords[:-1], encoded):
+            self.assertTrue(check_password(password, value))
+        self.assertFalse(is_password_usable(encoded[-1]))
+        self.assertEqual(len(set(encoded)), len(encoded))
+
+
+class ScryptPasswordHasherTest(TestCase):
+    def test_is_the_default_hasher(self):
+        hasher = get_hasher('default')
+        self.assertIsInstance(hasher, ScryptPasswordHasher)
+        self.assertEqual(hasher.work_factor, settings.PASSWORD_SCRYPT['WORK_FACTOR'])
+        self.assertTrue(make_password("password123").startswith('scrypt$'))
+
+    @override_settings(PASSWORD_SCRYPT=CHEAP_SCRYPT)
+    def test_parameters_come_from_settings(self):
+        encoded = make_password("password123")
+        decoded = get_hasher('default').decode(encoded)
+        self.assertEqual((decoded['work_factor'], decoded['block_size'], decoded['parallelism']), (16, 8, 1))
+        self.assertTrue(check_password("password123", encoded))
+
+    @override_settings(PASSWORD_SCRYPT={**CHEAP_SCRYPT, 'WORK_FACTOR': 2 ** 15})
+    def test_large_work_factor_raises_the_memory_limit(self):
+        self.assertTrue(check_password("password123", make_password("password123")))
+
+    @override_settings(PASSWORD_SCRYPT=CHEAP_SCRYPT)
+    def test_pickled_hasher_keeps_its_parameters(self):
+        hasher = pickle.loads(pickle.dumps(get_hasher('default')))
+        self.assertEqual(hasher.work_factor, 16)
+        self.assertEqual(hasher.parallelism, 1)
+
+
+class PasswordScryptCheckTest(TestCase):
+    def test_default_settings_pass(self):
+        self.assertEqual(check_password_scrypt(None), [])
+
+    @override_settings(PASSWORD_SCRYPT={**CHEAP_SCRYPT, 'BLOCK_SIZE': 16, 'PARALLELISM': 10})
+    def test_stronger_hashes_fit_the_password_columns(self):
+        self.assertEqual(check_password_scrypt(None), [])
+        encoded = make_password("password123")
+        self.assertEqual(len(encoded), 127)
+        doctor = Doctor.objects.create_user(
+            email="doctor@example.com", first_name="Doctor", last_name="Example", password="password123",
+        )
+        Doctor.objects.filter(pk=doctor.pk).update(password=encoded)
+        patient = Patient.objects.create(
+            first_name="Jane", last_name="Doe", email="jane.doe@example.com", password=encoded, created_by=doctor,
+        )
+        self.assertEqual(Doctor.objects.get(pk=doctor.pk).password, encoded)
+        self.assertEqual(Patient.objects.get(pk=patient.pk).password, encoded)
+
+    @override_settings(PASSWORD_SCRYPT={**CHEAP_SCRYPT, 'WORK_FACTOR': 2 ** 17})
+    def test_hashes_longer_than_a_column(self):
+        with mock.patch.object(Doctor._meta.get_field('password'), 'max_length', 128):
+            errors = check_password_scrypt(None)
+        self.assertEqual([error.id for error in errors], ['doctors.E003'])
+        self.assertIn('129-character', errors[0].msg)
+
+    @override_settings(PASSWORD_SCRYPT={**CHEAP_SCRYPT, 'WORK_FACTOR': 1000, 'PARALLELISM': 0})
+    def test_invalid_parameters(self):
+        self.assertEqual([error.id for error in check_password_scrypt(None)], ['doctors.E001', 'doctors.E002'])
+
+
+class PasswordUpgradeTest(TestCase):
+    """
+    Logging in replaces hashes made by other hashers or with other parameters.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        with self.settings(PASSWORD_HASHERS=[PBKDF2]):
+            self.doctor = Doctor.objects.create_user(
+                email="doctor@example.com",
+                first_name="Doctor",
+                last_name="Example",
+                password="password123",
+            )
+            self.patient = Patient.objects.create(
+                first_name="Jane",
+                last_name="Doe",
+                email="jane.doe@example.com",
+                password="password123",
+                created_by=self.doctor,
+            )
+
+    def login(self, name, email):
+        response = self.client.post(reverse(name), {"email": email, "password": "password123"}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_doctor_login_upgrades_pbkdf2(self):
+        self.assertTrue(self.doctor.password.startswith('pbkdf2_sha256$'))
+        self.login('doctor-login', "doctor@example.com")
+        self.doctor.refresh_from_db()
+        self.assertTrue(self.doctor.password.startswith('scrypt$'))
+        self.login('doctor-login', "doctor@example.com")
+
+    def test_patient_login_upgrades_pbkdf2(self):
+        self.assertTrue(self.patient.password.startswith('pbkdf2_sha256$'))
+        self.login('patient-login', "jane.doe@example.com")
+        self.patient.refresh_from_db()
+        self.assertTrue(self.patient.password.startswith('scrypt$'))
+        self.login('patient-login', "jane.doe@example.com")
+
+    def test_login_applies_new_parameters(self):
+        self.login('patient-login', "jane.doe@example.com")
+        with self.settings(PASSWORD_SCRYPT=CHEAP_SCRYPT):
+            self.login('patient-login', "jane.doe@example.com")
+            self.patient.refresh_from_db()
+            self.assertEqual(identify_hasher(self.patient.password).decode(self.patient.password)['work_factor'], 16)
+
+    def test_wrong_password_keeps_the_hash(self):
+        encoded = self.patient.password
+        self.client.post(
+            reverse('patient-login'), {"email": "jane.doe@example.com", "password": "wrong"}, format='json'
+        )
+        self.patient.refresh_from_db()
+        self.assertEqual(self.patient.password, encoded)
+
+    def test_patient_save_keeps_hashes_of_any_configured_hasher(self):
+        for encoded in (make_password("secret"), self.patient.password, make_password(None)):
+            with self.subTest(encoded=encoded[:8]):
+                self.patient.password = encoded
+                self.patient.save()
+                self.assertEqual(self.patient.password, encoded)
+
+    def test_patient_save_hashes_raw_passwords(self):
+        self.patient.password = "scrypt"
+        self.patient.save()
+        self.assertTrue(self.patient.password.startswith('scrypt$'))
+        self.assertTrue(self.patient.check_password("scrypt"))
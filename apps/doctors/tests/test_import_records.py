@@ -0,0 +1,183 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from apps.doctors.importing import iter_csv, iter_json_array
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorDaySlots, ImportCheckpoint
+
+HASHED = 'pbkdf2_sha256$1$salt$hash'
+
+
+class ReaderTest(TestCase):
+    def test_json_array_is_read_across_chunks_and_resumes(self):
+        records = [{"name": "Zoë", "n": i} for i in range(5)]
+        stream = io.BytesIO(json.dumps(records, indent=1, ensure_ascii=False).encode())
+        read = list(iter_json_array(stream, chunk_size=7))
+        self.assertEqual([record for record, _ in read], records)
+        resumed = list(iter_json_array(stream, offset=read[1][1], chunk_size=7))
+        self.assertEqual([record for record, _ in resumed], records[2:])
+
+    def test_csv_keeps_quoted_newlines_and_resumes(self):
+        stream = io.BytesIO(b'first_name,last_name\r\n"Ann\r\nMarie","Doe, Jr."\r\nBob,\r\nEve,Smith\r\n')
+        read = list(iter_csv(stream))
+        self.assertEqual([record for record, _ in read], [
+            {"first_name": "Ann\r\nMarie", "last_name": "Doe, Jr."},
+            {"first_name": "Bob"},
+            {"first_name": "Eve", "last_name": "Smith"},
+        ])
+        resumed = list(iter_csv(stream, offset=read[0][1]))
+        self.assertEqual([record for record, _ in resumed], [record for record, _ in read[1:]])
+
+
+class ImportRecordsCommandTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def write_ndjson(self, name, records):
+        return self.write(name, ''.join(json.dumps(record) + '\n' for record in records))
+
+    def run_command(self, *args):
+        out = io.StringIO()
+        call_command('import_records', *args, stdout=out)
+        return out.getvalue()
+
+    def test_imports_related_records_by_email(self):
+        existing = Doctor.objects.create_user(
+            email="existing@example.com", first_name="Existing", last_name="Doctor", password="password123"
+        )
+        DoctorDaySlots.objects.create(
+            doctor=existing, date="2024-01-01", slot_minutes=15, available=b'', free=b''
+        )
+        path = self.write_ndjson('records.ndjson', [
+            {"model": "doctor", "email": "house@example.com", "first_name": "Greg", "last_name": "House",
+             "password": "secret123"},
+            {"model": "patient", "email": "jane@example.com", "first_name": "Jane", "last_name": "Doe",
+             "password": HASHED, "created_by": "house@example.com"},
+            {"model": "appointment", "doctor": "existing@example.com", "patient": "jane@example.com",
+             "date": "2024-01-01", "time": "09:00", "duration_minutes": 45},
+        ])
+        output = self.run_command(path)
+        self.assertIn("Imported 1 doctors, 1 patients, 1 appointments", output)
+        self.assertIn("rows/s", output)
+
+        doctor = Doctor.objects.get(email="house@example.com")
+        self.assertTrue(doctor.check_password("secret123"))
+        patient = Patient.objects.get(email="jane@example.com")
+        self.assertEqual((patient.created_by, patient.password), (doctor, HASHED))
+        appointment = Appointment.objects.get()
+        self.assertEqual((appointment.doctor, appointment.patient), (existing, patient))
+        self.assertEqual(str(appointment.end_time), "09:45:00")
+        self.assertFalse(DoctorDaySlots.objects.exists())
+
+    def test_imports_fixture_objects(self):
+        doctor = Doctor.objects.create_user(
+            email="doctor@example.com", first_name="Doctor", last_name="Example", password="password123"
+        )
+        path = self.write('fixture.json', json.dumps([
+            {"model": "doctors.patient", "pk": 500, "fields": {
+                "first_name": "Jane", "last_name": "Doe", "email": "jane@example.com",
+                "password": HASHED, "created_by": doctor.id}},
+            {"model": "doctors.appointment", "pk": 7, "fields": {
+                "patient": 500, "doctor": doctor.id, "date": "2024-01-01", "time": "10:00:00",
+                "status": "completed", "reason": None}},
+        ]))
+        self.run_command(path)
+        appointment = Appointment.objects.get(pk=7)
+        self.assertEqual((appointment.patient_id, appointment.status), (500, "completed"))
+
+    def test_csv_rows_are_inserted_in_batches(self):
+        doctor = Doctor.objects.create_user(
+            email="doctor@example.com", first_name="Doctor", last_name="Example", password="password123"
+        )
+        rows = ''.join(f'Patient{i},Doe,patient{i}@example.com,{HASHED},{doctor.email}\n' for i in range(10))
+        path = self.write('patients.csv', 'first_name,last_name,email,password,created_by\n' + rows)
+        with CaptureQueriesContext(connection) as queries:
+            self.run_command(path, '--model', 'patient', '--batch-size', '5')
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "doctors_patient"')]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(Patient.objects.filter(created_by=doctor).count(), 10)
+
+    def test_resumes_from_checkpoint(self):
+        doctor = Doctor.objects.create_user(
+            email="doctor@example.com", first_name="Doctor", last_name="Example", password="password123"
+        )
+        records = [
+            {"model": "patient", "first_name": f"Patient{i}", "last_name": "Doe", "email": f"patient{i}@example.com",
+             "password": HASHED, "created_by": doctor.id}
+            for i in range(5)
+        ]
+        records[3]["email"] = "not-an-email"
+        path = self.write_ndjson('patients.ndjson', records)
+        with self.assertRaisesMessage(CommandError, "Records up to 2 are imported"):
+            self.run_command(path, '--batch-size', '2')
+        self.assertEqual(Patient.objects.count(), 2)
+
+        records[3]["email"] = "patient3@example.com"
+        self.write_ndjson('patients.ndjson', records)
+        self.assertIn("Resuming after record 2", self.run_command(path, '--batch-size', '2'))
+        self.assertEqual(Patient.objects.count(), 5)
+        # A finished import has nothing left to do
+        self.assertIn("Imported 0 doctors, 0 patients, 0 appointments", self.run_command(path))
+
+    def test_checkpoint_commits_with_the_batch(self):
+        doctor = Doctor.objects.create_user(
+            email="doctor@example.com", first_name="Doctor", last_name="Example", password="password123"
+        )
+        path = self.write_ndjson('patients.ndjson', [
+            {"model": "patient", "first_name": f"Patient{i}", "last_name": "Doe", "email": f"patient{i}@example.com",
+             "password": HASHED, "created_by": doctor.id}
+            for i in range(4)
+        ])
+        # A crash before the checkpoint is written loses the batch with it
+        with mock.patch.object(ImportCheckpoint.objects, 'update_or_create', side_effect=RuntimeError("crash")):
+            with self.assertRaisesMessage(RuntimeError, "crash"):
+                self.run_command(path, '--batch-size', '2')
+        self.assertFalse(Patient.objects.exists())
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+        self.assertNotIn("Resuming", self.run_command(path, '--batch-size', '2'))
+        self.assertEqual(Patient.objects.count(), 4)
+        checkpoint = ImportCheckpoint.objects.get()
+        self.assertEqual((checkpoint.name, checkpoint.source, checkpoint.records), (path, path, 4))
+
+    def test_checkpoint_of_another_file(self):
+        path = self.write_ndjson('doctors.ndjson', [])
+        ImportCheckpoint.objects.create(name=path, source='/elsewhere.ndjson', offset=10, records=1)
+        with self.assertRaisesMessage(CommandError, "pass --restart"):
+            self.run_command(path)
+        self.assertIn("Imported 0 doctors", self.run_command(path, '--restart'))
+
+    def test_raw_passwords_resembling_hashes_are_hashed(self):
+        path = self.write_ndjson('doctors.ndjson', [
+            {"model": "doctor", "email": "a@example.com", "first_name": "A", "last_name": "Doctor",
+             "password": "scrypt$secret"},
+        ])
+        self.run_command(path)
+        self.assertTrue(Doctor.objects.get(email="a@example.com").check_password("scrypt$secret"))
+
+    def test_rejects_unknown_references(self):
+        path = self.write_ndjson('patients.ndjson', [
+            {"model": "patient", "first_name": "Jane", "last_name": "Doe", "email": "jane@example.com",
+             "password": HASHED, "created_by": "nobody@example.com"},
+        ])
+        with self.assertRaisesMessage(CommandError, "unknown doctor 'nobody@example.com'"):
+            self.run_command(path)
+        self.assertFalse(Patient.objects.exists())
+
+    def test_rejects_unknown_fields(self):
+        path = self.write_ndjson('doctors.ndjson', [{"model": "doctor", "email": "a@example.com", "salary": 1}])
+        with self.assertRaisesMessage(CommandError, "unknown doctor field 'salary'"):
+            self.run_command(path)
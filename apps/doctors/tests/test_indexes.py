@@ -0,0 +1,92 @@
+import datetime
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.models import Doctor, Patient, Appointment
+
+
+class QueryPlanTest(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every SELECT a view issues and fails on full table scans.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        for day in range(1, 6):
+            Appointment.objects.create(
+                patient=self.patient,
+                doctor=self.doctor,
+                date=datetime.date(2024, 1, day),
+                time=datetime.time(9, 0),
+            )
+        self.appointment = Appointment.objects.first()
+
+    def assertIndexedQueries(self, request):
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+        self.assertLess(response.status_code, 400, response.data)
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        with connection.cursor() as cursor:
+            for sql in selects:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = [row[-1] for row in cursor.fetchall()]
+                scans = [step for step in plan if step.startswith('SCAN')]
+                self.assertFalse(scans, f"Full scan in plan {plan} for query:\n{sql}")
+        return response
+
+    def test_doctor_appointment_list(self):
+        self.client.force_authenticate(self.doctor)
+        first = self.assertIndexedQueries(lambda: self.client.get('/api/doctors/appointments', {'page_size': 2}))
+        second = self.assertIndexedQueries(lambda: self.client.get(first.data['next']))
+        self.assertIndexedQueries(lambda: self.client.get(second.data['previous']))
+
+    def test_filtered_appointment_lists(self):
+        params = {'from': '2024-01-02', 'to': '2024-01-04', 'status': 'scheduled', 'page_size': 2}
+        self.client.force_authenticate(self.doctor)
+        first = self.assertIndexedQueries(lambda: self.client.get('/api/doctors/appointments', params))
+        self.assertIndexedQueries(lambda: self.client.get(first.data['next']))
+        self.client.force_authenticate(self.patient)
+        self.assertIndexedQueries(lambda: self.client.get('/api/patients/appointments/', params))
+
+    def test_patient_list(self):
+        Patient.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        self.client.force_authenticate(self.doctor)
+        first = self.assertIndexedQueries(lambda: self.client.get(reverse('list-patients'), {'page_size': 1}))
+        self.assertIndexedQueries(lambda: self.client.get(first.data['next']))
+
+    def test_patient_detail(self):
+        self.client.force_authenticate(self.doctor)
+        self.assertIndexedQueries(lambda: self.client.get(reverse('patient-detail', args=[self.patient.id])))
+
+    def test_appointment_update(self):
+        self.client.force_authenticate(self.doctor)
+        self.assertIndexedQueries(lambda: self.client.patch(
+            reverse('update-appointment', args=[self.appointment.id]), {'status': 'completed'}, format='json'
+        ))
+
+    def test_patient_appointment_list(self):
+        self.client.force_authenticate(self.patient)
+        first = self.assertIndexedQueries(lambda: self.client.get('/api/patients/appointments/', {'page_size': 2}))
+        self.assertIndexedQueries(lambda: self.client.get(first.data['next']))
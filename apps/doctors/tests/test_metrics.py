@@ -0,0 +1,105 @@
+import re
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.metrics import MetricsRegistry, registry
+from apps.doctors.models import Doctor, Patient
+
+
+class MetricsRegistryTest(TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.5, 0.5, 3.0):
+            metrics.observe('view', 'route', 'GET', 200, seconds, 2, 0.01, 10)
+        text = metrics.render()
+        labels = 'view="view",route="route",method="GET"'
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="1.0"}} 3', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4', text)
+        self.assertIn(f'http_request_duration_seconds_count{{{labels}}} 4', text)
+        self.assertIn(f'http_request_db_queries_total{{{labels}}} 8', text)
+        self.assertIn(f'http_response_size_bytes_total{{{labels}}} 40', text)
+
+    def test_escapes_labels_and_folds_unknown_methods(self):
+        metrics = MetricsRegistry()
+        metrics.observe('a"b', 'c\\d', 'BREW', 418, 0.1, 0, 0.0, 0)
+        self.assertIn('view="a\\"b",route="c\\\\d",method="OTHER",status="418"', metrics.render())
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.staff = Doctor.objects.create_user(
+            email="ops@example.com",
+            first_name="Ops",
+            last_name="Example",
+            password="password123",
+            is_staff=True,
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+
+    def scrape(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def value(self, text, metric, labels):
+        match = re.search(rf'^{metric}{{{re.escape(labels)}}} (\S+)$', text, re.M)
+        self.assertIsNotNone(match, f"{metric}{{{labels}}} missing from:\n{text}")
+        return float(match.group(1))
+
+    def test_records_each_view(self):
+        self.client.force_authenticate(self.doctor)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('patient-detail', args=[self.patient.id]))
+        # The query log is cleared by the next request
+        query_count = len(queries)
+        self.client.get(reverse('patient-detail', args=[self.patient.id]))
+        self.client.get('/api/doctors/appointments')
+
+        text = self.scrape()
+        labels = 'view="patient-detail",route="api/doctors/patients/<int:pk>",method="GET"'
+        self.assertEqual(self.value(text, 'http_request_duration_seconds_count', labels), 2)
+        self.assertEqual(self.value(text, 'http_request_db_queries_total', labels), 2 * query_count)
+        self.assertGreater(self.value(text, 'http_request_db_seconds_total', labels), 0)
+        self.assertEqual(self.value(text, 'http_response_size_bytes_total', labels), 2 * len(response.content))
+        self.assertEqual(self.value(text, 'http_responses_total', labels[:-1] + '",status="200"'), 2)
+        self.assertIn('route="api/doctors/appointments"', text)
+        self.assertIn('basic_auth_cache_hits_total', text)
+
+    def test_unresolved_paths_share_one_label(self):
+        self.client.get('/no/such/page')
+        self.client.get('/another/missing/page')
+        labels = 'view="<unresolved>",route="",method="GET"'
+        self.assertEqual(self.value(self.scrape(), 'http_request_duration_seconds_count', labels), 2)
+
+    def test_only_staff_can_scrape(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        self.client.force_authenticate(self.doctor)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.force_authenticate(self.patient)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    def test_can_be_disabled(self):
+        with override_settings(METRICS={'ENABLED': False}):
+            client = APIClient()
+            client.force_authenticate(self.doctor)
+            client.get('/api/doctors/appointments')
+        self.assertNotIn('route="api/doctors/appointments"', self.scrape())
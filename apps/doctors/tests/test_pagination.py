@@ -0,0 +1,107 @@
+import base64
+import datetime
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.models import Doctor, Patient, Appointment
+
+
+class AppointmentCursorPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        # Several appointments share a date and even a time, so the key needs every field.
+        slots = [
+            (datetime.date(2024, 1, 2), datetime.time(9, 0)),
+            (datetime.date(2024, 1, 1), datetime.time(11, 0)),
+            (datetime.date(2024, 1, 1), datetime.time(9, 0)),
+            (datetime.date(2024, 1, 1), datetime.time(9, 0)),
+            (datetime.date(2024, 1, 1), datetime.time(10, 0)),
+            (datetime.date(2024, 1, 3), datetime.time(8, 0)),
+            (datetime.date(2024, 1, 1), datetime.time(9, 0)),
+        ]
+        for date, time in slots:
+            Appointment.objects.create(patient=self.patient, doctor=self.doctor, date=date, time=time)
+        self.expected = list(
+            Appointment.objects.order_by('date', 'time', 'id').values_list('id', flat=True)
+        )
+        self.client.force_authenticate(self.doctor)
+        self.url = '/api/doctors/appointments'
+
+    def test_walks_every_page_in_key_order(self):
+        seen = []
+        url = f"{self.url}?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(f"{self.url}?page_size=3")
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']],
+        )
+
+    def test_does_not_count_rows(self):
+        first = self.client.get(f"{self.url}?page_size=2")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first.data['next'])
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in queries.captured_queries))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(f"{self.url}?page_size=100000")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), len(self.expected))
+
+    def test_invalid_cursor(self):
+        for position in ('p=not-json', 'p=%5B%221%22%5D', 'p=%5B%22x%22%2C%22y%22%2C%22z%22%5D'):
+            cursor = base64.b64encode(position.encode()).decode()
+            response = self.client.get(self.url, {'cursor': cursor})
+            self.assertEqual(response.status_code, 404)
+
+
+class PatientCursorPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        for i in range(5):
+            Patient.objects.create(
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                email=f"patient{i}@example.com",
+                password="pbkdf2_sha256$1$salt$hash",
+                created_by=self.doctor,
+            )
+        self.client.force_authenticate(self.doctor)
+
+    def test_pages_patients_by_id(self):
+        first = self.client.get(reverse('list-patients'), {'page_size': 2})
+        second = self.client.get(first.data['next'])
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(ids, list(Patient.objects.order_by('id').values_list('id', flat=True)[:4]))
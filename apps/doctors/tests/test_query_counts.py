@@ -0,0 +1,168 @@
+import datetime
+from django.test import override_settings
+from django.urls import reverse
+from apps.doctors.models import Appointment, Doctor, DoctorAvailability, DoctorDaySlots
+from apps.doctors.tests.query_counts import FIRST_DAY, QueryCountTestCase
+
+
+class DoctorEndpointQueryCountTest(QueryCountTestCase):
+    """
+    Every endpoint in apps/doctors/urls.py runs the same number of queries for 1, 10 and 100 related rows.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.doctor)
+
+    def test_signup(self):
+        def grow(size):
+            existing = Doctor.objects.count()
+            Doctor.objects.bulk_create(
+                Doctor(email=f"other{i}@example.com", first_name="Other", last_name="Doctor")
+                for i in range(existing, size + 1)
+            )
+        self.client.force_authenticate(None)
+        self.assertConstantQueries(
+            lambda size: self.client.post(reverse('doctor-signup'), {
+                "email": f"new{size}@example.com", "first_name": "New", "last_name": "Doctor",
+                "password": "password123", "confirm_password": "password123",
+            }, format='json'),
+            grow,
+        )
+
+    def test_login(self):
+        self.client.force_authenticate(None)
+        self.assertConstantQueries(
+            lambda size: self.client.post(
+                reverse('doctor-login'), {"email": "doctor@example.com", "password": "password123"}, format='json'
+            ),
+            self.add_patients,
+        )
+
+    def test_profile(self):
+        self.assertConstantQueries(lambda size: self.client.get(reverse('doctor-profile')), self.add_appointments)
+
+    def test_profile_update(self):
+        self.assertConstantQueries(
+            lambda size: self.client.put(reverse('doctor-profile-update'), {
+                "first_name": "Doctor", "last_name": f"Example{size}", "email": "doctor@example.com",
+            }, format='json'),
+            self.add_appointments,
+        )
+
+    def add_windows(self, total):
+        existing = DoctorAvailability.objects.filter(doctor=self.doctor).count()
+        DoctorAvailability.objects.bulk_create(
+            DoctorAvailability(
+                doctor=self.doctor, weekday=i % 7, start_time=datetime.time(i // 7, 0),
+                end_time=datetime.time(i // 7, 30),
+            )
+            for i in range(existing, total)
+        )
+
+    def test_availability(self):
+        self.assertConstantQueries(lambda size: self.client.get(reverse('doctor-availability')), self.add_windows)
+
+    def test_availability_replace(self):
+        windows = [
+            {"weekday": i % 7, "start_time": f"{i // 7:02d}:00", "end_time": f"{i // 7:02d}:30"}
+            for i in range(100)
+        ]
+        self.assertConstantQueries(
+            lambda size: self.client.put(reverse('doctor-availability'), windows[:size], format='json'),
+            self.add_windows,
+        )
+
+    def test_slots(self):
+        DoctorAvailability.objects.create(
+            doctor=self.doctor, weekday=0, start_time=datetime.time(0, 0), end_time=datetime.time(23, 0)
+        )
+
+        def grow(size):
+            self.add_appointments(size)
+            # Measure the path that builds the bitmaps from the appointments
+            DoctorDaySlots.objects.all().delete()
+
+        self.assertConstantQueries(
+            lambda size: self.client.get(
+                reverse('doctor-slots', args=[self.doctor.id]), {'from': FIRST_DAY, 'to': FIRST_DAY + datetime.timedelta(days=6)}
+            ),
+            grow,
+        )
+
+    def test_patient_create(self):
+        self.assertConstantQueries(
+            lambda size: self.client.post(reverse('create-patient'), {
+                "first_name": "New", "last_name": "Patient", "email": f"new{size}@example.com",
+                "password": "password123",
+            }, format='json'),
+            self.add_patients,
+        )
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_patient_bulk_create(self):
+        self.assertConstantQueries(
+            lambda size: self.client.post(reverse('bulk-create-patients'), [
+                {"first_name": "New", "last_name": "Patient", "email": f"new{size}.{i}@example.com",
+                 "password": "password123"}
+                for i in range(size)
+            ], format='json'),
+            lambda size: None,
+        )
+
+    def test_patient_list(self):
+        self.assertConstantQueries(lambda size: self.client.get(reverse('list-patients')), self.add_patients)
+
+    def test_patient_export(self):
+        self.assertConstantQueries(lambda size: self.client.get(reverse('export-patients')), self.add_patients)
+
+    def test_patient_detail(self):
+        self.assertConstantQueries(
+            lambda size: self.client.get(reverse('patient-detail', args=[self.patient.id])), self.add_appointments,
+            # The patient, looked up and authorized together
+            expected=1,
+        )
+
+    def test_appointment_list(self):
+        self.assertConstantQueries(lambda size: self.client.get('/api/doctors/appointments'), self.add_appointments)
+
+    def test_appointment_list_expanded(self):
+        self.assertConstantQueries(
+            lambda size: self.client.get('/api/doctors/appointments', {'expand': 'patient,doctor'}),
+            self.add_appointments,
+        )
+
+    def test_appointment_export(self):
+        self.assertConstantQueries(
+            lambda size: self.client.get(reverse('export-appointments')), self.add_appointments
+        )
+
+    def test_appointment_update(self):
+        self.add_appointments(1)
+        appointment = self.patient.appointments.get()
+        self.assertConstantQueries(
+            lambda size: self.client.patch(
+                reverse('update-appointment', args=[appointment.id]),
+                {"reason": f"Follow-up {size}", "duration_minutes": 15}, format='json',
+            ),
+            self.add_appointments,
+            # The scoped appointment and the overlap check, then in a savepoint the doctor's lock,
+            # the overlap check again, the UPDATE and the data versions of the doctor and the patient
+            expected=9,
+        )
+
+    def test_other_doctors_rows_are_not_found(self):
+        other = Doctor.objects.create_user(
+            email="other@example.com", first_name="Other", last_name="Doctor", password="password123"
+        )
+        self.add_appointments(1)
+        appointment = self.patient.appointments.get()
+        self.client.force_authenticate(other)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(reverse('patient-detail', args=[self.patient.id])).status_code, 404)
+        with self.assertNumQueries(1):
+            response = self.client.patch(
+                reverse('update-appointment', args=[appointment.id]), {"reason": "Taken over"}, format='json'
+            )
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(Appointment.objects.get(pk=appointment.pk).reason)
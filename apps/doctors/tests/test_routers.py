@@ -0,0 +1,167 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections, router
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.authentication import ROLE_DOCTOR, get_tokens_for_user
+from apps.doctors.metrics import registry
+from apps.doctors import slots
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorAvailability
+from apps.doctors.routers import replica_reads
+
+
+@override_settings(DATABASE_REPLICAS={'ALIASES': ['replica']})
+class ReplicaRoutingTest(TestCase):
+    """
+    Safe requests read from the replica until they write; everything else uses the primary.
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        self.appointment = Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            date=datetime.date(2024, 1, 1),
+            time=datetime.time(9, 0),
+            reason="Checkup",
+        )
+        self.replicate(self.doctor, self.patient, self.appointment)
+        # From here on the primary is ahead of the replica
+        Appointment.objects.filter(pk=self.appointment.pk).update(status='completed')
+        tokens = get_tokens_for_user(self.doctor, ROLE_DOCTOR)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def replicate(self, *objects):
+        for obj in objects:
+            model = type(obj)
+            model.objects.using('replica').bulk_create([model.objects.get(pk=obj.pk)])
+
+    def capture(self):
+        return CaptureQueriesContext(connections['default']), CaptureQueriesContext(connections['replica'])
+
+    def test_list_reads_from_replica(self):
+        primary, replica = self.capture()
+        with primary, replica:
+            response = self.client.get('/api/doctors/appointments')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['status'], 'scheduled')
+        self.assertEqual(len(primary), 0)
+        # The user lookup and the page
+        self.assertEqual(len(replica), 2)
+
+    def test_export_reads_from_replica(self):
+        response = self.client.get(reverse('export-appointments'), {'type': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('"status": "scheduled"', b''.join(response.streaming_content).decode())
+
+    def test_writes_use_primary(self):
+        primary, replica = self.capture()
+        with primary, replica:
+            response = self.client.patch(
+                reverse('update-appointment', args=[self.appointment.pk]), {"reason": "Follow-up"}, format='json'
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(len(replica), 0)
+
+    def test_stored_slot_bitmaps_are_built_from_primary(self):
+        # The replica has neither the schedule nor the completed status of the 09:00 appointment
+        DoctorAvailability.objects.create(
+            doctor=self.doctor, weekday=0, start_time=datetime.time(9, 0), end_time=datetime.time(10, 0)
+        )
+        response = self.client.get(
+            reverse('doctor-slots', args=[self.doctor.pk]), {'from': '2024-01-01', 'to': '2024-01-01'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['days'][0]['slots'], ["09:00", "09:15", "09:30", "09:45"])
+        self.assertEqual(slots.get_free_slots(self.doctor.pk, datetime.date(2024, 1, 1), datetime.date(2024, 1, 1)), [
+            (datetime.date(2024, 1, 1), 0b1111 << 36),
+        ])
+
+    def test_reads_after_a_write_use_primary(self):
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Appointment), 'replica')
+            doctor = Doctor.objects.get(pk=self.doctor.pk)
+            self.assertEqual(doctor._state.db, 'replica')
+            doctor.first_name = "Gregory"
+            doctor.save(update_fields=['first_name'])
+            self.assertEqual(router.db_for_read(Appointment), 'default')
+            self.assertEqual(Appointment.objects.get(pk=self.appointment.pk).status, 'completed')
+        self.assertEqual(Doctor.objects.get(pk=self.doctor.pk).first_name, "Gregory")
+        self.assertEqual(Doctor.objects.using('replica').get(pk=self.doctor.pk).first_name, "Doctor")
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(Appointment.objects.all().db, 'default')
+
+    @override_settings(DATABASE_REPLICAS={'ALIASES': []})
+    def test_without_replicas(self):
+        with replica_reads():
+            self.assertEqual(Appointment.objects.all().db, 'default')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(router.allow_migrate('replica', 'doctors'))
+        self.assertTrue(router.allow_migrate('default', 'doctors'))
+
+    def test_metrics_count_queries_per_alias(self):
+        registry.reset()
+        self.client.get('/api/doctors/appointments')
+        self.client.patch(reverse('update-appointment', args=[self.appointment.pk]), {"reason": "x"}, format='json')
+        text = registry.render()
+        self.assertIn(
+            'http_request_db_alias_queries_total{view="list-appointments",route="api/doctors/appointments",'
+            'method="GET",alias="replica"} 2\n',
+            text,
+        )
+        self.assertNotIn('method="GET",alias="default"', text)
+        self.assertIn('method="PATCH",alias="default"}', text)
+
+
+class SyncReplicasCommandTest(TestCase):
+    def test_copies_the_primary_into_each_replica(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        primary = os.path.join(directory.name, 'primary.sqlite3')
+        replica = os.path.join(directory.name, 'replica.sqlite3')
+        with sqlite3.connect(primary) as source:
+            source.execute('CREATE TABLE rows (value INTEGER)')
+            source.execute('INSERT INTO rows VALUES (1)')
+        source.close()
+
+        with mock.patch.dict(connections['default'].settings_dict, NAME=primary), \
+                mock.patch.dict(connections['replica'].settings_dict, NAME=replica), \
+                override_settings(DATABASE_REPLICAS={'ALIASES': ['replica']}):
+            call_command('sync_replicas', stdout=open(os.devnull, 'w'))
+
+        target = sqlite3.connect(replica)
+        self.addCleanup(target.close)
+        self.assertEqual(target.execute('SELECT value FROM rows').fetchall(), [(1,)])
+
+    def test_requires_replicas(self):
+        with self.assertRaises(CommandError):
+            call_command('sync_replicas')
+
+    @override_settings(DATABASE_REPLICAS={'ALIASES': ['replica']})
+    def test_requires_sqlite_files(self):
+        with self.assertRaisesMessage(CommandError, "Database 'default' is not an SQLite file."):
+            call_command('sync_replicas')
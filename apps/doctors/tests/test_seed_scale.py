@@ -0,0 +1,61 @@
+import datetime
+import io
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorAvailability, appointment_end_time
+from apps.patients.models import Patient as PatientAccount
+
+
+class SeedScaleCommandTest(TestCase):
+    def seed(self, domain='seed.example.com', seed='0'):
+        call_command(
+            'seed_scale', '--doctors', '2', '--patients-per-doctor', '3', '--appointments-per-patient', '20',
+            '--anchor-date', '2024-06-03', '--seed', seed, '--domain', domain, '--batch-size', '7',
+            stdout=io.StringIO(),
+        )
+        return list(
+            Appointment.objects.filter(doctor__email__endswith=f'@{domain}')
+            .order_by('id').values_list('date', 'time', 'duration_minutes', 'status', 'reason')
+        )
+
+    def test_creates_every_model(self):
+        self.seed()
+        self.assertEqual(Doctor.objects.count(), 2)
+        self.assertEqual(DoctorAvailability.objects.count(), 10)
+        self.assertEqual(Patient.objects.count(), 6)
+        self.assertEqual(PatientAccount.objects.count(), 6)
+        self.assertEqual(Appointment.objects.count(), 120)
+        for patient in Patient.objects.all():
+            self.assertEqual(patient.appointments.count(), 20)
+            self.assertEqual(patient.appointments.values('doctor').distinct().count(), 1)
+        account = PatientAccount.objects.get(email='patient0@seed.example.com')
+        self.assertTrue(account.check_password('password123'))
+
+    def test_data_is_deterministic(self):
+        first = self.seed('a.example.com')
+        self.assertEqual(self.seed('b.example.com'), first)
+        self.assertNotEqual(self.seed('c.example.com', seed='1'), first)
+
+    def test_appointments_are_realistic(self):
+        self.seed()
+        anchor = datetime.date(2024, 6, 3)
+        for appointment in Appointment.objects.all():
+            self.assertLess(appointment.date.weekday(), 5)
+            self.assertEqual(appointment.end_time, appointment_end_time(appointment.time, appointment.duration_minutes))
+            if appointment.date < anchor:
+                self.assertIn(appointment.status, ('completed', 'canceled'))
+            else:
+                self.assertIn(appointment.status, ('scheduled', 'canceled'))
+            if appointment.status != 'canceled':
+                clashes = Appointment.objects.filter(
+                    doctor_id=appointment.doctor_id,
+                    date=appointment.date,
+                    time__lt=appointment.end_time,
+                    end_time__gt=appointment.time,
+                ).exclude(pk=appointment.pk).exclude(status='canceled')
+                self.assertFalse(clashes.exists())
+
+    def test_refuses_to_seed_a_domain_twice(self):
+        self.seed()
+        with self.assertRaisesMessage(CommandError, "already exist"):
+            self.seed()
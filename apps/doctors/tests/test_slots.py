@@ -0,0 +1,168 @@
+import datetime
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors import slots
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorAvailability, DoctorDaySlots
+
+MONDAY = datetime.date(2024, 1, 1)
+
+
+class SlotMaskTest(TestCase):
+    def test_window_mask_only_counts_whole_slots(self):
+        # 09:10 - 10:00 only fully contains 09:15, 09:30 and 09:45.
+        mask = slots.window_mask(9 * 60 + 10, 10 * 60, 15)
+        self.assertEqual(slots.mask_to_times(mask, 15), ["09:15", "09:30", "09:45"])
+
+    def test_booking_mask_covers_partial_slots(self):
+        mask = slots.booking_mask(9 * 60 + 10, 9 * 60 + 20, 15)
+        self.assertEqual(slots.mask_to_times(mask, 15), ["09:00", "09:15"])
+
+    def test_encode_round_trip(self):
+        mask = slots.window_mask(0, 24 * 60, 15)
+        self.assertEqual(slots.decode_mask(slots.encode_mask(mask, 15)), mask)
+
+
+class DoctorSlotsViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        DoctorAvailability.objects.create(
+            doctor=self.doctor, weekday=0, start_time=datetime.time(9, 0), end_time=datetime.time(10, 0)
+        )
+        self.client.force_authenticate(self.doctor)
+        self.url = reverse('doctor-slots', args=[self.doctor.id])
+
+    def get_monday(self):
+        response = self.client.get(self.url, {'from': '2024-01-01', 'to': '2024-01-01'})
+        self.assertEqual(response.status_code, 200)
+        return response.data['days'][0]['slots']
+
+    def book(self, time, **kwargs):
+        kwargs.setdefault('duration_minutes', 15)
+        return Appointment.objects.create(patient=self.patient, doctor=self.doctor, date=MONDAY, time=time, **kwargs)
+
+    def test_lists_slots_from_weekly_schedule(self):
+        response = self.client.get(self.url, {'from': '2024-01-01', 'to': '2024-01-02'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['slot_minutes'], 15)
+        self.assertEqual(response.data['days'], [
+            {"date": "2024-01-01", "slots": ["09:00", "09:15", "09:30", "09:45"]},
+            {"date": "2024-01-02", "slots": []},
+        ])
+
+    def test_existing_appointments_are_excluded_when_building(self):
+        self.book(datetime.time(9, 30))
+        self.book(datetime.time(9, 0), status='canceled')
+        self.assertEqual(self.get_monday(), ["09:00", "09:15", "09:45"])
+
+    def test_long_appointments_take_several_slots(self):
+        self.get_monday()
+        self.book(datetime.time(9, 10), duration_minutes=30)
+        self.assertEqual(self.get_monday(), ["09:45"])
+
+    def test_booking_and_cancelling_update_the_bitmap(self):
+        self.get_monday()
+        appointment = self.book("09:15:00")
+        self.assertEqual(self.get_monday(), ["09:00", "09:30", "09:45"])
+
+        appointment = Appointment.objects.get(pk=appointment.pk)
+        appointment.time = datetime.time(9, 45)
+        appointment.save()
+        self.assertEqual(self.get_monday(), ["09:00", "09:15", "09:30"])
+
+        appointment.status = 'canceled'
+        appointment.save()
+        self.assertEqual(self.get_monday(), ["09:00", "09:15", "09:30", "09:45"])
+
+    def test_cancelling_keeps_slots_shared_with_a_neighbour(self):
+        self.get_monday()
+        first = self.book(datetime.time(9, 0), duration_minutes=20)
+        second = self.book(datetime.time(9, 20), duration_minutes=20)
+        self.assertEqual(self.get_monday(), ["09:45"])
+
+        first.status = 'canceled'
+        first.save()
+        # 09:15 - 09:30 still holds the start of the second appointment
+        self.assertEqual(self.get_monday(), ["09:00", "09:45"])
+        self.assertTrue(
+            Appointment.objects.overlapping(self.doctor.id, MONDAY, datetime.time(9, 15), datetime.time(9, 30)).exists()
+        )
+
+        Appointment.objects.get(pk=second.pk).delete()
+        self.assertEqual(self.get_monday(), ["09:00", "09:15", "09:30", "09:45"])
+
+    def test_deleting_an_appointment_frees_its_slot(self):
+        self.get_monday()
+        appointment = self.book(datetime.time(9, 0))
+        self.assertNotIn("09:00", self.get_monday())
+        Appointment.objects.get(pk=appointment.pk).delete()
+        self.assertIn("09:00", self.get_monday())
+
+    def test_booking_while_building_is_not_lost(self):
+        lock_doctor = slots.lock_doctor
+        calls = []
+
+        def book_first(doctor_id, using):
+            # A booking that commits while the build waits for the lock
+            calls.append(doctor_id)
+            if len(calls) == 1:
+                self.book(datetime.time(9, 0))
+            lock_doctor(doctor_id, using)
+
+        with mock.patch('apps.doctors.slots.lock_doctor', side_effect=book_first):
+            self.assertEqual(self.get_monday(), ["09:15", "09:30", "09:45"])
+        self.assertEqual(self.get_monday(), ["09:15", "09:30", "09:45"])
+
+    def test_query_count_does_not_depend_on_appointments(self):
+        for minute in (0, 15, 30):
+            self.book(datetime.time(9, minute))
+        self.get_monday()
+        for _ in range(20):
+            Appointment.objects.create(
+                patient=self.patient, doctor=self.doctor, date=MONDAY, time=datetime.time(12, 0), status='completed'
+            )
+        # Doctor lookup and the bitmap rows, however many appointments exist.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get_monday(), ["09:45"])
+
+    def test_replacing_schedule_rebuilds_bitmaps(self):
+        self.get_monday()
+        response = self.client.put(
+            reverse('doctor-availability'),
+            [{"weekday": 0, "start_time": "14:00", "end_time": "14:30"}],
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(DoctorDaySlots.objects.filter(doctor=self.doctor).exists())
+        self.assertEqual(self.get_monday(), ["14:00", "14:15"])
+        self.assertEqual(len(self.client.get(reverse('doctor-availability')).data), 1)
+
+    def test_rejects_invalid_schedule(self):
+        response = self.client.put(
+            reverse('doctor-availability'),
+            [{"weekday": 0, "start_time": "14:00", "end_time": "13:00"}],
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_invalid_ranges(self):
+        for params in ({'from': 'yesterday'}, {'from': '2024-01-05', 'to': '2024-01-01'}, {'from': '2024-01-01', 'to': '2024-06-01'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+    def test_unknown_doctor(self):
+        response = self.client.get(reverse('doctor-slots', args=[self.doctor.id + 100]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,213 @@
+import base64
+from unittest import mock
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.authentication import ROLE_DOCTOR, ROLE_PATIENT, get_tokens_for_user
+from apps.doctors.models import Doctor, Patient
+from apps.doctors.throttling import parse_rate
+
+SCOPES = {
+    'login': {
+        'ip': {'RATE': '60/min', 'BURST': 4},
+        'account': {'RATE': '60/min', 'BURST': 2},
+    },
+    'signup': {
+        'ip': {'RATE': '60/min', 'BURST': 1},
+    },
+    'create-patient': {
+        'account': {'RATE': '60/min', 'BURST': 1},
+    },
+    'bulk-create-patients': {
+        'account': {'RATE': '60/min', 'BURST': 1},
+    },
+}
+
+
+@override_settings(THROTTLES={**settings.THROTTLES, 'ENABLED': True, 'SCOPES': SCOPES})
+class TokenBucketThrottleTest(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLES['CACHE']].clear()
+        self.addCleanup(caches[settings.THROTTLES['CACHE']].clear)
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            password="password123",
+            created_by=self.doctor,
+        )
+        # Hashing takes long enough to refill buckets between requests, so the clock only moves when told to
+        self.now = 1_000_000.0
+        clock = mock.patch('apps.doctors.throttling.time.time', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def login(self, email="doctor@example.com", ip='10.0.0.1', url='doctor-login', **extra):
+        return self.client.post(
+            reverse(url), {"email": email, "password": "wrong"}, format='json', REMOTE_ADDR=ip, **extra
+        )
+
+    def basic(self, password):
+        return f"Basic {base64.b64encode(f'doctor@example.com:{password}'.encode()).decode()}"
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/s'), 10)
+        self.assertEqual(parse_rate('30/min'), 0.5)
+        self.assertEqual(parse_rate('36/hour'), 0.01)
+
+    def test_rejected_before_any_query_or_hash(self):
+        for _ in range(2):
+            self.assertEqual(self.login().status_code, 401)
+        with self.assertNumQueries(0), mock.patch('django.contrib.auth.hashers.make_password') as make, \
+                mock.patch('apps.doctors.backends.RoleModelBackend.authenticate') as authenticate:
+            response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        make.assert_not_called()
+        authenticate.assert_not_called()
+
+    def test_basic_credentials_do_not_bypass_the_throttle(self):
+        for url in ('doctor-login', 'patient-login'):
+            with self.subTest(url=url):
+                for _ in range(2):
+                    self.login(email="jane.doe@example.com", url=url, HTTP_AUTHORIZATION=self.basic("wrong"))
+                with self.assertNumQueries(0), mock.patch('django.contrib.auth.hashers.make_password') as make:
+                    response = self.login(email="jane.doe@example.com", url=url, HTTP_AUTHORIZATION=self.basic("wrong"))
+                self.assertEqual(response.status_code, 429)
+                make.assert_not_called()
+                caches[settings.THROTTLES['CACHE']].clear()
+
+    def test_basic_credentials_are_not_checked_over_the_limit(self):
+        payload = {"first_name": "John", "last_name": "Doe", "password": "password123"}
+        response = self.client.post(
+            reverse('create-patient'), {**payload, "email": "john@example.com"}, format='json',
+            HTTP_AUTHORIZATION=self.basic("password123"),
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        with self.assertNumQueries(0), mock.patch.object(Doctor, 'check_password') as check:
+            response = self.client.post(
+                reverse('create-patient'), {**payload, "email": "jim@example.com"}, format='json',
+                HTTP_AUTHORIZATION=self.basic("wrong"),
+            )
+        self.assertEqual(response.status_code, 429)
+        check.assert_not_called()
+
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        payload = {"first_name": "New", "last_name": "Doctor", "password": "password123",
+                   "confirm_password": "password123"}
+        for i in range(2):
+            response = self.client.post(
+                reverse('doctor-signup'), {**payload, "email": f"new{i}@example.com"}, format='json',
+                HTTP_X_FORWARDED_FOR=f'192.0.2.{i}',
+            )
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1})
+    def test_forwarded_for_is_trusted_behind_proxies(self):
+        for i in range(5):
+            response = self.login(email=f"doctor{i}@example.com", HTTP_X_FORWARDED_FOR=f'203.0.113.9, 192.0.2.{i}')
+            self.assertEqual(response.status_code, 401)
+
+    def test_account_bucket_spans_addresses(self):
+        self.login(ip='10.0.0.1')
+        self.login(email=" Doctor@Example.com ", ip='10.0.0.2')
+        self.assertEqual(self.login(ip='10.0.0.3').status_code, 429)
+        self.assertEqual(self.login(email="other@example.com", ip='10.0.0.3').status_code, 401)
+
+    def test_ip_bucket_spans_accounts(self):
+        for i in range(4):
+            self.assertEqual(self.login(email=f"doctor{i}@example.com").status_code, 401)
+        self.assertEqual(self.login(email="doctor4@example.com").status_code, 429)
+        self.assertEqual(self.login(email="doctor4@example.com", ip='10.0.0.2').status_code, 401)
+
+    def test_rejected_request_takes_no_token(self):
+        for i in range(4):
+            self.login(email=f"doctor{i}@example.com")
+        self.assertEqual(self.login(email="doctor4@example.com").status_code, 429)
+        self.assertEqual(self.login(email="doctor4@example.com").status_code, 429)
+        self.now += 1
+        # One token back on the address, and the rejections took none from the account
+        self.assertEqual(self.login(email="doctor4@example.com").status_code, 401)
+        self.assertEqual(self.login(email="doctor4@example.com", ip='10.0.0.2').status_code, 401)
+        self.assertEqual(self.login(email="doctor4@example.com", ip='10.0.0.2').status_code, 429)
+
+    def test_bucket_refills(self):
+        self.login()
+        self.login()
+        self.assertEqual(self.login().status_code, 429)
+        self.now += 0.5
+        self.assertEqual(self.login()['Retry-After'], '1')
+        self.now += 0.5
+        self.assertEqual(self.login().status_code, 401)
+        self.assertEqual(self.login().status_code, 429)
+        self.now += 3600
+        self.assertEqual(self.login().status_code, 401)
+        self.assertEqual(self.login().status_code, 401)
+        self.assertEqual(self.login().status_code, 429)
+
+    def test_patient_login_shares_scope(self):
+        self.login(email="jane.doe@example.com", url='patient-login')
+        self.login(email="jane.doe@example.com", url='patient-login')
+        self.assertEqual(self.login(email="jane.doe@example.com", url='patient-login').status_code, 429)
+
+    def test_signup(self):
+        payload = {"email": "new@example.com", "first_name": "New", "last_name": "Doctor", "password": "password123",
+                   "confirm_password": "password123"}
+        self.assertEqual(self.client.post(reverse('doctor-signup'), payload, format='json').status_code, 201)
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('doctor-signup'), {**payload, "email": "next@example.com"}, format='json')
+        self.assertEqual(response.status_code, 429)
+
+    def bearer(self, user, role=ROLE_DOCTOR):
+        return f"Bearer {get_tokens_for_user(user, role)['access']}"
+
+    def test_patient_creation_per_doctor(self):
+        other = Doctor.objects.create_user(
+            email="other@example.com", first_name="Other", last_name="Doctor", password="password123",
+        )
+        payload = {"first_name": "John", "last_name": "Doe", "password": "password123"}
+        self.client.credentials(HTTP_AUTHORIZATION=self.bearer(self.doctor))
+        response = self.client.post(reverse('create-patient'), {**payload, "email": "john@example.com"}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('create-patient'), {**payload, "email": "jim@example.com"}, format='json')
+        self.assertEqual(response.status_code, 429)
+
+        self.client.credentials(HTTP_AUTHORIZATION=self.bearer(other))
+        response = self.client.post(reverse('create-patient'), {**payload, "email": "jim@example.com"}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_token_roles_have_separate_buckets(self):
+        patient = Patient.objects.get(pk=self.patient.pk)
+        patient.pk = self.doctor.pk
+        self.client.credentials(HTTP_AUTHORIZATION=self.bearer(self.doctor))
+        self.client.post(reverse('create-patient'), {}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=self.bearer(patient, ROLE_PATIENT))
+        self.assertNotEqual(self.client.post(reverse('create-patient'), {}, format='json').status_code, 429)
+
+    def test_body_email_is_not_an_account_on_patient_creation(self):
+        payload = {"email": "john@example.com", "first_name": "John", "last_name": "Doe", "password": "password123"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(reverse('create-patient'), payload, format='json').status_code, 401)
+
+    def test_bulk_patient_creation(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.bearer(self.doctor))
+        rows = [{"first_name": "John", "last_name": "Doe", "email": "john@example.com", "password": "password123"}]
+        self.assertEqual(self.client.post(reverse('bulk-create-patients'), rows, format='json').status_code, 201)
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('bulk-create-patients'), rows, format='json')
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(THROTTLES={**settings.THROTTLES, 'ENABLED': False, 'SCOPES': SCOPES})
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertEqual(self.login().status_code, 401)
@@ -0,0 +1,98 @@
+import datetime
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from apps.doctors.models import Doctor, Patient, Appointment
+from apps.doctors.serializers import AppointmentSerializer, PatientSerializer
+from apps.doctors.values import ValuesSerializer, values_serializer
+
+
+class ValuesSerializerTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patients = [
+            Patient.objects.create(
+                first_name=first_name,
+                last_name="Doe",
+                email=f"{first_name.lower()}@example.com",
+                password="password123",
+                created_by=self.doctor,
+            )
+            for first_name in ("Jane", "Zoë", "John")
+        ]
+        rows = (
+            (1, datetime.time(9, 0), 30, 'scheduled', "Checkup"),
+            (1, datetime.time(9, 30, 15), 15, 'completed', None),
+            (2, datetime.time(7, 45), 60, 'canceled', ""),
+            (3, datetime.time(16, 0), 45, 'scheduled', "Follow-up \"quoted\"\nsecond line"),
+        )
+        for number, (day, time, duration, status, reason) in enumerate(rows):
+            Appointment.objects.create(
+                patient=self.patients[number % len(self.patients)],
+                doctor=self.doctor,
+                date=datetime.date(2024, 1, day),
+                time=time,
+                duration_minutes=duration,
+                status=status,
+                reason=reason,
+            )
+        self.client.force_authenticate(self.doctor)
+
+    def assertSameJSON(self, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        renderer = ValuesSerializer(serializer_class)
+        actual = JSONRenderer().render(renderer.to_representation(renderer.values(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_appointment_parity(self):
+        self.assertSameJSON(AppointmentSerializer, Appointment.objects.order_by('id'))
+
+    def test_patient_parity(self):
+        self.assertSameJSON(PatientSerializer, Patient.objects.order_by('id'))
+
+    def test_list_views_match_serializer(self):
+        for url, serializer_class, queryset in (
+            ('/api/doctors/appointments', AppointmentSerializer, Appointment.objects.order_by('date', 'time', 'id')),
+            (reverse('list-patients'), PatientSerializer, Patient.objects.order_by('id')),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                expected = serializer_class(queryset, many=True).data
+                self.assertEqual(
+                    JSONRenderer().render(response.data['results']),
+                    JSONRenderer().render(expected),
+                )
+
+    def test_pages_follow_on(self):
+        first = self.client.get('/api/doctors/appointments', {'page_size': 2})
+        second = self.client.get(first.data['next'])
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(ids, list(Appointment.objects.order_by('date', 'time', 'id').values_list('id', flat=True)))
+        self.assertIsNone(second.data['next'])
+
+    def test_cached_per_serializer(self):
+        self.assertIs(values_serializer(AppointmentSerializer), values_serializer(AppointmentSerializer))
+
+    def test_unsupported_field(self):
+        class MethodFieldSerializer(serializers.ModelSerializer):
+            name = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Patient
+                fields = ['id', 'name']
+
+            def get_name(self, obj):
+                return obj.first_name
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(MethodFieldSerializer)
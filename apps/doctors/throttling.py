@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import get_authorization_header
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.exceptions import InvalidToken
+from apps.doctors.authentication import RoleJWTAuthentication
+
+RATE_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Return the tokens per second of a DRF style rate such as '10/min'.
+    """
+    count, period = rate.split('/')
+    return int(count) / RATE_PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket throttle per client IP and per account, configured per view ``throttle_scope``.
+
+    ``settings.THROTTLES['SCOPES'][scope]`` gives each kind of key a bucket of
+    ``BURST`` requests refilled at ``RATE``. A request is let through only if
+    every one of its buckets has a token, and only then are tokens taken.
+    Buckets live in the ``THROTTLES['CACHE']`` alias, so processes sharing that
+    cache share the limits. The read and the write of the buckets are not
+    atomic, so concurrent requests may occasionally get one token too many.
+
+    The account is read from the request's credentials without checking them,
+    so the throttle can run before authentication (see ``ThrottleFirstMixin``)
+    and a rejected request never touches the database or the password hasher:
+    the role and user id claims of a bearer token whose signature is valid,
+    the user id of Basic credentials, or the session cookie. Views setting
+    ``throttle_account_field`` fall back to that field of the body, so login
+    attempts against one address are limited whichever IPs they come from.
+    The same doctor using a token and Basic credentials fills two buckets.
+    """
+    cache_key_prefix = 'throttle'
+
+    def __init__(self):
+        self.delay = 0.0
+
+    def allow_request(self, request, view):
+        config = settings.THROTTLES
+        scope = getattr(view, 'throttle_scope', None)
+        buckets = config['SCOPES'].get(scope) if config['ENABLED'] else None
+        if not buckets:
+            return True
+
+        keys = {}
+        for kind, bucket in buckets.items():
+            ident = self.get_ident(request) if kind == 'ip' else self.get_account(request, view)
+            if ident is not None:
+                digest = hashlib.blake2b(str(ident).encode('utf-8'), digest_size=16).hexdigest()
+                keys[f'{self.cache_key_prefix}:{scope}:{kind}:{digest}'] = (parse_rate(bucket['RATE']), bucket['BURST'])
+
+        cache = caches[config['CACHE']]
+        stored = cache.get_many(keys)
+        now = time.time()
+        updated = {}
+        for key, (rate, burst) in keys.items():
+            tokens, last = stored.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens < 1:
+                self.delay = max(self.delay, (1 - tokens) / rate)
+            updated[key] = tokens - 1
+        if self.delay:
+            return False
+
+        for key, (rate, burst) in keys.items():
+            # A bucket left alone until it is full again is the same as no bucket
+            cache.set(key, (updated[key], now), timeout=int((burst - updated[key]) / rate) + 1)
+        return True
+
+    def get_ident(self, request):
+        """
+        Return the client address, trusting X-Forwarded-For only behind the configured number of proxies.
+
+        Without ``NUM_PROXIES`` DRF takes the whole header from the client,
+        which would let every request pick a fresh IP bucket.
+        """
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get('REMOTE_ADDR')
+        return super().get_ident(request)
+
+    def get_account(self, request, view):
+        """
+        Return the account a request acts for or on, or None.
+        """
+        auth = get_authorization_header(request).split()
+        if len(auth) == 2 and auth[0].lower() == b'bearer':
+            authenticator = RoleJWTAuthentication()
+            try:
+                model, lookup = authenticator.get_user_lookup(authenticator.get_validated_token(auth[1]))
+            except InvalidToken:
+                return None
+            return f'{model._meta.label_lower}:{next(iter(lookup.values()))}'
+        if len(auth) == 2 and auth[0].lower() == b'basic':
+            try:
+                userid = base64.b64decode(auth[1]).decode('utf-8').partition(':')[0]
+            except ValueError:
+                return None
+            return f'basic:{userid.strip().lower()}'
+        session = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if session:
+            return f'session:{session}'
+
+        field = getattr(view, 'throttle_account_field', None)
+        value = request.data.get(field) if field and hasattr(request.data, 'get') else None
+        if isinstance(value, str) and value.strip():
+            return value.strip().lower()
+        return None
+
+    def wait(self):
+        return self.delay
+
+
+class ThrottleFirstMixin:
+    """
+    View mixin checking the throttles before authenticating the request.
+
+    DRF authenticates first, so an authenticator that hashes a password, such
+    as Basic, would run for every request over the limit. With this mixin the
+    throttles only see the credentials ``TokenBucketThrottle`` reads without
+    checking them.
+    """
+
+    def perform_authentication(self, request):
+        super().check_throttles(request)
+        super().perform_authentication(request)
+
+    def check_throttles(self, request):
+        # Already checked before authentication
+        pass
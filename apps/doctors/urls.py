@@ -1,28 +1,51 @@
+from django.conf import settings
 from django.urls import path
 from apps.doctors.views import (
     DoctorRegisterView,
     DoctorLoginView,
     DoctorProfileView,
     PatientCreateView,
+    PatientBulkCreateView,
     PatientListView,
+    PatientExportView,
     PatientDetailView,
     DoctorAppointmentsListView,
-    AppointmentUpdateView
+    DoctorAppointmentsExportView,
+    AppointmentUpdateView,
+    DoctorAvailabilityView,
+    DoctorSlotsView,
+    AsyncDoctorProfileView,
+    AsyncPatientListView,
+    AsyncDoctorAppointmentsListView,
 )
 
+if settings.ASYNC_VIEWS['ENABLED']:
+    ProfileView, ListPatientsView, ListAppointmentsView = (
+        AsyncDoctorProfileView, AsyncPatientListView, AsyncDoctorAppointmentsListView
+    )
+else:
+    ProfileView, ListPatientsView, ListAppointmentsView = (
+        DoctorProfileView, PatientListView, DoctorAppointmentsListView
+    )
+
 urlpatterns = [
     # Doctor Endpoints
     path('signup', DoctorRegisterView.as_view(), name='doctor-signup'),
     path('login', DoctorLoginView.as_view(), name='doctor-login'),
-    path('profile', DoctorProfileView.as_view(), name='doctor-profile'),
+    path('profile', ProfileView.as_view(), name='doctor-profile'),
     path('profile/update', DoctorProfileView.as_view(), name='doctor-profile-update'),
+    path('profile/availability', DoctorAvailabilityView.as_view(), name='doctor-availability'),
+    path('<int:pk>/slots', DoctorSlotsView.as_view(), name='doctor-slots'),
 
     # Patient Endpoints
     path('patients/create', PatientCreateView.as_view(), name='create-patient'),
-    path('patients', PatientListView.as_view(), name='list-patients'),
+    path('patients/bulk', PatientBulkCreateView.as_view(), name='bulk-create-patients'),
+    path('patients', ListPatientsView.as_view(), name='list-patients'),
+    path('patients/export', PatientExportView.as_view(), name='export-patients'),
     path('patients/<int:pk>', PatientDetailView.as_view(), name='patient-detail'),
 
     # Appointment Endpoints
-    path('appointments', DoctorAppointmentsListView.as_view(), name='list-appointments'),
+    path('appointments', ListAppointmentsView.as_view(), name='list-appointments'),
+    path('appointments/export', DoctorAppointmentsExportView.as_view(), name='export-appointments'),
     path('appointments/<int:pk>/update', AppointmentUpdateView.as_view(), name='update-appointment'),
 ]
@@ -0,0 +1,113 @@
+import functools
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose to_representation returns database values of the right type unchanged
+IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField)
+
+
+class ValuesSerializer:
+    """
+    Renders ``queryset.values()`` rows into the same data as a ModelSerializer.
+
+    The serializer's readable fields are inspected once: related primary keys
+    read their ``<field>_id`` column, fields that would return the database
+    value unchanged are copied as-is and every other field keeps its own
+    ``to_representation``. Only flat fields backed by a model column are
+    supported, so method fields, nested serializers and dotted sources raise
+    ImproperlyConfigured.
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                lookup, convert = model._meta.get_field(field.source).attname, None
+            elif (
+                isinstance(field, (serializers.BaseSerializer, serializers.RelatedField, serializers.ManyRelatedField,
+                                   serializers.SerializerMethodField, serializers.HiddenField))
+                or field.source == '*' or '.' in field.source
+            ):
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} cannot be rendered from values() rows."
+                )
+            elif isinstance(field, IDENTITY_FIELDS) or (
+                isinstance(field, serializers.ChoiceField) and all(isinstance(key, str) for key in field.choices)
+            ):
+                lookup, convert = field.source, None
+            else:
+                lookup, convert = field.source, field.to_representation
+            columns.append((name, lookup, convert))
+        self.columns = tuple(columns)
+        self.lookups = tuple(dict.fromkeys(lookup for _, lookup, _ in columns))
+
+    def values(self, queryset, *extra):
+        """
+        Return ``queryset`` as dictionaries holding the serialized columns and ``extra`` ones.
+        """
+        return queryset.values(*self.lookups, *(name for name in extra if name not in self.lookups))
+
+    def to_representation(self, rows):
+        """
+        Convert ``values()`` rows into a list of serialized dictionaries.
+
+        Args:
+            rows (iterable): Dictionaries returned by ``values()``.
+
+        Returns:
+            list: One dictionary per row, keyed like the serializer's output.
+        """
+        columns = self.columns
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, convert in columns:
+                value = row[lookup]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def values_serializer(serializer_class):
+    """
+    Return the cached ValuesSerializer of ``serializer_class``.
+    """
+    return ValuesSerializer(serializer_class)
+
+
+class ValuesListMixin:
+    """
+    Opt-in list path for generic views that skips model instances altogether.
+
+    The filtered queryset is fetched with ``values()``, paginated as usual and
+    rendered by the ValuesSerializer of the view's serializer class, so the
+    response body is identical to the regular list response. Requests that
+    expand related objects take the regular path.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if self.get_serializer_context().get('expand'):
+            return super().list(request, *args, **kwargs)
+        renderer = values_serializer(self.get_serializer_class())
+        queryset = self.get_values_queryset(renderer, self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(renderer.to_representation(page))
+        return Response(renderer.to_representation(queryset))
+
+    def get_values_queryset(self, renderer, queryset):
+        """
+        Return ``queryset`` as the rows ``renderer`` and the paginator need.
+        """
+        # The paginator reads its cursor position from the ordering columns of each row
+        ordering = getattr(self.paginator, 'ordering', ()) if self.paginator is not None else ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return renderer.values(queryset, *(field.lstrip('-') for field in ordering))
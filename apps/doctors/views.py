@@ -1,27 +1,56 @@
-from rest_framework import generics, permissions, status
+from datetime import timedelta
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.exceptions import NotFound
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
+from django.http import HttpResponse
 from django.contrib.auth import authenticate
+from django.db import IntegrityError, router, transaction
+from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
-from apps.doctors.models import Doctor, Patient, Appointment
+from apps.doctors import slots
+from apps.doctors.models import Doctor, Patient, Appointment, DoctorAvailability
 from apps.doctors.serializers import (
     DoctorLoginSerializer,
     DoctorCreateSerializer,
     DoctorProfileSerializer,
     PatientCreationSerializer,
+    PatientBulkRowSerializer,
     PatientSerializer,
     AppointmentSerializer,
+    DoctorAvailabilitySerializer,
 )
-from apps.doctors.permissions import IsDoctor, CanManagePatient
+from apps.doctors.permissions import IsDoctor, CanManagePatient, IsStaff
+from apps.doctors.authentication import ROLE_DOCTOR, get_tokens_for_user
+from apps.doctors.hashing import password_hashing
+from apps.doctors.pagination import AppointmentCursorPagination, PatientCursorPagination
+from apps.doctors.filters import AppointmentFilterBackend, parse_date_param
+from apps.doctors.parsers import NDJSONParser
+from apps.doctors.exports import StreamingExportView
+from apps.doctors.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from apps.doctors.values import ValuesListMixin
+from apps.doctors.expand import ExpandMixin
+from apps.doctors.caching import AsyncCachedResponseMixin, CachedResponseMixin, response_cache
+from apps.doctors.async_generics import AsyncListAPIView, AsyncRetrieveAPIView
+from apps.doctors.throttling import ThrottleFirstMixin, TokenBucketThrottle
 
 class DoctorRegisterView(generics.CreateAPIView):
     queryset = Doctor.objects.all
     serializer_class = DoctorCreateSerializer
     permission_classes = [permissions.AllowAny]
+    # No authenticators: a Basic header would be hashed before the throttle is checked
+    authentication_classes = []
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'signup'
 
 class DoctorLoginView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = DoctorLoginSerializer
+    authentication_classes = []
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'login'
+    throttle_account_field = 'email'
 
     def post(self, request, *args, **kwargs):
         email = request.data.get('email')
@@ -30,76 +59,278 @@ class DoctorLoginView(generics.GenericAPIView):
         if not email or not password:
             return Response({"error": "Email and password are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        doctor = authenticate(email=email, password=password)
+        doctor = authenticate(request, email=email, password=password, role=ROLE_DOCTOR)
         if doctor is not None and doctor.is_active:
-            refresh = RefreshToken.for_user(doctor)
-            return Response({
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            })
+            return Response(get_tokens_for_user(doctor, ROLE_DOCTOR))
         return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
 
 
-class DoctorProfileView(generics.RetrieveUpdateAPIView):
+class DoctorProfileView(CachedResponseMixin, generics.RetrieveUpdateAPIView):
     """
     Retrieve and update doctor profile.
     """
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsDoctor]
     serializer_class = DoctorProfileSerializer
 
     def get_object(self):
         return self.request.user
 
-class PatientCreateView(generics.CreateAPIView):
+class PatientCreateView(ThrottleFirstMixin, generics.CreateAPIView):
     queryset = Patient.objects.all()
     serializer_class = PatientCreationSerializer
     permission_classes = [IsAuthenticated, IsDoctor]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'create-patient'
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
 
+class PatientBulkCreateView(ThrottleFirstMixin, generics.GenericAPIView):
+    """
+    Create many patients for the logged-in doctor from a JSON array or NDJSON body.
+
+    Every row is validated and reported on individually. Accepted rows are
+    inserted with bulk_create in batches inside a single transaction.
+    """
+    serializer_class = PatientBulkRowSerializer
+    permission_classes = [IsAuthenticated, IsDoctor]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'bulk-create-patients'
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def get_batch_size(self):
+        options = settings.PATIENT_BULK_CREATE
+        try:
+            batch_size = int(self.request.query_params.get('batch_size', options['BATCH_SIZE']))
+        except ValueError:
+            raise serializers.ValidationError({"batch_size": "Must be an integer."})
+        if batch_size < 1:
+            raise serializers.ValidationError({"batch_size": "Must be a positive integer."})
+        return min(batch_size, options['MAX_BATCH_SIZE'])
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response({"error": "Expected a list of patients."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.PATIENT_BULK_CREATE['MAX_ROWS']:
+            return Response(
+                {"error": f"At most {settings.PATIENT_BULK_CREATE['MAX_ROWS']} patients can be created per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        batch_size = self.get_batch_size()
+
+        results = [None] * len(rows)
+        accepted = []
+        for index, row in enumerate(rows):
+            serializer = self.get_serializer(data=row)
+            if serializer.is_valid():
+                accepted.append((index, serializer.validated_data))
+            else:
+                results[index] = {"row": index, "errors": serializer.errors}
+
+        # Check email uniqueness against the database and within the upload.
+        emails = [data['email'] for _, data in accepted]
+        taken = set()
+        for start in range(0, len(emails), batch_size):
+            taken.update(
+                Patient.objects.filter(email__in=emails[start:start + batch_size]).values_list('email', flat=True)
+            )
+        to_create = []
+        for index, data in accepted:
+            if data['email'] in taken:
+                results[index] = {"row": index, "errors": {"email": ["patient with this email already exists."]}}
+                continue
+            taken.add(data['email'])
+            to_create.append((index, data))
+
+        passwords = password_hashing.hash_passwords(data['password'] for _, data in to_create)
+        patients = [
+            Patient(**dict(data, password=password), created_by=request.user)
+            for (_, data), password in zip(to_create, passwords)
+        ]
+        try:
+            with transaction.atomic():
+                Patient.objects.bulk_create(patients, batch_size=batch_size)
+        except IntegrityError:
+            return Response(
+                {"error": "Patients were created concurrently with this upload, please retry."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        # bulk_create skips the signals that invalidate the doctor's cached patient list
+        response_cache.bump(ROLE_DOCTOR, {request.user.pk})
+        for (index, _), patient in zip(to_create, patients):
+            results[index] = {"row": index, "id": patient.id}
+
+        failed = len(rows) - len(patients)
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif patients:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"created": len(patients), "failed": failed, "results": results}, status=response_status)
+
+
 class PatientDetailView(generics.RetrieveAPIView):
-    queryset = Patient.objects.all()
     serializer_class = PatientSerializer
     permission_classes = [IsAuthenticated, IsDoctor, CanManagePatient]
 
-    def get_object(self):
-        patient = super().get_object()
-        if patient.created_by != self.request.user:
-            raise permissions.PermissionDenied("You do not have permission to view this patient.")
-        return patient
+    def get_queryset(self):
+        # Scoped to the doctor's patients, so the lookup and the ownership check are one query
+        return Patient.objects.filter(created_by_id=self.request.user.pk)
 
 
-class PatientListView(generics.ListAPIView):
+class PatientListView(CachedResponseMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = PatientSerializer
     permission_classes = [IsAuthenticated, IsDoctor]
+    pagination_class = PatientCursorPagination
 
     def get_queryset(self):
         return Patient.objects.filter(created_by=self.request.user)
 
 
-class DoctorAppointmentsListView(generics.ListAPIView):
+class PatientExportView(StreamingExportView):
+    """
+    Streams the logged-in doctor's patients as CSV or NDJSON.
+    """
+    permission_classes = [IsAuthenticated, IsDoctor]
+    columns = ('id', 'first_name', 'last_name', 'email', 'created_by')
+    filename = 'patients'
+
+    def get_queryset(self):
+        return Patient.objects.filter(created_by=self.request.user).order_by('id')
+
+
+class DoctorAppointmentsListView(CachedResponseMixin, ExpandMixin, ValuesListMixin, generics.ListAPIView):
     """
     View for listing all appointments for the logged-in doctor.
     """
     serializer_class = AppointmentSerializer
     permission_classes = [IsAuthenticated, IsDoctor]
+    pagination_class = AppointmentCursorPagination
+    filter_backends = [AppointmentFilterBackend]
 
     def get_queryset(self):
         return Appointment.objects.filter(doctor=self.request.user)
 
 
-class AppointmentUpdateView(generics.UpdateAPIView):
+class DoctorAppointmentsExportView(StreamingExportView):
+    """
+    Streams the logged-in doctor's appointments as CSV or NDJSON, with the same filters as the list.
+    """
+    permission_classes = [IsAuthenticated, IsDoctor]
+    filter_backends = [AppointmentFilterBackend]
+    columns = ('id', 'patient', 'doctor', 'date', 'time', 'duration_minutes', 'end_time', 'status', 'reason')
+    filename = 'appointments'
+
+    def get_queryset(self):
+        return Appointment.objects.filter(doctor=self.request.user).order_by('date', 'time', 'id')
+
+
+class AppointmentUpdateView(ExpandMixin, generics.UpdateAPIView):
     """
     View for updating or canceling an appointment by the logged-in doctor.
     """
-    queryset = Appointment.objects.all()
     serializer_class = AppointmentSerializer
     permission_classes = [IsAuthenticated, IsDoctor]
 
-    def get_object(self):
-        appointment = super().get_object()
-        if appointment.doctor != self.request.user:
-            raise permissions.PermissionDenied("You do not have permission to update this appointment.")
-        return appointment
+    def get_queryset(self):
+        # Other doctors' appointments are not found at all, without loading their doctor
+        return Appointment.objects.filter(doctor_id=self.request.user.pk)
+
+
+class DoctorAvailabilityView(generics.GenericAPIView):
+    """
+    Retrieve or replace the logged-in doctor's weekly availability schedule.
+    """
+    serializer_class = DoctorAvailabilitySerializer
+    permission_classes = [IsAuthenticated, IsDoctor]
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(request.user.weekly_availability.all(), many=True)
+        return Response(serializer.data)
+
+    def put(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic(using=router.db_for_write(DoctorAvailability)), slots.defer_clears():
+            request.user.weekly_availability.all().delete()
+            DoctorAvailability.objects.bulk_create(
+                DoctorAvailability(doctor=request.user, **window) for window in serializer.validated_data
+            )
+            # bulk_create sends no signals, and the deletes' own clears are folded into this one
+            slots.clear_day_slots(request.user.id)
+        return Response(serializer.data)
+
+
+class DoctorSlotsView(generics.GenericAPIView):
+    """
+    List a doctor's free appointment slots for each day between ?from= and ?to=.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        start = parse_date_param(request.query_params, 'from', timezone.localdate())
+        end = parse_date_param(request.query_params, 'to', start + timedelta(days=6))
+        max_days = settings.APPOINTMENT_SLOTS['MAX_DAYS']
+        if end < start:
+            raise serializers.ValidationError({"to": "Must not be before 'from'."})
+        if (end - start).days >= max_days:
+            raise serializers.ValidationError({"to": f"At most {max_days} days can be requested at once."})
+        if not Doctor.objects.filter(pk=pk, is_active=True).exists():
+            raise NotFound("Doctor not found.")
+
+        slot_minutes = slots.get_slot_minutes()
+        days = [
+            {"date": date.isoformat(), "slots": slots.mask_to_times(mask, slot_minutes)}
+            for date, mask in slots.get_free_slots(pk, start, end)
+        ]
+        return Response({"doctor": pk, "slot_minutes": slot_minutes, "days": days})
+
+
+class MetricsView(generics.GenericAPIView):
+    """
+    Serves the request metrics in the Prometheus text format to staff accounts.
+    """
+    permission_classes = [IsAuthenticated, IsStaff]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class AsyncDoctorProfileView(AsyncCachedResponseMixin, AsyncRetrieveAPIView):
+    """
+    Async variant of DoctorProfileView for ASGI deployments; updates are passed to the sync view.
+    """
+    permission_classes = [IsAuthenticated, IsDoctor]
+    serializer_class = DoctorProfileSerializer
+    sync_view = DoctorProfileView
+
+    async def aget_object(self):
+        return self.request.user
+
+
+class AsyncPatientListView(AsyncCachedResponseMixin, AsyncListAPIView):
+    """
+    Async variant of PatientListView for ASGI deployments.
+    """
+    serializer_class = PatientSerializer
+    permission_classes = [IsAuthenticated, IsDoctor]
+    pagination_class = PatientCursorPagination
+
+    def get_queryset(self):
+        return Patient.objects.filter(created_by=self.request.user)
+
+
+class AsyncDoctorAppointmentsListView(AsyncCachedResponseMixin, ExpandMixin, AsyncListAPIView):
+    """
+    Async variant of DoctorAppointmentsListView for ASGI deployments.
+    """
+    serializer_class = AppointmentSerializer
+    permission_classes = [IsAuthenticated, IsDoctor]
+    pagination_class = AppointmentCursorPagination
+    filter_backends = [AppointmentFilterBackend]
+
+    def get_queryset(self):
+        return Appointment.objects.filter(doctor=self.request.user)
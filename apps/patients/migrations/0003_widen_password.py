@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0002_alter_patient_password'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='patient',
+            name='password',
+            field=models.CharField(max_length=255),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, Permis
 from django.db import models
 from django.utils import timezone
 from django.conf import settings
+from apps.doctors.hashing import password_hashing
 
 class PatientManager(BaseUserManager):
     """
@@ -12,7 +13,7 @@ class PatientManager(BaseUserManager):
             raise ValueError('The Email field must be set')
         email = self.normalize_email(email)
         patient = self.model(email=email, first_name=first_name, last_name=last_name, **extra_fields)
-        patient.set_password(password)
+        patient.password = password_hashing.hash_password(password)
         patient.save(using=self._db)
         return patient
 
@@ -32,7 +33,7 @@ class Patient(AbstractBaseUser, PermissionsMixin):
     first_name = models.CharField(max_length=30)
     last_name = models.CharField(max_length=30)
     email = models.EmailField(unique=True)
-    password = models.CharField(max_length=128)
+    password = models.CharField(max_length=255)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     date_joined = models.DateTimeField(default=timezone.now)
     is_active = models.BooleanField(default=True)
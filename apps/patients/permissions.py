@@ -1,5 +1,6 @@
 from rest_framework import permissions
-from apps.doctors.models import Appointment
+from apps.doctors.models import ROLE_PATIENT, Appointment
+from apps.doctors.models import Patient as PatientAccount
 from apps.patients.models import Patient
 
 class IsPatient(permissions.BasePermission):
@@ -9,7 +10,7 @@ class IsPatient(permissions.BasePermission):
 
     def has_permission(self, request, view):
         # Check if the user is authenticated and is a Patient
-        return request.user and request.user.is_authenticated and hasattr(request.user, 'patient')
+        return bool(request.user and request.user.is_authenticated and getattr(request.user, 'role', None) == ROLE_PATIENT)
 
 class IsOwner(permissions.BasePermission):
     """
@@ -19,8 +20,12 @@ class IsOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         # Check if the user is the owner of the object
         # For patient profile and appointments, the user should be the owner
-        if isinstance(obj, Patient):
-            return obj == request.user
-        elif isinstance(obj, Appointment):
-            return obj.patient == request.user
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+        if isinstance(obj, Appointment):
+            # Compare ids so the patient relation is not loaded; doctor and patient ids overlap
+            return getattr(user, 'role', None) == ROLE_PATIENT and obj.patient_id == user.pk
+        if isinstance(obj, (Patient, PatientAccount)):
+            return type(obj) is type(user) and obj.pk == user.pk
         return False
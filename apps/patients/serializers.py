@@ -1,8 +1,5 @@
 from rest_framework import serializers
-from django.contrib.auth import get_user_model
-from apps.doctors.models import Appointment
-
-Patient = get_user_model()
+from apps.doctors.models import Appointment, Doctor, Patient
 
 class PatientLoginSerializer(serializers.Serializer):
     """
@@ -15,10 +12,19 @@ class PatientLoginSerializer(serializers.Serializer):
 class PatientProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for retrieving and updating patient profile.
+
+    Bound to the patient account model, so the email is checked for uniqueness among patients.
     """
     class Meta:
         model = Patient
-        fields = ['first_name', 'last_name', 'email', 'phone_number']
+        fields = ['first_name', 'last_name', 'email']
+
+    def validate_email(self, value):
+        # A patient may not take over an address a doctor signs in with
+        changed = self.instance is None or value.lower() != self.instance.email.lower()
+        if changed and Doctor.objects.filter(email__iexact=value).exists():
+            raise serializers.ValidationError("This email is already in use.")
+        return value
 
 
 class PatientSerializer(serializers.ModelSerializer):
@@ -36,4 +42,4 @@ class PatientAppointmentSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Appointment
-        fields = ['id', 'doctor', 'patient', 'date', 'time', 'status', 'reason']
+        fields = ['id', 'doctor', 'patient', 'date', 'time', 'duration_minutes', 'end_time', 'status', 'reason']
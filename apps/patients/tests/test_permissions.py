@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from apps.doctors.permissions import IsDoctor
 from apps.patients.permissions import IsPatient, IsOwner
 from apps.doctors.models import Doctor
+from apps.doctors.models import Patient as PatientAccount
 from apps.patients.models import Patient
 
 User = get_user_model()
@@ -97,3 +98,25 @@ class PermissionTests(TestCase):
         # Simulate the object being accessed
         permission = IsOwner()
         self.assertFalse(permission.has_object_permission(request, None, self.patient_user))
+
+    def test_is_patient_permission_with_patient_account(self):
+        request = self.factory.get('/some-url/')
+        request.user = PatientAccount.objects.create(
+            first_name='Jane',
+            last_name='Doe',
+            email='jane.doe@example.com',
+            password='testpassword123',
+            created_by=self.doctor_user
+        )
+        self.assertTrue(IsPatient().has_permission(request, None))
+        self.assertFalse(IsDoctor().has_permission(request, None))
+
+    def test_is_patient_permission_with_doctor(self):
+        request = self.factory.get('/some-url/')
+        request.user = self.doctor_user
+        self.assertFalse(IsPatient().has_permission(request, None))
+
+    def test_doctor_cannot_use_patient_endpoints(self):
+        self.client.force_authenticate(self.doctor_user)
+        response = self.client.get('/api/patients/appointments/')
+        self.assertEqual(response.status_code, 403)
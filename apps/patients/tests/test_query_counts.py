@@ -0,0 +1,78 @@
+import datetime
+from django.urls import reverse
+from apps.doctors.models import Patient
+from apps.doctors.tests.query_counts import FIRST_DAY, QueryCountTestCase
+
+
+class PatientEndpointQueryCountTest(QueryCountTestCase):
+    """
+    Every endpoint in apps/patients/urls.py runs the same number of queries for 1, 10 and 100 related rows.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.patient)
+
+    def test_login(self):
+        self.client.force_authenticate(None)
+        self.assertConstantQueries(
+            lambda size: self.client.post(
+                reverse('patient-login'), {"email": "jane.doe@example.com", "password": "password123"}, format='json'
+            ),
+            self.add_appointments,
+        )
+
+    def test_profile(self):
+        self.assertConstantQueries(lambda size: self.client.get(reverse('patient-profile')), self.add_appointments)
+
+    def test_profile_update(self):
+        self.assertConstantQueries(
+            lambda size: self.client.put(reverse('patient-update-profile'), {
+                "first_name": "Jane", "last_name": f"Doe{size}", "email": "jane.doe@example.com",
+            }, format='json'),
+            self.add_appointments,
+        )
+
+    def test_appointment_list(self):
+        self.assertConstantQueries(lambda size: self.client.get('/api/patients/appointments/'), self.add_appointments)
+
+    def test_appointment_list_expanded(self):
+        self.assertConstantQueries(
+            lambda size: self.client.get('/api/patients/appointments/', {'expand': 'doctor'}),
+            self.add_appointments,
+        )
+
+    def test_appointment_detail(self):
+        self.add_appointments(1)
+        appointment = self.patient.appointments.get()
+        self.assertConstantQueries(
+            lambda size: self.client.get(reverse('appointment-detail', args=[appointment.id])),
+            self.add_appointments,
+            # The appointment, looked up and authorized together
+            expected=1,
+        )
+
+    def test_appointment_detail_of_another_patient(self):
+        self.add_appointments(1)
+        appointment = self.patient.appointments.get()
+        other = Patient.objects.create(
+            first_name="John", last_name="Doe", email="john.doe@example.com", password="password123",
+            created_by=self.doctor,
+        )
+        self.client.force_authenticate(other)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('appointment-detail', args=[appointment.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_book_appointment(self):
+        # Bookings go to the second day, which the 100 row run also fills
+        self.assertConstantQueries(
+            lambda size: self.client.post(reverse('book-appointment'), {
+                "doctor": self.doctor.id,
+                "patient": self.patient.id,
+                "date": FIRST_DAY + datetime.timedelta(days=1),
+                "time": f"{size % 24:02d}:00",
+                "duration_minutes": 15,
+            }, format='json'),
+            self.add_appointments,
+        )
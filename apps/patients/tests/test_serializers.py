@@ -1,6 +1,7 @@
 from django.test import TestCase
-from django.contrib.auth import get_user_model
-from apps.doctors.models import Appointment, Doctor
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.doctors.models import Appointment, Doctor, Patient
 from apps.patients.serializers import (
     PatientLoginSerializer,
     PatientProfileSerializer,
@@ -11,8 +12,6 @@ from rest_framework.exceptions import ValidationError
 from rest_framework import serializers
 from django.utils import timezone
 
-Patient = get_user_model()
-
 class PatientLoginSerializerTest(TestCase):
     def setUp(self):
         self.patient_data = {
@@ -21,7 +20,7 @@ class PatientLoginSerializerTest(TestCase):
             "last_name": "Patient",
             "password": "password123",
         }
-        self.patient = Patient.objects.create_user(**self.patient_data)
+        self.patient = Doctor.objects.create_user(**self.patient_data)
 
     def test_valid_data(self):
         serializer = PatientLoginSerializer(data={
@@ -41,33 +40,69 @@ class PatientLoginSerializerTest(TestCase):
 
 class PatientProfileSerializerTest(TestCase):
     def setUp(self):
-        self.patient_data = {
-            "email": "testpatient@example.com",
-            "first_name": "Test",
-            "last_name": "Patient",
-            "password": "password123",
-            "phone_number": "1234567890",
-        }
-        self.patient = Patient.objects.create_user(**self.patient_data)
+        self.doctor = Doctor.objects.create_user(
+            email="doctor@example.com",
+            first_name="Doctor",
+            last_name="Example",
+            password="password123",
+        )
+        self.patient = Patient.objects.create(
+            email="testpatient@example.com",
+            first_name="Test",
+            last_name="Patient",
+            password="password123",
+            created_by=self.doctor,
+        )
+        self.other = Patient.objects.create(
+            email="other@example.com",
+            first_name="Other",
+            last_name="Patient",
+            password="password123",
+            created_by=self.doctor,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.patient)
 
     def test_patient_profile_retrieve(self):
         serializer = PatientProfileSerializer(instance=self.patient)
-        self.assertEqual(serializer.data['first_name'], self.patient.first_name)
-        self.assertEqual(serializer.data['last_name'], self.patient.last_name)
-        self.assertEqual(serializer.data['email'], self.patient.email)
-        self.assertEqual(serializer.data['phone_number'], self.patient.phone_number)
+        self.assertEqual(serializer.data, {
+            'first_name': "Test", 'last_name': "Patient", 'email': "testpatient@example.com",
+        })
 
     def test_patient_profile_update(self):
         serializer = PatientProfileSerializer(
             instance=self.patient,
-            data={'first_name': 'Updated', 'last_name': 'Name', 'phone_number': '0987654321'},
+            data={'first_name': 'Updated', 'last_name': 'Name'},
             partial=True
         )
         self.assertTrue(serializer.is_valid())
         updated_patient = serializer.save()
         self.assertEqual(updated_patient.first_name, 'Updated')
-        self.assertEqual(updated_patient.last_name, 'Name')
-        self.assertEqual(updated_patient.phone_number, '0987654321')
+        self.assertEqual(Patient.objects.get(pk=self.patient.pk).last_name, 'Name')
+
+    def update_email(self, email):
+        return self.client.put(reverse('patient-update-profile'), {
+            "first_name": "Test", "last_name": "Patient", "email": email,
+        }, format='json')
+
+    def test_email_of_another_patient_is_rejected(self):
+        response = self.update_email("other@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+    def test_email_of_a_doctor_is_rejected(self):
+        # The doctor has the same id as the patient, which the old Doctor-bound check excluded
+        self.assertEqual(self.doctor.pk, self.patient.pk)
+        response = self.update_email("Doctor@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+        self.assertEqual(Patient.objects.get(pk=self.patient.pk).email, "testpatient@example.com")
+
+    def test_own_email_is_kept(self):
+        response = self.update_email("testpatient@example.com")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.update_email("new@example.com").status_code, 200)
+        self.assertEqual(Patient.objects.get(pk=self.patient.pk).email, "new@example.com")
 
 
 class PatientSerializerTest(TestCase):
@@ -78,7 +113,10 @@ class PatientSerializerTest(TestCase):
             "last_name": "Patient",
             "password": "password123",
         }
-        self.patient = Patient.objects.create_user(**self.patient_data)
+        doctor = Doctor.objects.create_user(
+            email="doctor@example.com", first_name="Doctor", last_name="Example", password="password123",
+        )
+        self.patient = Patient.objects.create(**self.patient_data, created_by=doctor)
 
     def test_patient_data_retrieve(self):
         serializer = PatientSerializer(instance=self.patient)
@@ -1,20 +1,32 @@
-from django.contrib.auth import authenticate, login
+from django.contrib.auth import authenticate
 from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.authtoken.models import Token
 from .models import Patient
 from .serializers import PatientSerializer, PatientLoginSerializer, PatientProfileSerializer, PatientAppointmentSerializer
-from .permissions import IsOwner
+from .permissions import IsOwner, IsPatient
 from apps.doctors.models import Appointment
 from apps.doctors.serializers import AppointmentSerializer
+from apps.doctors.filters import AppointmentFilterBackend
+from apps.doctors.pagination import AppointmentCursorPagination
+from apps.doctors.values import ValuesListMixin
+from apps.doctors.expand import ExpandMixin
+from apps.doctors.caching import AsyncCachedResponseMixin, CachedResponseMixin
+from apps.doctors.async_generics import AsyncListAPIView, AsyncRetrieveAPIView
+from apps.doctors.authentication import ROLE_PATIENT, get_tokens_for_user
+from apps.doctors.throttling import TokenBucketThrottle
 
 class PatientLoginView(APIView):
     """
     Patient login view to authenticate and log in patients using email and password.
     """
     permission_classes = [AllowAny]
+    # No authenticators: a Basic header would be hashed before the throttle is checked
+    authentication_classes = []
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'login'
+    throttle_account_field = 'email'
 
     def post(self, request):
         serializer = PatientLoginSerializer(data=request.data)
@@ -22,21 +34,16 @@ class PatientLoginView(APIView):
         email = serializer.validated_data['email']
         password = serializer.validated_data['password']
 
-        # Authenticate the patient
-        patient = authenticate(request, email=email, password=password)
+        # Authenticate the patient against the accounts created by doctors,
+        # which are the patients that own appointments.
+        patient = authenticate(request, email=email, password=password, role=ROLE_PATIENT)
 
         if patient is not None:
-            # Log the patient in
-            login(request, patient)
-
-            # Create or get an authentication token for the patient
-            token, created = Token.objects.get_or_create(user=patient)
-
-            # Return the token and patient details
+            # Return a bearer token pair and the patient details
             return Response(
                 {
-                    'token': token.key,
-                    'patient': PatientProfileSerializer(patient).data
+                    **get_tokens_for_user(patient, ROLE_PATIENT),
+                    'patient': PatientSerializer(patient).data
                 },
                 status=status.HTTP_200_OK
             )
@@ -54,18 +61,21 @@ class PatientProfileView(generics.RetrieveUpdateAPIView):
     """
     queryset = Patient.objects.all()
     serializer_class = PatientProfileSerializer
-    permission_classes = [IsAuthenticated, IsOwner]
+    permission_classes = [IsAuthenticated, IsPatient, IsOwner]
 
     def get_object(self):
         return self.request.user
 
 
-class PatientAppointmentsView(generics.ListCreateAPIView):
+class PatientAppointmentsView(CachedResponseMixin, ExpandMixin, ValuesListMixin, generics.ListCreateAPIView):
     """
     List all appointments of the logged-in patient or book a new appointment.
     """
     serializer_class = AppointmentSerializer
-    permission_classes = [IsAuthenticated, IsOwner]
+    permission_classes = [IsAuthenticated, IsPatient, IsOwner]
+    pagination_class = AppointmentCursorPagination
+    cache_role = ROLE_PATIENT
+    filter_backends = [AppointmentFilterBackend]
 
     def get_queryset(self):
         # Return the logged-in patient's appointments
@@ -76,13 +86,41 @@ class PatientAppointmentsView(generics.ListCreateAPIView):
         serializer.save(patient=self.request.user)
 
 
-class PatientAppointmentDetailView(generics.RetrieveAPIView):
+class PatientAppointmentDetailView(ExpandMixin, generics.RetrieveAPIView):
     """
     Retrieve details of a specific appointment for the logged-in patient.
     """
     serializer_class = AppointmentSerializer
-    permission_classes = [IsAuthenticated, IsOwner]
+    permission_classes = [IsAuthenticated, IsPatient, IsOwner]
+    lookup_url_kwarg = 'appointment_id'
 
     def get_queryset(self):
         # Ensure the patient can only access their own appointments
+        return Appointment.objects.filter(patient_id=self.request.user.pk)
+
+
+class AsyncPatientAppointmentsView(AsyncCachedResponseMixin, ExpandMixin, AsyncListAPIView):
+    """
+    Async variant of PatientAppointmentsView for ASGI deployments; bookings are passed to the sync view.
+    """
+    serializer_class = AppointmentSerializer
+    permission_classes = [IsAuthenticated, IsPatient, IsOwner]
+    pagination_class = AppointmentCursorPagination
+    filter_backends = [AppointmentFilterBackend]
+    cache_role = ROLE_PATIENT
+    sync_view = PatientAppointmentsView
+
+    def get_queryset(self):
         return Appointment.objects.filter(patient=self.request.user)
+
+
+class AsyncPatientAppointmentDetailView(ExpandMixin, AsyncRetrieveAPIView):
+    """
+    Async variant of PatientAppointmentDetailView for ASGI deployments.
+    """
+    serializer_class = AppointmentSerializer
+    permission_classes = [IsAuthenticated, IsPatient, IsOwner]
+    lookup_url_kwarg = 'appointment_id'
+
+    def get_queryset(self):
+        return Appointment.objects.filter(patient_id=self.request.user.pk)
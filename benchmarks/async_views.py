@@ -0,0 +1,155 @@
+"""
+Compare the sync and async read views under concurrent load through the ASGI application.
+
+Requests are fed straight into Django's ASGI handler the way an ASGI server
+would, so the numbers exclude the server's own HTTP parsing. Each mode runs in
+a fresh process because ASYNC_VIEWS is read when the URLconf is imported.
+
+Usage:
+    python -m benchmarks.async_views [--concurrency 1 10 50] [--requests 400] [--appointments 500]
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import report, setup_django
+
+ENDPOINTS = (
+    ('doctor appointments', '/api/doctors/appointments', 'doctor'),
+    ('doctor patients', '/api/doctors/patients', 'doctor'),
+    ('doctor profile', '/api/doctors/profile', 'doctor'),
+    ('patient appointments', '/api/patients/appointments/', 'patient'),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=('sync', 'async'), help="Run one mode only; by default both run.")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--requests', type=int, default=400, help="Requests per endpoint and concurrency level.")
+    parser.add_argument('--appointments', type=int, default=500)
+    args = parser.parse_args()
+
+    if args.mode is None:
+        for mode in ('sync', 'async'):
+            print(f'--- {mode} views')
+            sys.stdout.flush()
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.async_views', '--mode', mode,
+                 '--requests', str(args.requests), '--appointments', str(args.appointments),
+                 '--concurrency', *map(str, args.concurrency)],
+                env={**os.environ, 'ASYNC_VIEWS': str(mode == 'async')},
+                check=True,
+            )
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Sync views and the async ORM run queries in worker threads, which cannot see an in-memory database
+        setup_django(database=os.path.join(directory, 'benchmark.sqlite3'))
+        asyncio.run(run(args))
+
+
+async def run(args):
+    from asgiref.sync import sync_to_async
+    from django.core.handlers.asgi import ASGIHandler
+
+    headers = await sync_to_async(create_data)(args.appointments)
+    application = ASGIHandler()
+
+    for label, path, role in ENDPOINTS:
+        await request(application, path, headers[role])  # warm up
+        for concurrency in args.concurrency:
+            samples = []
+            per_worker = max(1, args.requests // concurrency)
+
+            async def worker():
+                for _ in range(per_worker):
+                    start = time.perf_counter()
+                    status = await request(application, path, headers[role])
+                    samples.append((time.perf_counter() - start) * 1000)
+                    assert status == 200, status
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            report(f'{label} c={concurrency}', samples)
+            print(f'{"":<32} {len(samples) / elapsed:10.0f} requests/s')
+
+
+def create_data(appointments):
+    from apps.doctors.authentication import ROLE_DOCTOR, ROLE_PATIENT, get_tokens_for_user
+    from apps.doctors.models import Doctor, Patient, Appointment
+
+    doctor = Doctor.objects.create_user(
+        email='doctor@example.com', first_name='Doctor', last_name='Example', password='password123'
+    )
+    patient = Patient.objects.create(
+        first_name='Jane', last_name='Doe', email='jane.doe@example.com', password='password123', created_by=doctor
+    )
+    Appointment.objects.bulk_create(
+        (
+            Appointment(
+                patient=patient,
+                doctor=doctor,
+                date=datetime.date(2000, 1, 1) + datetime.timedelta(days=i // 32),
+                time=datetime.time(8 + (i % 32) // 4, (i % 4) * 15),
+                end_time=datetime.time(8 + (i % 32) // 4, (i % 4) * 15 + 10),
+                duration_minutes=10,
+            )
+            for i in range(appointments)
+        ),
+        batch_size=5000,
+    )
+    return {
+        'doctor': f"Bearer {get_tokens_for_user(doctor, ROLE_DOCTOR)['access']}".encode(),
+        'patient': f"Bearer {get_tokens_for_user(patient, ROLE_PATIENT)['access']}".encode(),
+    }
+
+
+async def request(application, path, authorization):
+    """
+    Send one GET request through the ASGI application and return the response status.
+    """
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'authorization', authorization)],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    body_sent = False
+    disconnected = asyncio.Event()
+    status = None
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return status
+
+
+if __name__ == '__main__':
+    main()
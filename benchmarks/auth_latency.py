@@ -0,0 +1,44 @@
+"""
+Compare per-request latency of HTTP Basic and JWT bearer authentication.
+
+Usage:
+    python -m benchmarks.auth_latency [--requests N]
+"""
+import argparse
+import base64
+
+from benchmarks.common import report, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.test import APIClient
+    from apps.doctors.authentication import ROLE_DOCTOR, get_tokens_for_user
+    from apps.doctors.models import Doctor
+
+    doctor = Doctor.objects.create_user(
+        email='bench@example.com', password='password123', first_name='Bench', last_name='Doctor'
+    )
+
+    basic = APIClient()
+    credentials = base64.b64encode(b'bench@example.com:password123').decode()
+    basic.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+
+    bearer = APIClient()
+    bearer.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(doctor, ROLE_DOCTOR)['access']}")
+
+    for label, client in (('basic', basic), ('bearer', bearer)):
+        def call():
+            response = client.get('/api/doctors/profile')
+            assert response.status_code == 200, response.status_code
+        call()  # warm up
+        report(f'GET /api/doctors/profile [{label}]', timed(call, args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against the test settings (in-memory SQLite) so they can be
+executed from a fresh checkout with ``python -m benchmarks.<name>``.
+"""
+import os
+import statistics
+import time
+
+
+def setup_django(settings_module='ethnos_cyber_sett.test_settings', database=None):
+    """
+    Configure Django, create the schema and allow the test client host.
+
+    Pass ``database`` to use an SQLite file instead of the in-memory database,
+    which is only visible to the thread that created it.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    if database is not None:
+        from django.conf import settings
+        settings.DATABASES['default']['NAME'] = database
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+
+
+def timed(func, repeat):
+    """
+    Call ``func`` ``repeat`` times and return the latency of each call in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples, pct):
+    """
+    Return the ``pct`` percentile of ``samples`` using nearest-rank.
+    """
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def report(label, samples):
+    """
+    Print a one-line latency summary for ``samples``.
+    """
+    print(
+        f"{label:<32} n={len(samples):<6} "
+        f"mean={statistics.mean(samples):8.3f}ms "
+        f"p50={percentile(samples, 50):8.3f}ms "
+        f"p99={percentile(samples, 99):8.3f}ms"
+    )
@@ -0,0 +1,136 @@
+"""
+Compare mixed read/write throughput of the default and the tuned SQLite connection profile.
+
+Worker threads run requests against an SQLite file, each request either
+reading a page of appointments or booking one in a transaction. Requests are
+wrapped in the request_started/request_finished signals, so connections are
+opened and closed the way CONN_MAX_AGE makes Django do it. Each profile runs
+in a fresh process against a fresh database file.
+
+Usage:
+    python -m benchmarks.database_profile [--threads 1 4 8] [--requests 2000] [--write-ratio 0.2]
+"""
+import argparse
+import datetime
+import itertools
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import report, setup_django
+
+PROFILES = ('default', 'tuned')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profile', choices=PROFILES, help="Run one profile only; by default both run.")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--requests', type=int, default=2000, help="Requests per thread count.")
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.profile is None:
+        for profile in PROFILES:
+            print(f'--- {profile} profile')
+            sys.stdout.flush()
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.database_profile', '--profile', profile,
+                 '--requests', str(args.requests), '--write-ratio', str(args.write_ratio),
+                 '--threads', *map(str, args.threads)],
+                check=True,
+            )
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure(args.profile)
+        setup_django(database=os.path.join(directory, 'benchmark.sqlite3'))
+        run(args)
+
+
+def configure(profile):
+    """
+    Apply the connection settings of ``profile`` before Django opens any connection.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ethnos_cyber_sett.test_settings')
+    from django.conf import settings
+
+    if profile == 'default':
+        # What settings.py used before the connection profile: a connection per request and no pragmas
+        settings.DATABASES['default'].update({'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'OPTIONS': {}})
+        settings.SQLITE_PRAGMAS = {}
+    else:
+        from ethnos_cyber_sett import settings as project_settings
+        settings.DATABASES['default'].update({
+            key: project_settings.DATABASES['default'][key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS')
+        })
+
+
+def run(args):
+    from django.core.signals import request_finished, request_started
+    from django.db import OperationalError, connection, transaction
+    from apps.doctors.models import Appointment, Doctor, Patient
+
+    doctor = Doctor.objects.create_user(
+        email='doctor@example.com', first_name='Doctor', last_name='Example', password='password123'
+    )
+    patient = Patient.objects.create(
+        first_name='Jane', last_name='Doe', email='jane.doe@example.com', password='password123', created_by=doctor
+    )
+    connection.close()
+    slots = itertools.count()
+
+    def read():
+        rows = list(Appointment.objects.filter(doctor_id=doctor.pk).order_by('-date', '-time').values()[:50])
+        assert len(rows) <= 50
+
+    def write():
+        slot = next(slots)
+        with transaction.atomic():
+            Appointment.objects.create(
+                patient_id=patient.pk,
+                doctor_id=doctor.pk,
+                date=datetime.date(2000, 1, 1) + datetime.timedelta(days=slot // 32),
+                time=datetime.time(8 + (slot % 32) // 4, (slot % 4) * 15),
+                reason='Checkup',
+            )
+
+    for threads in args.threads:
+        samples = []
+        errors = []
+        per_thread = max(1, args.requests // threads)
+
+        def worker():
+            rng = random.Random(threading.get_ident())
+            try:
+                for _ in range(per_thread):
+                    operation = write if rng.random() < args.write_ratio else read
+                    start = time.perf_counter()
+                    request_started.send(sender=None)
+                    try:
+                        operation()
+                    except OperationalError as exc:
+                        errors.append(exc)
+                    finally:
+                        request_finished.send(sender=None)
+                    samples.append((time.perf_counter() - start) * 1000)
+            finally:
+                connection.close()
+
+        start = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        report(f'mixed requests threads={threads}', samples)
+        print(f'{"":<32} {len(samples) / elapsed:10.0f} requests/s, {len(errors)} errors')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure peak Python memory while streaming the appointment export at growing sizes.
+
+Usage:
+    python -m benchmarks.export_memory [--rows 1000 10000 100000]
+"""
+import argparse
+import datetime
+import time
+import tracemalloc
+
+from benchmarks.common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import Client
+    from apps.doctors.models import Doctor, Patient, Appointment
+
+    doctor = Doctor.objects.create_user(
+        email='doctor@example.com', first_name='Doctor', last_name='Example', password='password123'
+    )
+    patient = Patient.objects.create(
+        first_name='Jane', last_name='Doe', email='jane.doe@example.com', password='password123', created_by=doctor
+    )
+    client = Client()
+    client.force_login(doctor)
+    b''.join(client.get('/api/doctors/appointments/export').streaming_content)  # warm up imports and caches
+
+    created = 0
+    start_date = datetime.date(2000, 1, 1)
+    for rows in sorted(args.rows):
+        Appointment.objects.bulk_create(
+            (
+                Appointment(
+                    patient=patient,
+                    doctor=doctor,
+                    date=start_date + datetime.timedelta(days=i // 32),
+                    time=datetime.time(8 + (i % 32) // 4, (i % 4) * 15),
+                    end_time=datetime.time(8 + (i % 32) // 4, (i % 4) * 15 + 10),
+                    duration_minutes=10,
+                )
+                for i in range(created, rows)
+            ),
+            batch_size=5000,
+        )
+        created = rows
+
+        for export_type in ('csv', 'ndjson'):
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = client.get('/api/doctors/appointments/export', {'type': export_type})
+            size = sum(len(chunk) for chunk in response.streaming_content)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f'{export_type:<7} rows={rows:<9} {size / 1024 / 1024:8.1f} MiB out '
+                f'peak={peak / 1024 / 1024:6.2f} MiB  {rows / elapsed:10.0f} rows/s'
+            )
+
+
+if __name__ == '__main__':
+    main()
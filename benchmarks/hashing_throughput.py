@@ -0,0 +1,45 @@
+"""
+Measure password hashing throughput as the worker pool grows.
+
+Usage:
+    python -m benchmarks.hashing_throughput [--passwords N] [--workers 1 2 4]
+"""
+import argparse
+import os
+import time
+
+from benchmarks.common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--passwords', type=int, default=64)
+    parser.add_argument('--workers', type=int, nargs='+')
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import override_settings
+    from apps.doctors.hashing import PasswordHashingService
+
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    passwords = [f'password{i}' for i in range(args.passwords)]
+
+    baseline = None
+    for workers in worker_counts:
+        service = PasswordHashingService()
+        with override_settings(PASSWORD_HASHING={'WORKERS': workers}):
+            service.hash_passwords(passwords[:workers * 2])  # start the pool
+            start = time.perf_counter()
+            service.hash_passwords(passwords)
+            elapsed = time.perf_counter() - start
+        service.shutdown()
+
+        rate = len(passwords) / elapsed
+        baseline = baseline or rate
+        print(f'workers={workers:<3} {rate:10.1f} hashes/s  speedup={rate / baseline:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
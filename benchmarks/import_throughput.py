@@ -0,0 +1,57 @@
+"""
+Measure import_records throughput for a generated NDJSON file of patients and appointments.
+
+Usage:
+    python -m benchmarks.import_throughput [--patients N] [--appointments N] [--batch-size N]
+"""
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--patients', type=int, default=20000)
+    parser.add_argument('--appointments', type=int, default=50000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+
+    hashed = make_password('password123')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'records.ndjson')
+        with open(path, 'w') as f:
+            f.write(json.dumps({
+                'model': 'doctor', 'email': 'doctor@example.com', 'first_name': 'Doctor',
+                'last_name': 'Example', 'password': hashed,
+            }) + '\n')
+            for i in range(args.patients):
+                f.write(json.dumps({
+                    'model': 'patient', 'email': f'patient{i}@example.com', 'first_name': 'Patient',
+                    'last_name': str(i), 'password': hashed, 'created_by': 'doctor@example.com',
+                }) + '\n')
+            for i in range(args.appointments):
+                f.write(json.dumps({
+                    'model': 'appointment', 'doctor': 'doctor@example.com',
+                    'patient': f'patient{i % args.patients}@example.com',
+                    'date': f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}', 'time': '09:00',
+                }) + '\n')
+
+        start = time.perf_counter()
+        call_command('import_records', path, '--batch-size', str(args.batch_size), stdout=io.StringIO())
+        elapsed = time.perf_counter() - start
+        rows = 1 + args.patients + args.appointments
+        print(f'{rows} rows in {elapsed:.1f}s  {rows / elapsed:10.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
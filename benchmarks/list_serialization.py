@@ -0,0 +1,68 @@
+"""
+Compare ModelSerializer rendering with the values() row path for appointment lists.
+
+Both paths run the query, build the list data and render it to JSON.
+
+Usage:
+    python -m benchmarks.list_serialization [--rows 10000] [--repeat 10]
+"""
+import argparse
+import datetime
+
+from benchmarks.common import report, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+    from apps.doctors.models import Doctor, Patient, Appointment
+    from apps.doctors.serializers import AppointmentSerializer
+    from apps.doctors.values import values_serializer
+
+    doctor = Doctor.objects.create_user(
+        email='doctor@example.com', first_name='Doctor', last_name='Example', password='password123'
+    )
+    patient = Patient.objects.create(
+        first_name='Jane', last_name='Doe', email='jane.doe@example.com', password='password123', created_by=doctor
+    )
+    start_date = datetime.date(2000, 1, 1)
+    Appointment.objects.bulk_create(
+        (
+            Appointment(
+                patient=patient,
+                doctor=doctor,
+                date=start_date + datetime.timedelta(days=i // 32),
+                time=datetime.time(8 + (i % 32) // 4, (i % 4) * 15),
+                end_time=datetime.time(8 + (i % 32) // 4, (i % 4) * 15 + 10),
+                duration_minutes=10,
+                reason='Checkup' if i % 3 else None,
+            )
+            for i in range(args.rows)
+        ),
+        batch_size=5000,
+    )
+    queryset = Appointment.objects.filter(doctor=doctor).order_by('date', 'time', 'id')
+    renderer = values_serializer(AppointmentSerializer)
+
+    def model_serializer():
+        return JSONRenderer().render(AppointmentSerializer(queryset.all(), many=True).data)
+
+    def values_rows():
+        return JSONRenderer().render(renderer.to_representation(renderer.values(queryset.all())))
+
+    assert model_serializer() == values_rows()
+    slow = timed(model_serializer, args.repeat)
+    fast = timed(values_rows, args.repeat)
+    report(f'ModelSerializer {args.rows} rows', slow)
+    report(f'values() rows {args.rows} rows', fast)
+    print(f'speedup {sum(slow) / sum(fast):.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Report doctor and patient login latency for each password hasher configuration.
+
+Each configuration hashes the accounts' passwords itself, so no login is
+slowed down by a rehash. The scrypt settings are the OWASP alternatives of
+equal strength.
+
+Usage:
+    python -m benchmarks.login_latency [--requests N]
+"""
+import argparse
+
+from benchmarks.common import report, setup_django, timed
+
+PBKDF2 = ['django.contrib.auth.hashers.PBKDF2PasswordHasher']
+SCRYPT = ['apps.doctors.hashing.ScryptPasswordHasher']
+
+CONFIGURATIONS = (
+    ('pbkdf2_sha256 (Django default)', PBKDF2, None),
+    ('scrypt n=2^14 r=8 p=5 (default)', SCRYPT, (2 ** 14, 8, 5)),
+    ('scrypt n=2^15 r=8 p=3', SCRYPT, (2 ** 15, 8, 3)),
+    ('scrypt n=2^16 r=8 p=2', SCRYPT, (2 ** 16, 8, 2)),
+    ('scrypt n=2^17 r=8 p=1', SCRYPT, (2 ** 17, 8, 1)),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from apps.doctors.models import Doctor, Patient
+
+    client = APIClient()
+    for index, (label, hashers, scrypt) in enumerate(CONFIGURATIONS):
+        parameters = settings.PASSWORD_SCRYPT
+        if scrypt is not None:
+            parameters = dict(zip(('WORK_FACTOR', 'BLOCK_SIZE', 'PARALLELISM'), scrypt), MAXMEM=0)
+        with override_settings(PASSWORD_HASHERS=hashers, PASSWORD_SCRYPT=parameters):
+            doctor = Doctor.objects.create_user(
+                email=f'doctor{index}@example.com', password='password123', first_name='Bench', last_name='Doctor'
+            )
+            Patient.objects.create(
+                first_name='Bench', last_name='Patient', email=f'patient{index}@example.com',
+                password='password123', created_by=doctor,
+            )
+
+            for role, url in (('doctor', '/api/doctors/login'), ('patient', '/api/patients/login/')):
+                data = {'email': f'{role}{index}@example.com', 'password': 'password123'}
+
+                def call():
+                    response = client.post(url, data, format='json')
+                    assert response.status_code == 200, response.status_code
+                call()  # warm up
+                report(f'{role} login [{label}]', timed(call, args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Compare request latency with the metrics middleware enabled and disabled.
+
+Usage:
+    python -m benchmarks.metrics_overhead [--requests N]
+"""
+import argparse
+
+from benchmarks.common import report, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from apps.doctors.models import Doctor
+
+    doctor = Doctor.objects.create_user(
+        email='bench@example.com', password='password123', first_name='Bench', last_name='Doctor'
+    )
+
+    for label, enabled in (('metrics off', False), ('metrics on', True)):
+        with override_settings(METRICS={'ENABLED': enabled}):
+            # Middleware is loaded by the client's first request
+            client = APIClient()
+            client.force_authenticate(doctor)
+
+            def call():
+                response = client.get('/api/doctors/appointments')
+                assert response.status_code == 200, response.status_code
+            call()  # warm up
+            report(f'GET /api/doctors/appointments [{label}]', timed(call, args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -30,6 +31,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.doctors.middleware.RequestMetricsMiddleware',
+    'apps.doctors.middleware.ReplicaReadMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,9 +72,40 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', ''),
         'PORT': os.getenv('DB_PORT', ''),
+        # Keep connections open between requests, and check them before reuse
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Writers take the write lock when their transaction begins, so they wait on busy_timeout
+    # instead of failing with "database is locked" when upgrading a read lock
+    DATABASES['default']['OPTIONS'] = {
+        'transaction_mode': os.getenv('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+    }
+
+# Read replicas: one alias (replica1, replica2, ...) per comma-separated name in DB_REPLICA_NAMES,
+# configured like the default database. Reads of GET, HEAD and OPTIONS requests go to one of them.
+DATABASE_REPLICAS = {
+    'ALIASES': [],
+}
+for index, name in enumerate(filter(None, os.getenv('DB_REPLICA_NAMES', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = {**DATABASES['default'], 'NAME': name, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS['ALIASES'].append(f'replica{index}')
+
+DATABASE_ROUTERS = ['apps.doctors.routers.ReplicaRouter']
+
+# Pragmas applied to every new SQLite connection, a value of None leaves the SQLite default
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    # Negative sizes are in KiB
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024)),
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,13 +153,139 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL')
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.BasicAuthentication',
+        'apps.doctors.authentication.RoleJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
+        'apps.doctors.authentication.CachedBasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
 
+# JWT bearer token settings
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME_MINUTES', 15))),
+    'REFRESH_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_REFRESH_TOKEN_LIFETIME_MINUTES', 60 * 24))),
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
+
+# Cursor pagination for list endpoints, clients may ask for up to MAX_PAGE_SIZE rows
+API_PAGINATION = {
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', 50)),
+    'MAX_PAGE_SIZE': int(os.getenv('API_MAX_PAGE_SIZE', 500)),
+}
+
+# Per-view request metrics, served to staff at /metrics
+METRICS = {
+    'ENABLED': os.getenv('METRICS_ENABLED', 'True') == 'True',
+}
+
+# Streaming exports read rows from the database CHUNK_SIZE at a time
+EXPORTS = {
+    'CHUNK_SIZE': int(os.getenv('EXPORT_CHUNK_SIZE', 2000)),
+}
+
+# Appointment slot engine: slot granularity and the longest range /slots may cover
+APPOINTMENT_SLOTS = {
+    'MINUTES': int(os.getenv('APPOINTMENT_SLOT_MINUTES', 15)),
+    'MAX_DAYS': 31,
+}
+
+# Verified HTTP Basic credentials are cached in-process to avoid re-hashing
+BASIC_AUTH_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('BASIC_AUTH_CACHE_MAX_ENTRIES', 10000)),
+    'TTL': int(os.getenv('BASIC_AUTH_CACHE_TTL', 300)),
+}
+
+# Serve the read endpoints (profile, patient and appointment lists, appointment detail) with async views;
+# only worth enabling when running under an ASGI server
+ASYNC_VIEWS = {
+    'ENABLED': os.getenv('ASYNC_VIEWS', 'False') == 'True',
+}
+
+# GET responses of the per-owner list and profile endpoints are cached under the data version of their owner,
+# which lives in the database, so even per-process local-memory caches never serve writes made elsewhere
+RESPONSE_CACHE = {
+    'ENABLED': os.getenv('RESPONSE_CACHE_ENABLED', 'True') == 'True',
+    'ALIAS': 'responses',
+    'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300)),
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # The local-memory backend evicts the least recently used entries once MAX_ENTRIES is reached,
+    # dropping 1/CULL_FREQUENCY of them at a time
+    'responses': {
+        'BACKEND': os.getenv('RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', 'responses'),
+        'TIMEOUT': RESPONSE_CACHE['TIMEOUT'],
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 5000)),
+            'CULL_FREQUENCY': 20,
+        },
+    },
+}
+
+# Token-bucket throttles of the endpoints that hash passwords, per client IP and per account. Each bucket
+# holds BURST requests and refills at RATE. Point CACHE at an alias shared by all processes, such as Redis,
+# to enforce the limits across workers.
+THROTTLES = {
+    'ENABLED': os.getenv('THROTTLES_ENABLED', 'True') == 'True',
+    'CACHE': os.getenv('THROTTLE_CACHE_ALIAS', 'default'),
+    'SCOPES': {
+        'login': {
+            'ip': {'RATE': os.getenv('THROTTLE_LOGIN_IP_RATE', '30/min'), 'BURST': 10},
+            'account': {'RATE': os.getenv('THROTTLE_LOGIN_ACCOUNT_RATE', '10/min'), 'BURST': 5},
+        },
+        'signup': {
+            'ip': {'RATE': os.getenv('THROTTLE_SIGNUP_IP_RATE', '10/hour'), 'BURST': 5},
+        },
+        'create-patient': {
+            'ip': {'RATE': os.getenv('THROTTLE_CREATE_PATIENT_IP_RATE', '120/min'), 'BURST': 30},
+            'account': {'RATE': os.getenv('THROTTLE_CREATE_PATIENT_ACCOUNT_RATE', '60/min'), 'BURST': 20},
+        },
+        # Each request hashes up to PATIENT_BULK_CREATE['MAX_ROWS'] passwords
+        'bulk-create-patients': {
+            'ip': {'RATE': os.getenv('THROTTLE_BULK_CREATE_PATIENTS_IP_RATE', '20/hour'), 'BURST': 5},
+            'account': {'RATE': os.getenv('THROTTLE_BULK_CREATE_PATIENTS_ACCOUNT_RATE', '10/hour'), 'BURST': 3},
+        },
+    },
+}
+
+# Limits for POST /api/doctors/patients/bulk
+PATIENT_BULK_CREATE = {
+    'BATCH_SIZE': int(os.getenv('PATIENT_BULK_BATCH_SIZE', 500)),
+    'MAX_BATCH_SIZE': 5000,
+    'MAX_ROWS': int(os.getenv('PATIENT_BULK_MAX_ROWS', 10000)),
+}
+
+# New passwords are hashed with scrypt; logins upgrade hashes made by the other hashers or other parameters.
+# The defaults are OWASP's n=2**14, r=8, p=5 alternative; scrypt uses 128 * n * r bytes per hash.
+PASSWORD_HASHERS = [
+    'apps.doctors.hashing.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+PASSWORD_SCRYPT = {
+    'WORK_FACTOR': int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14)),
+    'BLOCK_SIZE': int(os.getenv('PASSWORD_SCRYPT_BLOCK_SIZE', 8)),
+    'PARALLELISM': int(os.getenv('PASSWORD_SCRYPT_PARALLELISM', 5)),
+    # Memory limit in bytes per hash, 0 allows twice what the hash's parameters need
+    'MAXMEM': int(os.getenv('PASSWORD_SCRYPT_MAXMEM', 0)),
+}
+
+# Worker processes used to hash passwords in bulk, fewer than 2 hashes synchronously
+PASSWORD_HASHING = {
+    'WORKERS': int(os.getenv('PASSWORD_HASHING_WORKERS', 0)),
+}
+
 # Custom settings
 AUTH_USER_MODEL = 'doctors.Doctor'
+
+# Logs doctors and patients in by email; see apps/doctors/backends.py
+AUTHENTICATION_BACKENDS = ['apps.doctors.backends.RoleModelBackend']
@@ -2,18 +2,32 @@
 
 from .settings import *
 
-
+# Tokens are signed with the secret key, so tests need one even without a .env file
+SECRET_KEY = os.getenv('SECRET_KEY') or 'test-secret-key'
 
 # Use an in-memory database for testing
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # A separate database standing in for a replica; the routing tests enable it and fill it themselves
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
+DATABASE_REPLICAS = {'ALIASES': []}
 
 # Disable email sending during tests
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
 # Disable static files collection during tests
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+# Primary keys are reused after each test's rollback, so cached responses could leak between tests.
+# The caching tests enable it and clear the cache themselves.
+RESPONSE_CACHE = {**RESPONSE_CACHE, 'ENABLED': False}
+
+# Tests log in from the same address over and over; the throttling tests enable the throttles
+THROTTLES = {**THROTTLES, 'ENABLED': False}
@@ -1,8 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
+from rest_framework_simplejwt.views import TokenRefreshView
+from apps.doctors.views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/doctors/', include('apps.doctors.urls')),
     path('api/patients/', include('apps.patients.urls')),
+    path('api/token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]